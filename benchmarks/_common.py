@@ -0,0 +1,124 @@
+"""Shared helpers for the qcge benchmark scripts.
+
+The benchmarks run headless (SDL_VIDEODRIVER=dummy) from any working directory.
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_DIR = os.path.join(REPO_ROOT, "qcge")
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+def setup_display(size=(640, 480)):
+    """Open a dummy display so surfaces can be converted. ASSETS_PATH is relative, so we run from the package folder."""
+    import pygame
+
+    os.chdir(PACKAGE_DIR)
+    pygame.display.init()
+    return pygame.display.set_mode(size)
+
+
+def suppress_grid_prints():
+    """Context manager that swallows stdout; deleting controlled gates prints every replaced node."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def measure(func, repeat=5):
+    """Return (best wall time in seconds, peak traced Python memory in bytes) of calling func."""
+    best = float("inf")
+    peak = 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        best = min(best, elapsed)
+    return best, peak
+
+
+def best_time(func, repeat=5):
+    """Best wall time in seconds of calling func, without the overhead of memory tracing."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def surface_bytes(surfaces):
+    """Pixel memory owned by the given surfaces; sub-surfaces are charged once to their top-level parent."""
+    owners = {}
+    for surface in surfaces:
+        owner = surface.get_abs_parent()
+        owners[id(owner)] = owner
+    return sum(owner.get_width() * owner.get_height() * owner.get_bytesize() for owner in owners.values())
+
+
+def import_grid_model_classes():
+    """(QuantumCircuitGridModel, QuantumCircuitGridNode), also from trees where they still live in qcge.quantum_circuit."""
+    try:
+        from qcge.quantum_circuit_model import QuantumCircuitGridModel, QuantumCircuitGridNode
+    except ImportError:
+        from qcge.quantum_circuit import QuantumCircuitGridModel, QuantumCircuitGridNode
+    return QuantumCircuitGridModel, QuantumCircuitGridNode
+
+
+def set_grid_nodes(qc_grid_model, nodes):
+    """Replace every node with set_nodes, or with a set_node loop on trees that predate it."""
+    if hasattr(qc_grid_model, "set_nodes"):
+        qc_grid_model.set_nodes(nodes)
+        return
+    from qcge.configs import GATES
+    _, QuantumCircuitGridNode = import_grid_model_classes()
+
+    for wire in range(qc_grid_model.num_qubits):
+        for column in range(qc_grid_model.num_columns):
+            node = nodes[wire][column]
+            qc_grid_model.set_node(wire, column, node if node else QuantumCircuitGridNode(GATES['EMPTY']))
+
+
+def random_grid_model(num_qubits, num_columns, density=0.5, seed=0):
+    """Grid model with a reproducible mix of single-qubit, rotation and controlled gates."""
+    import numpy as np
+    from qcge.configs import GATES
+
+    QuantumCircuitGridModel, QuantumCircuitGridNode = import_grid_model_classes()
+
+    rng = np.random.default_rng(seed)
+    gate_types = [GATES['H'], GATES['X'], GATES['Y'], GATES['Z'], GATES['S'], GATES['T']]
+    qc_grid_model = QuantumCircuitGridModel(num_qubits, num_columns)
+    for column in range(num_columns):
+        free_wires = set(range(num_qubits))
+        for wire in range(num_qubits):
+            if wire not in free_wires or rng.random() >= density:
+                continue
+            free_wires.discard(wire)
+            gate_type = gate_types[rng.integers(len(gate_types))]
+            choice = rng.random()
+            if choice < 0.2 and gate_type in (GATES['X'], GATES['Y'], GATES['Z']):
+                qc_grid_node = QuantumCircuitGridNode(gate_type, rotation_angle=rng.integers(1, 16) * np.pi / 8)
+            elif choice < 0.4 and gate_type in (GATES['X'], GATES['Z'], GATES['H']) and wire + 1 in free_wires:
+                free_wires.discard(wire + 1)
+                qc_grid_node = QuantumCircuitGridNode(gate_type, first_ctrl=wire + 1)
+            else:
+                qc_grid_node = QuantumCircuitGridNode(gate_type)
+            qc_grid_model.set_node(wire, column, qc_grid_node)
+    return qc_grid_model
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(value)) for value in column) for column in zip(headers, *rows)]
+    for row in [headers] + rows:
+        print("  ".join(str(value).rjust(width) for value, width in zip(row, widths)))
@@ -0,0 +1,70 @@
+"""Benchmark checking puzzle answers through the canonical-form answer cache against simulating every submission.
+
+Submissions are drawn from a few solutions, each laid out differently: shifted by empty columns and padded
+with identities, the way different players build the same circuit.
+
+Usage: python benchmarks/bench_answer_cache.py [num_submissions]
+"""
+import sys
+import time
+
+import numpy as np
+
+import _common
+from qcge.answer_cache import QuantumCircuitGridAnswerCache
+from qcge.configs import GATES
+from qcge.quantum_circuit_model import QuantumCircuitGridModel
+
+NUM_QUBITS = 10
+NUM_COLUMNS = 24
+NUM_SOLUTIONS = 8
+
+
+def create_layout_variant(qc_grid_model, rng):
+    """Same circuit, with its columns moved right by a random number of empty or identity columns"""
+    offset = int(rng.integers(0, NUM_COLUMNS - qc_grid_model.num_columns + 1))
+    nodes = np.zeros((NUM_QUBITS, NUM_COLUMNS), dtype=QuantumCircuitGridModel.NODE_DTYPE)
+    nodes['first_ctrl'] = -1
+    nodes['second_ctrl'] = -1
+    nodes['swap'] = -1
+    nodes[:, offset:offset + qc_grid_model.num_columns] = qc_grid_model.nodes
+    nodes['gate_type'][:, :offset] = np.where(rng.random((NUM_QUBITS, offset)) < 0.3, GATES['IDENTITY'], GATES['EMPTY'])
+    variant = QuantumCircuitGridModel(NUM_QUBITS, NUM_COLUMNS)
+    variant.set_nodes(nodes)
+    return variant
+
+
+def main():
+    num_submissions = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rng = np.random.default_rng(0)
+    solutions = [_common.random_grid_model(NUM_QUBITS, NUM_COLUMNS // 2, seed=seed) for seed in range(NUM_SOLUTIONS)]
+    submissions = [create_layout_variant(solutions[rng.integers(NUM_SOLUTIONS)], rng) for _ in range(num_submissions)]
+    targets = [solution.simulate() for solution in solutions]
+
+    start = time.perf_counter()
+    uncached_results = [
+        any(abs(np.vdot(target, submission.simulate())) > 1 - 1e-8 for target in targets)
+        for submission in submissions
+    ]
+    uncached_time = time.perf_counter() - start
+    for submission in submissions:
+        submission.qc_grid_simulator.invalidate() # Don't let the cached path reuse the checkpoints
+
+    answer_cache = QuantumCircuitGridAnswerCache()
+    start = time.perf_counter()
+    cached_results = [
+        any(answer_cache.matches_state(submission, target) for target in targets)
+        for submission in submissions
+    ]
+    cached_time = time.perf_counter() - start
+
+    print(f"{num_submissions} submissions of {NUM_QUBITS}x{NUM_COLUMNS} grids, {NUM_SOLUTIONS} distinct solutions")
+    _common.print_table(["", "total (ms)", "per submission (us)"], [
+        ["simulate every submission", f"{uncached_time * 1000:.1f}", f"{uncached_time / num_submissions * 1e6:.0f}"],
+        ["answer cache", f"{cached_time * 1000:.1f}", f"{cached_time / num_submissions * 1e6:.0f}"],
+    ])
+    print(f"cache entries: {len(answer_cache)}, hits: {answer_cache.hits}, misses: {answer_cache.misses}")
+
+
+if __name__ == "__main__":
+    main()
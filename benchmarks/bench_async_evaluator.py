@@ -0,0 +1,71 @@
+"""Benchmark the frame time of an editing session that scores the grid after every edit, synchronously and in the background.
+
+Usage: python benchmarks/bench_async_evaluator.py
+"""
+import time
+
+import numpy as np
+
+import _common
+
+QUBIT_COUNTS = [10, 15, 18]
+NUM_COLUMNS = 16
+NUM_FRAMES = 120
+FRAME_TIME = 1 / 60
+
+
+def main():
+    _common.setup_display()
+    from qcge import QuantumCircuitGrid, keys
+
+    edit_keys = [keys.K_x, keys.K_d, keys.K_h, keys.K_s, keys.K_BACKSPACE, keys.K_w, keys.K_e, keys.K_a]
+
+    def session(num_qubits, background):
+        qc_grid = QuantumCircuitGrid((0, 0), num_qubits, NUM_COLUMNS)
+        qc_grid.qc_grid_model.set_nodes(_common.random_grid_model(num_qubits, NUM_COLUMNS).nodes)
+        qc_grid.run()
+        if background:
+            qc_grid_evaluator = qc_grid.enable_async_evaluation('probabilities')
+            qc_grid_evaluator.wait()
+
+        frame_times = []
+        for frame in range(NUM_FRAMES):
+            start = time.perf_counter()
+            with _common.suppress_grid_prints():
+                qc_grid.handle_input(edit_keys[frame % len(edit_keys)])
+            if not background:
+                qc_grid.qc_grid_model.get_probabilities()
+            qc_grid.update()
+            frame_time = time.perf_counter() - start
+            frame_times.append(frame_time)
+            time.sleep(max(0, FRAME_TIME - frame_time)) # Leave the rest of the frame to the worker, as vsync would
+
+        frames_behind = 0
+        if background:
+            # Frames until the result for the final grid is delivered
+            while not qc_grid.qc_grid_evaluator.is_current():
+                qc_grid.poll_evaluation()
+                time.sleep(FRAME_TIME)
+                frames_behind += 1
+            qc_grid.disable_async_evaluation()
+        return np.array(frame_times) * 1000, frames_behind
+
+    rows = []
+    for num_qubits in QUBIT_COUNTS:
+        for background in (False, True):
+            frame_times, frames_behind = session(num_qubits, background)
+            rows.append([
+                num_qubits,
+                "background" if background else "synchronous",
+                f"{np.median(frame_times):.2f}",
+                f"{frame_times.max():.2f}",
+                f"{np.mean(frame_times > FRAME_TIME * 1000) * 100:.0f}",
+                frames_behind,
+            ])
+
+    print(f"{NUM_FRAMES} frames with one edit each on {NUM_COLUMNS} column grids, paced at {1 / FRAME_TIME:.0f} fps")
+    _common.print_table(["qubits", "evaluation", "median frame (ms)", "max frame (ms)", "frames over budget (%)", "final result after (frames)"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Benchmark clearing a filled QuantumCircuitGrid, which deletes every node inside one batch_edit().
+
+Usage: python benchmarks/bench_batch_edit.py
+"""
+import time
+
+import _common
+
+GRID_SIZES = [(4, 8), (10, 20), (20, 40)]
+
+
+def main():
+    _common.setup_display((1920, 1080))
+    import pygame
+    from qcge import QuantumCircuitGrid
+
+    rows = []
+    for num_qubits, num_columns in GRID_SIZES:
+        filled_nodes = _common.random_grid_model(num_qubits, num_columns).nodes
+        for dirty_rects in (False, True):
+            qc_grid = QuantumCircuitGrid((0, 0), num_qubits, num_columns, dirty_rects=dirty_rects)
+            qc_grid.run()
+
+            clear_time = float("inf")
+            with _common.suppress_grid_prints():
+                for _ in range(3):
+                    qc_grid.qc_grid_model.set_nodes(filled_nodes)
+                    qc_grid.update()
+                    start = time.perf_counter()
+                    qc_grid.handle_input(pygame.K_DELETE)
+                    clear_time = min(clear_time, time.perf_counter() - start)
+            rows.append([f"{num_qubits}x{num_columns}", "dirty" if dirty_rects else "full", f"{clear_time * 1000:.1f}"])
+
+    _common.print_table(["grid", "render mode", "clear all (ms)"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark batched evaluation against simulating grid models one at a time.
+
+Usage: python benchmarks/bench_batch_simulator.py
+"""
+import numpy as np
+
+import _common
+from qcge.batch_simulator import get_grids_probabilities
+from qcge.configs import GATES
+from qcge.quantum_circuit_model import QuantumCircuitGridModel, QuantumCircuitGridNode
+
+NUM_QUBITS = 8
+NUM_COLUMNS = 12
+BATCH_SIZES = [16, 256, 4096]
+
+
+def sweep_model():
+    """Random grid with three rotation gates in front, swept through every pi/8 step"""
+    qc_grid_model = _common.random_grid_model(NUM_QUBITS, NUM_COLUMNS, seed=1)
+    for wire in range(3):
+        qc_grid_model.set_node(wire, 0, QuantumCircuitGridNode(GATES['Y']))
+    return qc_grid_model
+
+
+def sweep_one_by_one(qc_grid_model, angle_assignments):
+    rows = []
+    for angles in zip(*angle_assignments.values()):
+        for (wire, column), angle in zip(angle_assignments, angles):
+            qc_grid_model.set_node(wire, column, QuantumCircuitGridNode(GATES['Y'], rotation_angle=angle))
+        rows.append(qc_grid_model.get_probabilities())
+    return np.array(rows)
+
+
+def main():
+    rows = []
+    for batch_size in BATCH_SIZES:
+        qc_grid_model = sweep_model()
+        angles = np.random.default_rng(0).integers(0, 16, size=(3, batch_size)) * np.pi / 8
+        angle_assignments = {(wire, 0): angles[wire] for wire in range(3)}
+        batch_time = _common.best_time(lambda: qc_grid_model.get_angle_sweep_probabilities(angle_assignments), 3)
+        loop_time = _common.best_time(lambda: sweep_one_by_one(qc_grid_model, angle_assignments), 1)
+        rows.append(["angle sweep", batch_size, f"{batch_size / batch_time:.0f}", f"{batch_size / loop_time:.0f}"])
+
+        qc_grid_models = [_common.random_grid_model(NUM_QUBITS, NUM_COLUMNS, density=0.3, seed=seed % 64) for seed in range(batch_size)]
+        batch_time = _common.best_time(lambda: get_grids_probabilities(qc_grid_models), 3)
+        loop_time = _common.best_time(lambda: [qc_grid_model.qc_grid_simulator.invalidate() or qc_grid_model.get_probabilities() for qc_grid_model in qc_grid_models], 1)
+        rows.append(["grid list", batch_size, f"{batch_size / batch_time:.0f}", f"{batch_size / loop_time:.0f}"])
+    print(f"{NUM_QUBITS} qubits x {NUM_COLUMNS} columns")
+    _common.print_table(["workload", "batch", "batched_grids_per_s", "loop_grids_per_s"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Benchmark the peephole optimizer: gate count and depth reduction, and the cost of simulating and exporting.
+
+Usage: python benchmarks/bench_circuit_optimizer.py
+"""
+import _common
+
+GRID_SIZES = [(4, 16), (10, 40), (16, 64)]
+DENSITIES = [0.5, 0.9]
+
+
+def main():
+    rows = []
+    for num_qubits, num_columns in GRID_SIZES:
+        for density in DENSITIES:
+            qc_grid_model = _common.random_grid_model(num_qubits, num_columns, density=density)
+            qc_grid_compiler = qc_grid_model.qc_grid_compiler
+            report = qc_grid_model.get_optimization_report()
+
+            def optimize():
+                qc_grid_compiler.optimized_instructions = None
+                qc_grid_compiler.optimized_circuit_instructions = None
+                qc_grid_compiler.get_optimized_instructions()
+
+            def simulate(optimize):
+                qc_grid_model.qc_grid_simulator.invalidate()
+                qc_grid_model.simulate(optimize=optimize)
+
+            rows.append([
+                f"{num_qubits}x{num_columns}",
+                density,
+                f"{report['gate_count']} -> {report['optimized_gate_count']}",
+                f"{report['depth']} -> {report['optimized_depth']}",
+                f"{_common.best_time(optimize) * 1000:.2f}",
+                f"{_common.best_time(lambda: simulate(False)) * 1000:.2f} -> {_common.best_time(lambda: simulate(True)) * 1000:.2f}",
+                f"{_common.best_time(lambda: qc_grid_model.create_quantum_circuit().depth()) * 1000:.2f} -> "
+                f"{_common.best_time(lambda: qc_grid_model.create_quantum_circuit(optimize=True).depth()) * 1000:.2f}",
+            ])
+
+    _common.print_table(["grid", "density", "gates", "depth", "optimize (ms)", "simulate (ms)", "export + depth (ms)"], rows)
+
+
+if __name__ == "__main__":
+    main()
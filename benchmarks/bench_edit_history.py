@@ -0,0 +1,59 @@
+"""Benchmark recording, undoing and redoing single-node edits and whole-grid clears, for growing grid sizes.
+
+Usage: python benchmarks/bench_edit_history.py
+"""
+
+import _common
+from qcge import keys
+from qcge.quantum_circuit_editor import QuantumCircuitGridEditor
+
+GRID_SIZES = [(4, 8), (16, 64), (32, 256)]
+
+
+def main():
+    rows = []
+    for num_qubits, num_columns in GRID_SIZES:
+        qc_grid_model = _common.random_grid_model(num_qubits, num_columns)
+        editor = QuantumCircuitGridEditor(qc_grid_model)
+        qc_grid_history = editor.qc_grid_history
+        editor.highlight_current_node(0, 0)
+
+        def toggle_gate():
+            editor.handle_input(keys.K_BACKSPACE)
+            editor.handle_input(keys.K_h)
+
+        def undo_redo():
+            qc_grid_history.undo()
+            qc_grid_history.redo()
+
+        def clear_undo_redo():
+            editor.handle_input(keys.K_DELETE)
+            qc_grid_history.undo()
+            qc_grid_history.redo()
+            qc_grid_history.undo() # Leave the grid filled for the next repeat
+
+        with _common.suppress_grid_prints():
+            toggle_gate()
+            edit_time = _common.best_time(toggle_gate, repeat=50) / 2
+            undo_redo_time = _common.best_time(undo_redo, repeat=50) / 2
+            clear_time = _common.best_time(clear_undo_redo, repeat=3)
+        snapshot_time = _common.best_time(lambda: qc_grid_model.nodes.copy(), repeat=50)
+        clear_step_bytes = qc_grid_history.redo_steps[-1].nbytes
+        rows.append([
+            f"{num_qubits}x{num_columns}",
+            f"{edit_time * 1e6:.1f}",
+            f"{undo_redo_time * 1e6:.1f}",
+            f"{snapshot_time * 1e6:.1f}",
+            f"{clear_time * 1000:.1f}",
+            clear_step_bytes,
+            f"{qc_grid_model.nodes.nbytes}",
+        ])
+
+    _common.print_table(
+        ["grid", "edit (us)", "undo/redo (us)", "full snapshot (us)", "clear+undo+redo+undo (ms)", "clear step (B)", "grid nodes (B)"],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    main()
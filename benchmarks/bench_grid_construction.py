@@ -0,0 +1,34 @@
+"""Benchmark QuantumCircuitGrid construction (QuantumCircuitGrid.run) for a range of grid sizes.
+
+Usage: python benchmarks/bench_grid_construction.py
+"""
+import _common
+from qcge import QuantumCircuitGrid
+
+SIZES = [(4, 8), (10, 20), (20, 40)]
+
+
+def build_grid(num_qubits, num_columns):
+    qc_grid = QuantumCircuitGrid((0, 0), num_qubits, num_columns)
+    qc_grid.run()
+    return qc_grid
+
+
+def main():
+    _common.setup_display()
+    rows = []
+    for num_qubits, num_columns in SIZES:
+        elapsed, peak = _common.measure(lambda: build_grid(num_qubits, num_columns))
+        qc_grid = build_grid(num_qubits, num_columns)
+        pixels = _common.surface_bytes(sprite.image for sprite in qc_grid.sprites())
+        rows.append([
+            f"{num_qubits}x{num_columns}",
+            f"{elapsed * 1000:.2f}",
+            f"{peak / 1024:.1f}",
+            f"{pixels / 1024:.1f}",
+        ])
+    _common.print_table(["grid", "run_ms", "py_peak_kib", "surface_kib"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark frames of several grids drawn one by one against a QuantumCircuitGridHost, while one grid is edited.
+
+Usage: python benchmarks/bench_grid_host.py
+"""
+import _common
+
+GRID_COUNTS = [2, 4, 16]
+GRID_SIZE = (4, 8)
+NUM_FRAMES = 50
+
+
+def main():
+    screen = _common.setup_display((1920, 1080))
+    import pygame
+    from qcge import QuantumCircuitGrid, QuantumCircuitGridHost, keys
+
+    background = pygame.Surface(screen.get_size())
+    background.fill((0, 0, 0))
+    edit_keys = [keys.K_x, keys.K_d, keys.K_h, keys.K_a, keys.K_BACKSPACE, keys.K_s]
+
+    def create_grids(num_grids, dirty_rects):
+        grids = []
+        for index in range(num_grids):
+            position = (10 + (index % 4) * 470, 10 + (index // 4) * 200)
+            grids.append(QuantumCircuitGrid(position, *GRID_SIZE, dirty_rects=dirty_rects))
+        return grids
+
+    rows = []
+    for num_grids in GRID_COUNTS:
+        for dirty_rects in (False, True):
+            separate_grids = create_grids(num_grids, dirty_rects)
+            for grid in separate_grids:
+                grid.run()
+                grid.clear(screen, background)
+            host = QuantumCircuitGridHost(create_grids(num_grids, dirty_rects), dirty_rects=dirty_rects)
+            host.clear(screen, background)
+
+            def separate_frames():
+                for frame in range(NUM_FRAMES):
+                    if not dirty_rects:
+                        screen.blit(background, (0, 0))
+                    separate_grids[0].handle_input(edit_keys[frame % len(edit_keys)])
+                    for grid in separate_grids:
+                        grid.update()
+                        grid.draw(screen)
+
+            def host_frames():
+                for frame in range(NUM_FRAMES):
+                    if not dirty_rects:
+                        screen.blit(background, (0, 0))
+                    host.handle_input(edit_keys[frame % len(edit_keys)])
+                    host.update()
+                    host.draw(screen)
+
+            rows.append([
+                num_grids,
+                "dirty" if dirty_rects else "full",
+                f"{_common.best_time(separate_frames, 3) / NUM_FRAMES * 1000:.2f}",
+                f"{_common.best_time(host_frames, 3) / NUM_FRAMES * 1000:.2f}",
+            ])
+
+    print(f"{GRID_SIZE[0]}x{GRID_SIZE[1]} grids, one of them edited every frame")
+    _common.print_table(["grids", "render mode", "separate frame (ms)", "host frame (ms)"], rows)
+
+
+if __name__ == "__main__":
+    main()
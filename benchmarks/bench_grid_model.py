@@ -0,0 +1,68 @@
+"""Benchmark memory and throughput of many QuantumCircuitGridModel instances, e.g. for puzzle generation.
+
+Usage: python benchmarks/bench_grid_model.py [num_grids]
+"""
+import sys
+import time
+import tracemalloc
+
+import _common
+from qcge.configs import GATES
+from qcge.quantum_circuit_model import QuantumCircuitGridModel, QuantumCircuitGridNode
+
+NUM_QUBITS = 16
+NUM_COLUMNS = 64
+FILL_STEP = 8 # Every 8th node of a grid holds a gate
+
+
+def populate(qc_grid_models):
+    qc_grid_node = QuantumCircuitGridNode(GATES['H'])
+    for qc_grid_model in qc_grid_models:
+        for column in range(NUM_COLUMNS):
+            for wire in range(column % FILL_STEP, NUM_QUBITS, FILL_STEP):
+                qc_grid_model.set_node(wire, column, qc_grid_node)
+
+
+def read(qc_grid_models):
+    count = 0
+    for qc_grid_model in qc_grid_models:
+        for column in range(NUM_COLUMNS):
+            for wire in range(column % FILL_STEP, NUM_QUBITS, FILL_STEP):
+                count += qc_grid_model.get_node(wire, column).gate_type == GATES['H']
+    return count
+
+
+def main():
+    num_grids = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    num_nodes = num_grids * NUM_COLUMNS * NUM_QUBITS // FILL_STEP
+
+    tracemalloc.start()
+    qc_grid_models = [QuantumCircuitGridModel(NUM_QUBITS, NUM_COLUMNS) for _ in range(num_grids)]
+    empty_memory = tracemalloc.get_traced_memory()[0]
+    populate(qc_grid_models)
+    populated_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del qc_grid_models
+
+    start = time.perf_counter()
+    qc_grid_models = [QuantumCircuitGridModel(NUM_QUBITS, NUM_COLUMNS) for _ in range(num_grids)]
+    construct_time = time.perf_counter() - start
+    start = time.perf_counter()
+    populate(qc_grid_models)
+    set_time = time.perf_counter() - start
+    start = time.perf_counter()
+    read(qc_grid_models)
+    get_time = time.perf_counter() - start
+
+    print(f"{num_grids} grids of {NUM_QUBITS}x{NUM_COLUMNS}, {num_nodes} gates placed")
+    _common.print_table(["metric", "value"], [
+        ["empty grids MiB", f"{empty_memory / 2**20:.1f}"],
+        ["populated grids MiB", f"{populated_memory / 2**20:.1f}"],
+        ["construct grids/s", f"{num_grids / construct_time:.0f}"],
+        ["set_node calls/s", f"{num_nodes / set_time:.0f}"],
+        ["get_node calls/s", f"{num_nodes / get_time:.0f}"],
+    ])
+
+
+if __name__ == "__main__":
+    main()
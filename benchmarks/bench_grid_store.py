@@ -0,0 +1,72 @@
+"""Benchmark the binary grid format and the memory-mapped grid store against pickling grid node arrays.
+
+Usage: python benchmarks/bench_grid_store.py [num_grids]
+"""
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import _common
+from qcge.grid_store import QuantumCircuitGridStore, write_grid_store, grid_model_to_bytes, grid_model_from_bytes
+
+NUM_QUBITS = 16
+NUM_COLUMNS = 64
+NUM_LOADS = 1000
+
+
+def main():
+    num_grids = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    # A few distinct grids repeated, generating 10k random grids would dominate the run time
+    distinct_models = [_common.random_grid_model(NUM_QUBITS, NUM_COLUMNS, seed=seed) for seed in range(16)]
+    qc_grid_models = [distinct_models[index % len(distinct_models)] for index in range(num_grids)]
+    level_indices = np.random.default_rng(0).integers(num_grids, size=NUM_LOADS)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store_path = os.path.join(directory, "levels.qcgs")
+        pickle_path = os.path.join(directory, "levels.pickle")
+
+        write_time = _common.best_time(lambda: write_grid_store(store_path, qc_grid_models), repeat=1)
+        with open(pickle_path, "wb") as file:
+            pickle.dump([qc_grid_model.nodes.copy() for qc_grid_model in qc_grid_models], file) # Copies, so pickle can't share the repeated grids
+
+        def load_from_pickle():
+            with open(pickle_path, "rb") as file:
+                all_nodes = pickle.load(file) # The whole file has to be parsed to reach any level
+            return [all_nodes[index] for index in level_indices]
+
+        def load_from_store():
+            store = QuantumCircuitGridStore(store_path)
+            return [store.get_nodes(index) for index in level_indices]
+
+        def open_store():
+            return QuantumCircuitGridStore(store_path)
+
+        store = QuantumCircuitGridStore(store_path)
+        start = time.perf_counter()
+        for index in level_indices:
+            store[index]
+        model_load_time = (time.perf_counter() - start) / NUM_LOADS
+
+        for index in level_indices[:20]:
+            assert np.array_equal(store[index].nodes, qc_grid_models[index].nodes)
+            assert np.array_equal(grid_model_from_bytes(grid_model_to_bytes(qc_grid_models[index])).nodes, qc_grid_models[index].nodes)
+
+        print(f"{num_grids} grids of {NUM_QUBITS}x{NUM_COLUMNS}, {NUM_LOADS} random level loads")
+        _common.print_table(["", "value"], [
+            ["store file size (MB)", f"{os.path.getsize(store_path) / 2 ** 20:.1f}"],
+            ["pickle file size (MB)", f"{os.path.getsize(pickle_path) / 2 ** 20:.1f}"],
+            ["bytes per grid (grid_model_to_bytes)", len(grid_model_to_bytes(qc_grid_models[0]))],
+            ["write store (ms)", f"{write_time * 1000:.1f}"],
+            ["open store (us)", f"{_common.best_time(open_store) * 1e6:.1f}"],
+            ["open + 1000 node views, store (ms)", f"{_common.best_time(load_from_store) * 1000:.2f}"],
+            ["open + 1000 node arrays, pickle (ms)", f"{_common.best_time(load_from_pickle, repeat=3) * 1000:.2f}"],
+            ["store[N] as grid model (us per level)", f"{model_load_time * 1e6:.1f}"],
+        ])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark the import and first-use cost of qcge in fresh interpreters, and which heavy modules each path loads.
+
+Usage: python benchmarks/bench_import_time.py [repeat]
+"""
+import json
+import subprocess
+import sys
+
+import _common
+
+SCENARIOS = {
+    "import qcge": "import qcge",
+    "headless edit + simulate": (
+        "import qcge\n"
+        "from qcge import keys\n"
+        "editor = qcge.QuantumCircuitGridEditor(qcge.QuantumCircuitGridModel(4, 8))\n"
+        "for key in (keys.K_h, keys.K_s, keys.K_x, keys.K_c, keys.K_d, keys.K_z, keys.K_e):\n"
+        "    editor.handle_input(key)\n"
+        "editor.qc_grid_model.get_probabilities()\n"
+    ),
+    "qiskit circuit": (
+        "import qcge\n"
+        "qc_grid_model = qcge.QuantumCircuitGridModel(4, 8)\n"
+        "qc_grid_model.set_node(0, 0, qcge.QuantumCircuitGridNode(qcge.GATES['H']))\n"
+        "qc_grid_model.create_quantum_circuit()\n"
+    ),
+    "pygame grid": "import qcge\nqcge.QuantumCircuitGrid\n",
+}
+
+# Runs the scenario in a fresh interpreter and reports the time it took and the heavy modules it loaded
+PROBE = (
+    "import sys, time, json\n"
+    "start = time.perf_counter()\n"
+    "exec(compile({code!r}, 'scenario', 'exec'))\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(json.dumps([elapsed, 'pygame' in sys.modules, 'qiskit' in sys.modules]))\n"
+)
+
+
+def run_scenario(code):
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(code=code)],
+        cwd=_common.REPO_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    rows = []
+    for name, code in SCENARIOS.items():
+        runs = [run_scenario(code) for _ in range(repeat)]
+        best = min(elapsed for elapsed, _, _ in runs)
+        _, pygame_loaded, qiskit_loaded = runs[0]
+        rows.append([name, f"{best * 1000:.1f}", pygame_loaded, qiskit_loaded])
+
+    print(f"Best of {repeat} fresh interpreters")
+    _common.print_table(["scenario", "time (ms)", "pygame", "qiskit"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark applying a recorded key sequence: one handle_input per key, one handle_inputs call, and headless replay.
+
+Usage: python benchmarks/bench_input_batching.py
+"""
+import random
+
+import _common
+
+GRID_SIZES = [(4, 8), (10, 20), (20, 40)]
+NUM_KEYS = 500
+
+
+def main():
+    _common.setup_display((1920, 1080))
+    from qcge import QuantumCircuitGrid, QuantumCircuitGridModel, keys
+    from qcge.quantum_circuit_editor import replay_inputs
+
+    # Mostly cursor moves, as when a key is held or a bot walks the grid, with edits in between
+    rng = random.Random(0)
+    recorded_keys = [
+        rng.choice([keys.K_a, keys.K_d, keys.K_w, keys.K_s] * 4 + [keys.K_x, keys.K_h, keys.K_c, keys.K_e, keys.K_BACKSPACE])
+        for _ in range(NUM_KEYS)
+    ]
+
+    rows = []
+    for num_qubits, num_columns in GRID_SIZES:
+        for dirty_rects in (False, True):
+            qc_grid = QuantumCircuitGrid((0, 0), num_qubits, num_columns, dirty_rects=dirty_rects)
+            qc_grid.run()
+            empty_nodes = qc_grid.qc_grid_model.nodes.copy()
+
+            def reset():
+                qc_grid.qc_grid_model.set_nodes(empty_nodes)
+                qc_grid.highlight_current_node(0, 0)
+                qc_grid.update()
+
+            def key_by_key():
+                for key in recorded_keys:
+                    qc_grid.handle_input(key)
+
+            def batched():
+                qc_grid.handle_inputs(recorded_keys)
+
+            times = {}
+            with _common.suppress_grid_prints():
+                for name, func in (("key by key", key_by_key), ("handle_inputs", batched)):
+                    reset()
+                    times[name] = _common.best_time(lambda: (reset(), func()), 3)
+                times["replay"] = _common.best_time(lambda: replay_inputs(QuantumCircuitGridModel(num_qubits, num_columns), recorded_keys), 3)
+            rows.append(
+                [f"{num_qubits}x{num_columns}", "dirty" if dirty_rects else "full"]
+                + [f"{times[name] * 1000:.1f}" for name in ("key by key", "handle_inputs", "replay")]
+            )
+
+    print(f"{NUM_KEYS} recorded keys; times include resetting the grid")
+    _common.print_table(["grid", "render mode", "key by key (ms)", "handle_inputs (ms)", "headless replay (ms)"], rows)
+
+
+if __name__ == "__main__":
+    main()
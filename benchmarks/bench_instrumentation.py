@@ -0,0 +1,46 @@
+"""Benchmark the cost of the instrumentation on an editing session, with the profiler disabled and enabled.
+
+Usage: python benchmarks/bench_instrumentation.py
+"""
+import _common
+
+NUM_QUBITS = 10
+NUM_COLUMNS = 20
+
+
+def main():
+    _common.setup_display((1280, 720))
+    import pygame
+    from qcge import QuantumCircuitGrid
+    from qcge.instrumentation import profiler
+
+    keys = [pygame.K_h, pygame.K_d, pygame.K_x, pygame.K_c, pygame.K_s, pygame.K_z, pygame.K_e, pygame.K_d] * 20 + [pygame.K_DELETE]
+    screen = pygame.display.get_surface()
+
+    def session(qc_grid):
+        for key in keys:
+            qc_grid.handle_input(key)
+            qc_grid.update()
+            qc_grid.draw(screen)
+        qc_grid.highlight_current_node(0, 0)
+
+    rows = []
+    for mode, enabled, overlay in (("disabled", False, False), ("enabled", True, False), ("enabled + overlay", True, True)):
+        qc_grid = QuantumCircuitGrid((0, 0), NUM_QUBITS, NUM_COLUMNS, profiler_overlay=overlay)
+        qc_grid.run()
+        profiler.reset()
+        if enabled:
+            profiler.enable()
+        else:
+            profiler.disable()
+        with _common.suppress_grid_prints():
+            session_time = _common.best_time(lambda: session(qc_grid), repeat=5)
+        profiler.disable()
+        rows.append([mode, f"{session_time * 1000:.1f}", f"{session_time / len(keys) * 1e6:.0f}"])
+
+    print(f"{len(keys)} key presses with update() and draw() on a {NUM_QUBITS}x{NUM_COLUMNS} grid")
+    _common.print_table(["profiler", "session (ms)", "per key (us)"], rows)
+
+
+if __name__ == "__main__":
+    main()
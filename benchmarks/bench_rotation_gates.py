@@ -0,0 +1,48 @@
+"""Benchmark rotating gates: drawing the angle arc on every tile load against the atlas' pre-rendered rotation gates.
+
+Usage: python benchmarks/bench_rotation_gates.py
+"""
+import numpy as np
+
+import _common
+
+NUM_ROTATIONS = 1000
+
+
+def main():
+    _common.setup_display()
+    import pygame
+    from qcge import QuantumCircuitGrid, keys
+    from qcge.configs import QUANTUM_GATE_PHASE_COLOR
+    from qcge.quantum_circuit import QuantumCircuitGateAtlas
+
+    gate_atlas = QuantumCircuitGateAtlas.shared()
+    angles = [step * np.pi / 8 for step in range(1, 16)] * (NUM_ROTATIONS // 15)
+
+    def draw_arcs():
+        for angle in angles:
+            gate_image = gate_atlas.get_gate("rx_gate.png").copy()
+            pygame.draw.arc(gate_image, QUANTUM_GATE_PHASE_COLOR, gate_image.get_rect(), 0, angle % (2 * np.pi), 4)
+
+    def lookup_rotation_gates():
+        for angle in angles:
+            gate_atlas.get_rotation_gate("rx_gate.png", angle, QUANTUM_GATE_PHASE_COLOR)
+
+    qc_grid = QuantumCircuitGrid((0, 0), 4, 8)
+    qc_grid.run()
+    qc_grid.handle_input(keys.K_x)
+
+    def rotate_keys():
+        for _ in range(len(angles)):
+            qc_grid.handle_input(keys.K_e)
+
+    rows = [
+        ["draw arc on a copy", f"{_common.best_time(draw_arcs) / len(angles) * 1e6:.2f}"],
+        ["atlas rotation gate", f"{_common.best_time(lookup_rotation_gates) / len(angles) * 1e6:.2f}"],
+        ["rotate key press", f"{_common.best_time(rotate_keys) / len(angles) * 1e6:.2f}"],
+    ]
+    _common.print_table(["rx gate", "per rotation (us)"], rows)
+
+
+if __name__ == "__main__":
+    main()
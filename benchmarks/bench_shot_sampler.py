@@ -0,0 +1,52 @@
+"""Benchmark shot sampling: per-turn single rolls, bulk shots and few-qubit marginals, against np.random.choice.
+
+Usage: python benchmarks/bench_shot_sampler.py
+"""
+import numpy as np
+
+import _common
+
+NUM_COLUMNS = 16
+NUM_ROLLS = 10000
+NUM_SHOTS = 1000000
+
+
+def main():
+    rows = []
+    for num_qubits in (4, 12, 20):
+        qc_grid_model = _common.random_grid_model(num_qubits, NUM_COLUMNS, seed=num_qubits)
+        qc_grid_sampler = qc_grid_model.qc_grid_sampler
+        rng = np.random.default_rng(0)
+        num_rolls = NUM_ROLLS if num_qubits < 20 else 100
+
+        def choice_rolls():
+            for _ in range(num_rolls):
+                rng.choice(2 ** num_qubits, p=qc_grid_model.get_probabilities())
+
+        def sampler_rolls():
+            for _ in range(num_rolls):
+                qc_grid_model.sample()
+
+        def marginal_shots():
+            qc_grid_sampler.invalidate() # Include building the marginal distribution
+            qc_grid_model.sample(NUM_SHOTS, qubits=(0, 1))
+
+        qc_grid_model.simulate()
+        rows.append([
+            num_qubits,
+            f"{_common.best_time(choice_rolls, 1) / num_rolls * 1e6:.1f}",
+            f"{_common.best_time(sampler_rolls, 3) / num_rolls * 1e6:.1f}",
+            f"{_common.best_time(lambda: rng.choice(2 ** num_qubits, size=NUM_SHOTS, p=qc_grid_model.get_probabilities()), 3) * 1000:.1f}",
+            f"{_common.best_time(lambda: qc_grid_model.sample(NUM_SHOTS), 3) * 1000:.1f}",
+            f"{_common.best_time(marginal_shots, 3) * 1000:.1f}",
+            f"{_common.measure(marginal_shots, 1)[1] / 2 ** 20:.2f}",
+        ])
+
+    _common.print_table(
+        ["qubits", "choice roll (us)", "sampler roll (us)", "choice 1M shots (ms)", "sampler 1M shots (ms)", "2-qubit marginal 1M shots (ms)", "marginal peak (MB)"],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    main()
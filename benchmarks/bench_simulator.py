@@ -0,0 +1,44 @@
+"""Benchmark the NumPy statevector simulator against building a qiskit circuit and evolving a qiskit Statevector.
+
+Usage: python benchmarks/bench_simulator.py
+"""
+import numpy as np
+from qiskit.quantum_info import Statevector
+
+import _common
+
+QUBIT_COUNTS = [2, 4, 6, 8, 10, 12, 14, 16, 18, 20]
+NUM_COLUMNS = 16
+
+
+def simulate_numpy(qc_grid_model):
+    qc_grid_model.qc_grid_compiler.invalidate()
+    qc_grid_model.qc_grid_simulator.invalidate()
+    return qc_grid_model.simulate()
+
+
+def simulate_qiskit(qc_grid_model):
+    qc_grid_model.qc_grid_compiler.invalidate()
+    return Statevector(qc_grid_model.create_quantum_circuit()).data
+
+
+def main():
+    rows = []
+    for num_qubits in QUBIT_COUNTS:
+        qc_grid_model = _common.random_grid_model(num_qubits, NUM_COLUMNS)
+        assert np.allclose(simulate_numpy(qc_grid_model), simulate_qiskit(qc_grid_model))
+        repeat = 5 if num_qubits < 16 else 1
+        numpy_time = _common.best_time(lambda: simulate_numpy(qc_grid_model), repeat)
+        qiskit_time = _common.best_time(lambda: simulate_qiskit(qc_grid_model), repeat)
+        rows.append([
+            num_qubits,
+            len(qc_grid_model.qc_grid_compiler.get_instructions()),
+            f"{numpy_time * 1000:.2f}",
+            f"{qiskit_time * 1000:.2f}",
+            f"{qiskit_time / numpy_time:.1f}x",
+        ])
+    _common.print_table(["qubits", "gates", "numpy_ms", "qiskit_ms", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""Run the benchmark suite for grid construction, editing, printing and export, and write the results as JSON.
+
+Every case is timed at several grid sizes, and the log-log slope of its time against the number of cells is
+reported as its scaling exponent, so an accidentally quadratic path shows up as an exponent near 2 even on a
+fast machine. Exits with status 1 if an exponent exceeds the limit of its case, or if a case got slower than
+in a baseline file. The suite also runs on trees from before the benchmarks were added, to record a baseline;
+cases that fail there are skipped and listed in the results.
+
+Usage: python benchmarks/bench_suite.py [--output results.json] [--baseline old.json] [--tolerance 1.5] [--quick]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import _common
+
+GRID_SIZES = [(4, 8), (8, 16), (16, 32), (24, 48)]
+NUM_REPEATS = 5
+
+
+def time_case(func, setup=None, repeat=NUM_REPEATS):
+    """Wall times in seconds of repeat calls of func, each after an untimed call of setup"""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def create_grid(num_qubits, num_columns):
+    from qcge import QuantumCircuitGrid
+
+    qc_grid = QuantumCircuitGrid((0, 0), num_qubits, num_columns)
+    qc_grid.run()
+    return qc_grid
+
+
+def bench_grid_run(num_qubits, num_columns):
+    return time_case(lambda: create_grid(num_qubits, num_columns)), 1
+
+
+def bench_handle_input_sequence(num_qubits, num_columns):
+    try:
+        from qcge import keys
+    except ImportError: # Trees before qcge.keys used pygame's key codes
+        import pygame as keys
+
+    # Walks the whole grid while placing, rotating, controlling and deleting gates
+    steps = [keys.K_h, keys.K_d, keys.K_x, keys.K_c, keys.K_s, keys.K_z, keys.K_e, keys.K_y, keys.K_q, keys.K_d, keys.K_BACKSPACE, keys.K_s]
+    key_sequence = [key for _ in range(max(num_qubits, num_columns)) for key in steps]
+    qc_grid = create_grid(num_qubits, num_columns)
+    empty_nodes = qc_grid.qc_grid_model.nodes.copy()
+
+    def reset():
+        _common.set_grid_nodes(qc_grid.qc_grid_model, empty_nodes)
+        qc_grid.highlight_current_node(0, 0)
+        qc_grid.update()
+
+    def press_keys():
+        for key in key_sequence:
+            qc_grid.handle_input(key)
+
+    return time_case(press_keys, reset), len(key_sequence)
+
+
+def bench_handle_input_clear_all(num_qubits, num_columns):
+    qc_grid = create_grid(num_qubits, num_columns)
+    filled_nodes = _common.random_grid_model(num_qubits, num_columns).nodes
+
+    def fill():
+        _common.set_grid_nodes(qc_grid.qc_grid_model, filled_nodes)
+        qc_grid.update()
+
+    return time_case(qc_grid.handle_input_clear_all, fill), 1
+
+
+def bench_model_str(num_qubits, num_columns):
+    qc_grid_model = _common.random_grid_model(num_qubits, num_columns)
+    return time_case(lambda: str(qc_grid_model)), 1
+
+
+def bench_create_quantum_circuit(density):
+    def bench(num_qubits, num_columns):
+        qc_grid_model = _common.random_grid_model(num_qubits, num_columns, density=density)
+        # Trees without the compiler cache rebuild the circuit on every call anyway
+        invalidate = qc_grid_model.qc_grid_compiler.invalidate if hasattr(qc_grid_model, 'qc_grid_compiler') else None
+        return time_case(qc_grid_model.create_quantum_circuit, invalidate), 1
+    return bench
+
+
+# name -> (benchmark, largest acceptable scaling exponent against the number of cells)
+CASES = {
+    'grid_run': (bench_grid_run, 1.3),
+    'handle_input_sequence': (bench_handle_input_sequence, 1.0), # Per key press; one column is reloaded per edit
+    'handle_input_clear_all': (bench_handle_input_clear_all, 1.3),
+    'model_str': (bench_model_str, 1.3),
+    'create_quantum_circuit_dense': (bench_create_quantum_circuit(1.0), 1.3),
+    'create_quantum_circuit_sparse': (bench_create_quantum_circuit(0.1), 1.3),
+}
+
+
+def get_scaling_exponent(results):
+    cells = [result['cells'] for result in results]
+    times = [result['best_ms'] for result in results]
+    return float(np.polyfit(np.log(cells), np.log(times), 1)[0])
+
+
+def get_environment():
+    import pygame
+    import qiskit
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=_common.REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'commit': commit,
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pygame': pygame.version.ver,
+        'qiskit': qiskit.__version__,
+    }
+
+
+def run_suite(grid_sizes, skipped_cases):
+    cases = {}
+    for name, (bench, max_exponent) in CASES.items():
+        results = []
+        for num_qubits, num_columns in grid_sizes:
+            try:
+                with _common.suppress_grid_prints():
+                    times, operations = bench(num_qubits, num_columns)
+            except Exception as error: # E.g. a bug of an old tree that the baseline is recorded from
+                skipped_cases[name] = f"{num_qubits}x{num_columns}: {type(error).__name__}: {error}"
+                break
+            results.append({
+                'num_qubits': num_qubits,
+                'num_columns': num_columns,
+                'cells': num_qubits * num_columns,
+                'operations': operations,
+                'best_ms': min(times) * 1000 / operations,
+                'median_ms': statistics.median(times) * 1000 / operations,
+            })
+        if name in skipped_cases:
+            continue
+        cases[name] = {
+            'results': results,
+            'scaling_exponent': get_scaling_exponent(results),
+            'max_scaling_exponent': max_exponent,
+        }
+    return cases
+
+
+def find_problems(cases, baseline, tolerance):
+    problems = []
+    for name, case in cases.items():
+        if case['scaling_exponent'] > case['max_scaling_exponent']:
+            problems.append(f"{name}: scaling exponent {case['scaling_exponent']:.2f} > {case['max_scaling_exponent']}")
+        if baseline is None or name not in baseline['cases']:
+            continue
+        baseline_results = {(result['num_qubits'], result['num_columns']): result for result in baseline['cases'][name]['results']}
+        for result in case['results']:
+            baseline_result = baseline_results.get((result['num_qubits'], result['num_columns']))
+            if baseline_result is not None and result['best_ms'] > baseline_result['best_ms'] * tolerance:
+                problems.append(
+                    f"{name} {result['num_qubits']}x{result['num_columns']}: "
+                    f"{result['best_ms']:.3f} ms vs {baseline_result['best_ms']:.3f} ms in the baseline"
+                )
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="slowdown factor against the baseline that counts as a regression")
+    parser.add_argument("--quick", action="store_true", help="skip the largest grid size")
+    args = parser.parse_args()
+    # setup_display() changes the working directory, so resolve the file arguments first
+    output_path = os.path.abspath(args.output) if args.output else None
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+
+    _common.setup_display((1920, 1080))
+    create_grid(2, 2).qc_grid_model.create_quantum_circuit() # Load the gate images and qiskit before timing
+
+    skipped_cases = {}
+    results = {
+        'environment': get_environment(),
+        'cases': run_suite(GRID_SIZES[:-1] if args.quick else GRID_SIZES, skipped_cases),
+        'skipped_cases': skipped_cases,
+    }
+    baseline = None
+    if baseline_path:
+        with open(baseline_path) as baseline_file:
+            baseline = json.load(baseline_file)
+    problems = find_problems(results['cases'], baseline, args.tolerance)
+    results['problems'] = problems
+
+    if output_path:
+        with open(output_path, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+        rows = [
+            [name, f"{case['results'][-1]['best_ms']:.3f}", f"{case['scaling_exponent']:.2f}"]
+            for name, case in results['cases'].items()
+        ]
+        _common.print_table(["case", "largest grid (ms)", "scaling exponent"], rows)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    for name, error in skipped_cases.items():
+        print("SKIPPED:", name, error, file=sys.stderr)
+    for problem in problems:
+        print("REGRESSION:", problem, file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
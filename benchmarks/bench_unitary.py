@@ -0,0 +1,67 @@
+"""Benchmark the native unitary simulator against building a qiskit circuit and taking its Operator.
+
+Usage: python benchmarks/bench_unitary.py [max_qubits]
+"""
+import sys
+
+import numpy as np
+
+import _common
+from qcge.configs import GATES
+from qcge.quantum_circuit_model import QuantumCircuitGridNode
+from qcge.unitary_simulator import get_column_operator
+
+NUM_COLUMNS = 16
+
+
+def main():
+    max_qubits = int(sys.argv[1]) if len(sys.argv) > 1 else 11
+    from qiskit.quantum_info import Operator
+
+    rows = []
+    for num_qubits in range(4, max_qubits + 1):
+        qc_grid_model = _common.random_grid_model(num_qubits, NUM_COLUMNS, seed=num_qubits)
+        qc_grid_unitary_simulator = qc_grid_model.qc_grid_unitary_simulator
+
+        def native(dtype):
+            qc_grid_unitary_simulator.invalidate()
+            return qc_grid_model.get_unitary(dtype)
+
+        def edit_last_column():
+            # Toggling the last column only recomputes it, on top of the checkpoint before it
+            gate_type = GATES['H'] if qc_grid_model.nodes['gate_type'][0, -1] != GATES['H'] else GATES['EMPTY']
+            qc_grid_model.set_node(0, NUM_COLUMNS - 1, QuantumCircuitGridNode(gate_type))
+            return qc_grid_model.get_unitary()
+
+        def qiskit_operator():
+            qc_grid_model.qc_grid_compiler.invalidate()
+            return Operator(qc_grid_model.create_quantum_circuit()).data
+
+        assert np.allclose(native(complex), qiskit_operator())
+        repeat = 3 if num_qubits < 10 else 1
+        native_time, native_memory = _common.measure(lambda: native(complex), repeat)
+        single_time, single_memory = _common.measure(lambda: native(np.complex64), repeat)
+        qiskit_time, qiskit_memory = _common.measure(qiskit_operator, repeat)
+        native(complex)
+        edit_time = _common.best_time(edit_last_column, repeat)
+        rows.append([
+            num_qubits,
+            f"{qiskit_time * 1000:.1f}",
+            f"{native_time * 1000:.1f}",
+            f"{single_time * 1000:.1f}",
+            f"{edit_time * 1000:.1f}",
+            f"{qiskit_memory / 2 ** 20:.1f}",
+            f"{native_memory / 2 ** 20:.1f}",
+            f"{single_memory / 2 ** 20:.1f}",
+        ])
+
+    print(f"{NUM_COLUMNS} columns; memory is the traced peak and includes the per-column checkpoints")
+    _common.print_table(
+        ["qubits", "qiskit (ms)", "complex128 (ms)", "complex64 (ms)", "edit last column (ms)", "qiskit (MB)", "complex128 (MB)", "complex64 (MB)"],
+        rows
+    )
+    print(get_column_operator.cache_info())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark large grids drawn in full against a fixed viewport: construction, memory, frame time and scrolling.
+
+Usage: python benchmarks/bench_viewport.py
+"""
+import _common
+
+GRID_SIZES = [(10, 40), (20, 100), (40, 200), (100, 1000)]
+VIEWPORT_SIZE = (12, 30)
+MAX_FULL_CELLS = 10000 # Larger grids are only built with a viewport
+NUM_FRAMES = 20
+
+
+def main():
+    screen = _common.setup_display((1280, 720))
+    from qcge import QuantumCircuitGrid, keys
+
+    def create_grid(num_qubits, num_columns, viewport_size):
+        qc_grid = QuantumCircuitGrid((0, 0), num_qubits, num_columns, viewport_size=viewport_size)
+        qc_grid.run()
+        return qc_grid
+
+    rows = []
+    for num_qubits, num_columns in GRID_SIZES:
+        nodes = _common.random_grid_model(num_qubits, num_columns).nodes
+        for viewport_size in (None, VIEWPORT_SIZE):
+            if viewport_size is None and num_qubits * num_columns > MAX_FULL_CELLS:
+                continue
+            run_time, peak = _common.measure(lambda: create_grid(num_qubits, num_columns, viewport_size), 3)
+            qc_grid = create_grid(num_qubits, num_columns, viewport_size)
+            qc_grid.qc_grid_model.set_nodes(nodes)
+            pixels = _common.surface_bytes(sprite.image for sprite in qc_grid.sprites())
+
+            def frames():
+                for _ in range(NUM_FRAMES):
+                    qc_grid.update()
+                    qc_grid.draw(screen)
+
+            def scroll_right():
+                # Walks the marker across the grid, scrolling one column per step once it reaches the edge
+                qc_grid.highlight_current_node(0, 0)
+                for _ in range(num_columns - 1):
+                    qc_grid.handle_input(keys.K_d)
+
+            rows.append([
+                f"{num_qubits}x{num_columns}",
+                "full" if viewport_size is None else f"{viewport_size[0]}x{viewport_size[1]}",
+                len(qc_grid.sprites()),
+                f"{run_time * 1000:.1f}",
+                f"{peak / 2 ** 20:.2f}",
+                f"{pixels / 2 ** 20:.2f}",
+                f"{_common.best_time(frames, 3) / NUM_FRAMES * 1000:.2f}",
+                f"{_common.best_time(scroll_right, 3) / (num_columns - 1) * 1000:.3f}",
+            ])
+
+    _common.print_table(["grid", "viewport", "sprites", "run (ms)", "py peak (MB)", "surfaces (MB)", "frame (ms)", "move right (ms)"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,24 @@
-from qcge.quantum_circuit import QuantumCircuitGrid
+from qcge import configs
+from qcge.quantum_circuit_model import QuantumCircuitGridNode, QuantumCircuitGridModel
+from qcge.quantum_circuit_editor import QuantumCircuitGridEditor
 from qcge.configs import *
+
+# Listed so `from qcge import *` still exports the pygame grid; the star import is what loads pygame, not `import qcge`
+__all__ = [
+    'QuantumCircuitGrid',
+    'QuantumCircuitGridHost',
+    'QuantumCircuitGridNode',
+    'QuantumCircuitGridModel',
+    'QuantumCircuitGridEditor',
+] + [name for name in dir(configs) if not name.startswith('_')]
+
+
+def __getattr__(name):
+    # The pygame grid is imported on first use, so headless code never loads pygame
+    if name == 'QuantumCircuitGrid':
+        from qcge.quantum_circuit import QuantumCircuitGrid
+        return QuantumCircuitGrid
+    if name == 'QuantumCircuitGridHost':
+        from qcge.quantum_circuit_host import QuantumCircuitGridHost
+        return QuantumCircuitGridHost
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
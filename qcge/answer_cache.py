@@ -0,0 +1,60 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from qcge.configs import *
+
+
+class QuantumCircuitGridAnswerCache:
+    """LRU cache of statevectors keyed by the canonical form of a grid's circuit, for checking puzzle answers.
+
+    Grids that only differ in layout (empty columns, identities, cancelling pairs, gates on disjoint
+    wires placed in another order) share one canonical form, see circuit_optimizer.canonicalize_instructions.
+    Repeated and equivalent submissions are then answered from the cache without simulating them again.
+    """
+    def __init__(self, max_entries=ANSWER_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.statevectors = OrderedDict() # canonical key -> statevector, least recently used first
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.statevectors)
+
+    def get_canonical_key(self, qc_grid_model):
+        return (qc_grid_model.num_qubits, qc_grid_model.qc_grid_compiler.get_canonical_instructions())
+
+    def get_statevector(self, qc_grid_model):
+        key = self.get_canonical_key(qc_grid_model)
+        if key in self.statevectors:
+            self.hits += 1
+            self.statevectors.move_to_end(key)
+            return self.statevectors[key]
+
+        self.misses += 1
+        # R(θ mod 4π) is R(θ), but canonical angles are rounded to CANONICAL_ANGLE_DECIMALS (10) decimals, so
+        # grids whose angles differ by up to 5e-11 share this statevector; each rotation is off by at most 2.5e-11
+        statevector = qc_grid_model.qc_grid_simulator.run_instructions(key[1])
+        statevector.setflags(write=False) # Shared by every equivalent grid
+        self.statevectors[key] = statevector
+        while len(self.statevectors) > self.max_entries:
+            self.statevectors.popitem(last=False)
+        return statevector
+
+    def is_equivalent(self, qc_grid_model, target_qc_grid_model, atol=1e-8):
+        """Whether both grids prepare the same state from |0...0>, up to a global phase"""
+        if qc_grid_model.num_qubits != target_qc_grid_model.num_qubits:
+            return False
+        if self.get_canonical_key(qc_grid_model) == self.get_canonical_key(target_qc_grid_model):
+            return True
+        return self.matches_state(qc_grid_model, self.get_statevector(target_qc_grid_model), atol)
+
+    def matches_state(self, qc_grid_model, target_state, atol=1e-8):
+        """Whether the grid prepares target_state from |0...0>, up to a global phase"""
+        overlap = np.vdot(target_state, self.get_statevector(qc_grid_model))
+        return bool(np.isclose(abs(overlap), 1, atol=atol))
+
+    def clear(self):
+        self.statevectors.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,110 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from qcge.configs import *
+from qcge.quantum_circuit_model import QuantumCircuitGridModel
+from qcge.evaluation_pool import EVALUATION_MODES, evaluate_grid_model
+
+
+class QuantumCircuitGridAsyncEvaluator:
+    """Evaluates snapshots of a grid model on a background thread, so the frame loop never waits for a simulation.
+
+    Call poll() once per frame. It submits a snapshot of the model if it changed since the last one, and
+    returns the result of the latest snapshot once it is ready, also passing it to callback on the caller's
+    thread. With event_type, the worker posts it as a pygame event of that type as well.
+    A snapshot superseded before it starts is cancelled, and the result of one superseded while running is dropped.
+    The worker keeps its own copy of the model, so only the columns changed since its previous snapshot are recomputed.
+    mode is one of EVALUATION_MODES, or a function taking the grid model and returning the result.
+    """
+    def __init__(self, qc_grid_model, mode='probabilities', callback=None, event_type=None):
+        if not callable(mode) and mode not in EVALUATION_MODES:
+            raise ValueError(f"Unknown evaluation mode {mode!r}, expected one of {EVALUATION_MODES} or a function")
+        self.qc_grid_model = qc_grid_model
+        self.mode = mode
+        self.callback = callback
+        self.event_type = event_type
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='qcge-evaluator')
+        self.worker_grid_model = QuantumCircuitGridModel(qc_grid_model.num_qubits, qc_grid_model.num_columns)
+
+        self.lock = threading.Lock()
+        self.generation = 0 # Snapshots submitted so far; the latest one is the only one whose result counts
+        self.pending_future = None
+        self.latest_result = None
+        self.latest_generation = 0 # Snapshot latest_result was computed from
+        self.delivered_generation = 0
+        self.model_changed = True
+        self.qc_grid_model.add_node_listener(self.handle_node_changed)
+
+    def handle_node_changed(self, wire, column, old_record, new_record):
+        self.model_changed = True
+
+    def submit(self):
+        """Evaluate the model as it is now, superseding every earlier snapshot"""
+        self.model_changed = False
+        with self.lock:
+            self.generation += 1
+            generation = self.generation
+        if self.pending_future is not None:
+            self.pending_future.cancel() # Only succeeds if the worker hasn't started it yet
+        self.pending_future = self.executor.submit(self.evaluate_snapshot, generation, self.qc_grid_model.nodes.copy())
+        return generation
+
+    def evaluate_snapshot(self, generation, nodes):
+        # Runs on the worker thread, the only one that touches worker_grid_model
+        if generation != self.generation:
+            return
+        self.worker_grid_model.set_nodes(nodes)
+        if callable(self.mode):
+            result = self.mode(self.worker_grid_model)
+        else:
+            result = evaluate_grid_model(self.worker_grid_model, self.mode)
+        if isinstance(result, np.ndarray):
+            result = result.copy() # The worker model reuses its arrays for the next snapshot
+
+        with self.lock:
+            if generation != self.generation:
+                return
+            self.latest_result = result
+            self.latest_generation = generation
+            if self.event_type is not None:
+                import pygame
+                pygame.event.post(pygame.event.Event(self.event_type, result=result, generation=generation))
+
+    def is_current(self):
+        """True if latest_result belongs to the model as it is now"""
+        return not self.model_changed and self.latest_generation == self.generation
+
+    def poll(self):
+        """Submit the model if it changed, and return the latest result if it wasn't returned before, else None"""
+        if self.pending_future is not None and self.pending_future.done():
+            future, self.pending_future = self.pending_future, None
+            if not future.cancelled() and future.exception() is not None:
+                raise future.exception()
+        if self.model_changed:
+            self.submit()
+
+        with self.lock:
+            if self.latest_generation == self.delivered_generation:
+                return None
+            self.delivered_generation = self.latest_generation
+            result = self.latest_result
+        if self.callback is not None:
+            self.callback(result)
+        return result
+
+    def wait(self, timeout=None):
+        """Block until the result for the model as it is now is ready, and return it"""
+        if self.model_changed:
+            self.submit()
+        if self.pending_future is not None:
+            self.pending_future.result(timeout)
+        self.poll()
+        return self.latest_result
+
+    def shutdown(self):
+        self.qc_grid_model.remove_node_listener(self.handle_node_changed)
+        with self.lock:
+            self.generation += 1 # Drops the result of a running evaluation
+        self.executor.shutdown(wait=True, cancel_futures=True)
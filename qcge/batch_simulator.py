@@ -0,0 +1,182 @@
+import numpy as np
+
+from qcge.configs import *
+from qcge.statevector_simulator import GATE_MATRICES, CONTROLLED_GATES, rotation_matrix
+
+
+class QuantumCircuitGridBatchSimulator:
+    """Statevector simulator for a batch of circuits on the same number of qubits.
+
+    All statevectors live in one (batch, 2, 2, ..., 2) array, so a gate shared by many circuits is applied
+    to all of them with a single NumPy operation. Gates can also carry one 2x2 matrix per batch member,
+    which is how a single grid is evaluated for many rotation angles at once.
+    """
+    def __init__(self, num_qubits, batch_size):
+        self.num_qubits = num_qubits
+        self.batch_size = batch_size
+
+    def create_initial_states(self):
+        states = np.zeros((self.batch_size, 2 ** self.num_qubits), dtype=complex)
+        states[:, 0] = 1
+        return states
+
+    def get_slice(self, fixed_qubits):
+        # Axis 0 is the batch, then wire n-1 down to wire 0 as in QuantumCircuitGridSimulator
+        index = [slice(None)] * (self.num_qubits + 1)
+        for qubit, value in fixed_qubits:
+            index[self.num_qubits - qubit] = value
+        return tuple(index)
+
+    def apply_matrices(self, states_tensor, matrices, target, controls=()):
+        fixed_controls = [(control, 1) for control in controls]
+        index_0 = self.get_slice(fixed_controls + [(target, 0)])
+        index_1 = self.get_slice(fixed_controls + [(target, 1)])
+
+        if matrices.ndim == 2 and matrices[0, 1] == 0 and matrices[1, 0] == 0: # Shared diagonal gate
+            if matrices[0, 0] != 1:
+                states_tensor[index_0] *= matrices[0, 0]
+            if matrices[1, 1] != 1:
+                states_tensor[index_1] *= matrices[1, 1]
+            return
+
+        amplitudes_0 = states_tensor[index_0].copy()
+        if matrices.ndim == 2 and matrices[0, 0] == 0 and matrices[1, 1] == 0 and matrices[0, 1] == 1 and matrices[1, 0] == 1: # Shared X
+            states_tensor[index_0] = states_tensor[index_1]
+            states_tensor[index_1] = amplitudes_0
+            return
+
+        amplitudes_1 = states_tensor[index_1]
+        if matrices.ndim == 3: # One matrix per batch member, broadcast over its amplitudes
+            matrices = matrices.reshape(matrices.shape[:1] + (1,) * (amplitudes_0.ndim - 1) + (2, 2))
+        states_tensor[index_0] = matrices[..., 0, 0] * amplitudes_0 + matrices[..., 0, 1] * amplitudes_1
+        states_tensor[index_1] = matrices[..., 1, 0] * amplitudes_0 + matrices[..., 1, 1] * amplitudes_1
+
+    def apply_swap(self, states_tensor, first, second, controls=()):
+        fixed_controls = [(control, 1) for control in controls]
+        index_01 = self.get_slice(fixed_controls + [(first, 0), (second, 1)])
+        index_10 = self.get_slice(fixed_controls + [(first, 1), (second, 0)])
+        amplitudes_01 = states_tensor[index_01].copy()
+        states_tensor[index_01] = states_tensor[index_10]
+        states_tensor[index_10] = amplitudes_01
+
+    def apply_instruction(self, states, instruction, members=None, matrices=None):
+        """Apply an instruction to the batch members listed in members, or to the whole batch if it is None.
+
+        matrices optionally replaces the instruction's own 2x2 matrix with one matrix per member.
+        """
+        if members is None:
+            member_states = states
+        else:
+            member_states = states[members]
+        states_tensor = member_states.reshape((len(member_states),) + (2,) * self.num_qubits)
+
+        name, params, qubits = instruction
+        if name in GATE_MATRICES or name in ('rx', 'ry', 'rz'):
+            if matrices is None:
+                matrices = GATE_MATRICES[name] if name in GATE_MATRICES else rotation_matrix(name, params[0])
+            self.apply_matrices(states_tensor, matrices, qubits[0])
+        elif name in CONTROLLED_GATES:
+            gate_name, num_controls = CONTROLLED_GATES[name]
+            if matrices is None:
+                matrices = GATE_MATRICES[gate_name]
+            self.apply_matrices(states_tensor, matrices, qubits[num_controls], qubits[:num_controls])
+        elif name == 'swap':
+            self.apply_swap(states_tensor, qubits[0], qubits[1])
+        elif name == 'cswap':
+            self.apply_swap(states_tensor, qubits[1], qubits[2], qubits[:1])
+
+        if members is not None:
+            states[members] = member_states
+
+
+def check_same_num_qubits(qc_grid_models):
+    if len({qc_grid_model.num_qubits for qc_grid_model in qc_grid_models}) > 1:
+        raise ValueError("All grid models in a batch must have the same number of qubits")
+
+
+def simulate_grids(qc_grid_models):
+    """Return a (len(qc_grid_models), 2**num_qubits) array with the statevector of every grid model.
+
+    Models are evaluated column by column. Every distinct instruction of a column is applied once,
+    to the stacked states of all the models that contain it. Raises ValueError for an empty list, whose
+    number of qubits, and so the width of the result, is unknown.
+    """
+    if len(qc_grid_models) == 0:
+        raise ValueError("simulate_grids needs at least one grid model")
+    check_same_num_qubits(qc_grid_models)
+    batch_simulator = QuantumCircuitGridBatchSimulator(qc_grid_models[0].num_qubits, len(qc_grid_models))
+    states = batch_simulator.create_initial_states()
+
+    for column in range(max(qc_grid_model.num_columns for qc_grid_model in qc_grid_models)):
+        # Instructions of one grid column act on distinct wires, so their order within the column doesn't matter
+        instruction_members = {}
+        for index, qc_grid_model in enumerate(qc_grid_models):
+            if column < qc_grid_model.num_columns:
+                for instruction in qc_grid_model.qc_grid_compiler.get_column_instructions(column):
+                    instruction_members.setdefault(instruction, []).append(index)
+
+        for instruction, members in instruction_members.items():
+            if len(members) == len(qc_grid_models):
+                members = None
+            batch_simulator.apply_instruction(states, instruction, members)
+
+    return states
+
+
+def get_grids_probabilities(qc_grid_models):
+    return np.abs(simulate_grids(qc_grid_models)) ** 2
+
+
+def simulate_angle_sweep(qc_grid_model, angle_assignments):
+    """Return the statevectors of qc_grid_model for many rotation angle assignments at once.
+
+    angle_assignments maps the (wire, column) of X, Y or Z nodes to equally long sequences of angles;
+    member i of the batch uses the i-th angle of every sequence. Like set_node, an angle of 0 turns
+    the node back into its plain (possibly controlled) gate.
+    """
+    angle_assignments = {node: np.asarray(angles, dtype=float) for node, angles in angle_assignments.items()}
+    batch_sizes = {len(angles) for angles in angle_assignments.values()}
+    if len(batch_sizes) != 1:
+        raise ValueError("Every node of an angle sweep needs the same number of angles")
+    for wire, column in angle_assignments:
+        if qc_grid_model.nodes['gate_type'][wire, column] not in (GATES['X'], GATES['Y'], GATES['Z']):
+            raise ValueError(f"Node ({wire}, {column}) is not an X, Y or Z gate and can't be rotated")
+
+    qc_grid_compiler = qc_grid_model.qc_grid_compiler
+    batch_simulator = QuantumCircuitGridBatchSimulator(qc_grid_model.num_qubits, batch_sizes.pop())
+    states = batch_simulator.create_initial_states()
+
+    for column in range(qc_grid_model.num_columns):
+        swept_wires = [wire for wire, swept_column in angle_assignments if swept_column == column]
+        if not swept_wires:
+            for instruction in qc_grid_compiler.get_column_instructions(column):
+                batch_simulator.apply_instruction(states, instruction)
+            continue
+
+        for wire in np.flatnonzero(qc_grid_model.nodes['gate_type'][:, column] != GATES['EMPTY']):
+            wire = int(wire)
+            gate_type, _, first_ctrl, second_ctrl, swap = qc_grid_model.nodes[wire, column].item()
+            if wire not in swept_wires:
+                instruction = qc_grid_compiler.compile_node(wire, *qc_grid_model.nodes[wire, column].item())
+                if instruction is not None:
+                    batch_simulator.apply_instruction(states, instruction)
+                continue
+
+            angles = angle_assignments[(wire, column)]
+            rotated = np.flatnonzero(angles != 0)
+            unrotated = np.flatnonzero(angles == 0)
+            if len(rotated):
+                instruction = qc_grid_compiler.compile_node(wire, gate_type, 1.0, first_ctrl, second_ctrl, swap)
+                matrices = rotation_matrix(instruction[0], angles[rotated])
+                members = None if len(rotated) == len(angles) else rotated
+                batch_simulator.apply_instruction(states, instruction, members, matrices)
+            if len(unrotated):
+                instruction = qc_grid_compiler.compile_node(wire, gate_type, 0.0, first_ctrl, second_ctrl, swap)
+                members = None if len(unrotated) == len(angles) else unrotated
+                batch_simulator.apply_instruction(states, instruction, members)
+
+    return states
+
+
+def get_angle_sweep_probabilities(qc_grid_model, angle_assignments):
+    return np.abs(simulate_angle_sweep(qc_grid_model, angle_assignments)) ** 2
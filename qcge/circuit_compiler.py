@@ -0,0 +1,170 @@
+import hashlib
+
+import numpy as np
+
+from qcge.configs import *
+from qcge.instrumentation import timed
+from qcge.circuit_optimizer import optimize_instructions, canonicalize_instructions, get_optimization_report
+
+
+_qiskit_gates = None
+
+def get_qiskit_gates():
+    """Qiskit gate for every instruction name the compiler emits.
+
+    qiskit is only imported the first time a qiskit circuit is built, so headless grids never pay for it.
+    """
+    global _qiskit_gates
+    if _qiskit_gates is None:
+        from qiskit.circuit.library import (
+            IGate, XGate, YGate, ZGate, SGate, SdgGate, TGate, TdgGate, HGate, SwapGate,
+            CXGate, CCXGate, CYGate, CZGate, CHGate, CSwapGate, RXGate, RYGate, RZGate
+        )
+        _qiskit_gates = {
+            'id': IGate, 'x': XGate, 'y': YGate, 'z': ZGate, 's': SGate, 'sdg': SdgGate, 't': TGate, 'tdg': TdgGate,
+            'h': HGate, 'swap': SwapGate, 'cx': CXGate, 'ccx': CCXGate, 'cy': CYGate, 'cz': CZGate, 'ch': CHGate,
+            'cswap': CSwapGate, 'rx': RXGate, 'ry': RYGate, 'rz': RZGate
+        }
+    return _qiskit_gates
+
+# Instruction names for gates without controls, rotation or swap
+SINGLE_QUBIT_GATE_NAMES = {
+    GATES['IDENTITY']: 'id', GATES['X']: 'x', GATES['Y']: 'y', GATES['Z']: 'z', GATES['S']: 's',
+    GATES['SDG']: 'sdg', GATES['T']: 't', GATES['TDG']: 'tdg', GATES['H']: 'h'
+}
+ROTATION_GATE_NAMES = {GATES['X']: 'rx', GATES['Y']: 'ry', GATES['Z']: 'rz'}
+CONTROLLED_GATE_NAMES = {GATES['X']: 'cx', GATES['Y']: 'cy', GATES['Z']: 'cz', GATES['H']: 'ch'}
+
+
+class QuantumCircuitGridCompiler:
+    """Compiles a QuantumCircuitGridModel column by column and caches every compiled column.
+
+    An instruction is a (name, params, qubits) tuple, e.g. ('cx', (), (0, 1)) or ('rx', (theta,), (2,)).
+    The model invalidates a column whenever set_node writes to it, so only edited columns are recompiled.
+    """
+    def __init__(self, qc_grid_model):
+        self.qc_grid_model = qc_grid_model
+        self.qr = None # Created with the first qiskit circuit
+        self.column_instructions = [None] * self.qc_grid_model.num_columns
+        self.column_circuit_instructions = [None] * self.qc_grid_model.num_columns
+        self.optimized_instructions = None
+        self.optimized_circuit_instructions = None
+        self.canonical_instructions = None
+        self.grid_hash = None
+
+    def invalidate_column(self, column):
+        self.column_instructions[column] = None
+        self.column_circuit_instructions[column] = None
+        self.optimized_instructions = None
+        self.optimized_circuit_instructions = None
+        self.canonical_instructions = None
+        self.grid_hash = None
+
+    def invalidate(self):
+        for column in range(self.qc_grid_model.num_columns):
+            self.invalidate_column(column)
+
+    def compile_node(self, wire, gate_type, rotation_angle, first_ctrl, second_ctrl, swap):
+        """Return the instruction of the node on wire, or None if the node emits nothing"""
+        if gate_type in ROTATION_GATE_NAMES and rotation_angle != 0: # RX, RY or RZ Gate
+            return (ROTATION_GATE_NAMES[gate_type], (rotation_angle,), (wire,))
+        elif gate_type == GATES['X'] and first_ctrl != -1 and second_ctrl != -1: # Toffoli Gate
+            return ('ccx', (), (first_ctrl, second_ctrl, wire))
+        elif gate_type in CONTROLLED_GATE_NAMES and first_ctrl != -1: # CX, CY, CZ or CH Gate
+            return (CONTROLLED_GATE_NAMES[gate_type], (), (first_ctrl, wire))
+        elif gate_type == GATES['SWAP'] and swap != -1:
+            if first_ctrl != -1: # Controlled Swap Gate
+                return ('cswap', (), (first_ctrl, wire, swap))
+            return ('swap', (), (wire, swap))
+        elif gate_type in SINGLE_QUBIT_GATE_NAMES:
+            return (SINGLE_QUBIT_GATE_NAMES[gate_type], (), (wire,))
+        return None
+
+    @timed('compiler.compile_column')
+    def compile_column(self, column):
+        instructions = []
+        column_nodes = self.qc_grid_model.nodes[:, column]
+
+        # Only occupied nodes emit instructions; control, control line and swap partner nodes are EMPTY
+        for wire in np.flatnonzero(column_nodes['gate_type'] != GATES['EMPTY']):
+            instruction = self.compile_node(int(wire), *column_nodes[wire].item())
+            if instruction is not None:
+                instructions.append(instruction)
+
+        return instructions
+
+    def get_column_instructions(self, column):
+        if self.column_instructions[column] is None:
+            self.column_instructions[column] = self.compile_column(column)
+        return self.column_instructions[column]
+
+    def get_instructions(self):
+        """Return the instructions of the whole grid in column-major order"""
+        instructions = []
+        for column in range(self.qc_grid_model.num_columns):
+            instructions.extend(self.get_column_instructions(column))
+        return instructions
+
+    def get_optimized_instructions(self):
+        """Return get_instructions() after the peephole pass of circuit_optimizer"""
+        if self.optimized_instructions is None:
+            self.optimized_instructions = optimize_instructions(self.get_instructions())
+        return self.optimized_instructions
+
+    def get_canonical_instructions(self):
+        """Return the canonical form of circuit_optimizer.canonicalize_instructions for the whole grid"""
+        if self.canonical_instructions is None:
+            self.canonical_instructions = canonicalize_instructions(self.get_instructions())
+        return self.canonical_instructions
+
+    def get_optimization_report(self):
+        return get_optimization_report(self.get_instructions(), self.get_optimized_instructions())
+
+    def get_quantum_register(self):
+        if self.qr is None:
+            from qiskit import QuantumRegister
+            self.qr = QuantumRegister(self.qc_grid_model.num_qubits, "q")
+        return self.qr
+
+    def create_circuit_instructions(self, instructions):
+        from qiskit.circuit import CircuitInstruction
+        qiskit_gates = get_qiskit_gates()
+        qr = self.get_quantum_register()
+        return [
+            CircuitInstruction(qiskit_gates[name](*params), tuple(qr[qubit] for qubit in qubits))
+            for name, params, qubits in instructions
+        ]
+
+    def get_column_circuit_instructions(self, column):
+        if self.column_circuit_instructions[column] is None:
+            self.column_circuit_instructions[column] = self.create_circuit_instructions(self.get_column_instructions(column))
+        return self.column_circuit_instructions[column]
+
+    @timed('compiler.create_quantum_circuit')
+    def create_quantum_circuit(self, optimize=False):
+        from qiskit import QuantumCircuit
+        qc = QuantumCircuit(self.get_quantum_register())
+        if optimize:
+            if self.optimized_circuit_instructions is None:
+                self.optimized_circuit_instructions = self.create_circuit_instructions(self.get_optimized_instructions())
+            circuit_instructions = self.optimized_circuit_instructions
+        else:
+            # Cached columns are spliced in as they are
+            circuit_instructions = [
+                circuit_instruction
+                for column in range(self.qc_grid_model.num_columns)
+                for circuit_instruction in self.get_column_circuit_instructions(column)
+            ]
+        # The instructions are already validated
+        for circuit_instruction in circuit_instructions:
+            qc._append(circuit_instruction)
+        return qc
+
+    def content_hash(self):
+        """Stable digest of the grid contents, equal for grids holding the same nodes"""
+        if self.grid_hash is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(np.array(self.qc_grid_model.nodes.shape, dtype=np.int64).tobytes())
+            digest.update(self.qc_grid_model.nodes.tobytes())
+            self.grid_hash = digest.hexdigest()
+        return self.grid_hash
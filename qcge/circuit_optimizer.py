@@ -0,0 +1,119 @@
+import numpy as np
+
+from qcge.configs import *
+
+
+# Gates that undo each other when applied back to back on the same qubits
+INVERSE_GATE_NAMES = {
+    'x': 'x', 'y': 'y', 'z': 'z', 'h': 'h', 's': 'sdg', 'sdg': 's', 't': 'tdg', 'tdg': 't',
+    'cx': 'cx', 'ccx': 'ccx', 'cy': 'cy', 'cz': 'cz', 'ch': 'ch', 'swap': 'swap', 'cswap': 'cswap'
+}
+ROTATION_NAMES = ('rx', 'ry', 'rz')
+CANONICAL_ANGLE_DECIMALS = 10 # Angles that only differ by float noise get the same canonical form
+
+
+def is_identity_rotation(rotation_angle):
+    # R(θ) has period 4π; R(2π) is -I, which only differs by a global phase but is kept so statevectors stay exact
+    rotation_angle = rotation_angle % (4 * np.pi)
+    return np.isclose(rotation_angle, 0) or np.isclose(rotation_angle, 4 * np.pi)
+
+
+def optimize_instructions(instructions):
+    """Peephole-optimize compiled (name, params, qubits) instructions, given in column-major order.
+
+    Identities are dropped, back to back inverse gates on the same qubits cancel, and consecutive
+    rotations about the same axis on a wire are merged into one. Cancellations cascade, so H X X H
+    becomes nothing. The result is an instruction list with the same unitary.
+    """
+    optimized = []
+    qubit_instructions = {} # qubit -> indices into optimized of the instructions still acting on it, in order
+
+    for instruction in instructions:
+        name, params, qubits = instruction
+        if name == 'id':
+            continue
+
+        # The previous instruction is adjacent only if it is the latest one on every qubit of this one
+        previous_indices = {qubit_instructions[qubit][-1] if qubit_instructions.get(qubit) else None for qubit in qubits}
+        previous_index = previous_indices.pop() if len(previous_indices) == 1 else None
+        if previous_index is not None and optimized[previous_index][2] == qubits:
+            previous_name, previous_params, _ = optimized[previous_index]
+            if INVERSE_GATE_NAMES.get(previous_name) == name:
+                remove_instruction(optimized, qubit_instructions, previous_index)
+                continue
+            if previous_name == name and name in ROTATION_NAMES:
+                rotation_angle = previous_params[0] + params[0]
+                if is_identity_rotation(rotation_angle):
+                    remove_instruction(optimized, qubit_instructions, previous_index)
+                else:
+                    optimized[previous_index] = (name, (rotation_angle,), qubits)
+                continue
+
+        optimized.append(instruction)
+        for qubit in qubits:
+            qubit_instructions.setdefault(qubit, []).append(len(optimized) - 1)
+
+    return [instruction for instruction in optimized if instruction is not None]
+
+
+def remove_instruction(optimized, qubit_instructions, index):
+    for qubit in optimized[index][2]:
+        qubit_instructions[qubit].pop()
+    optimized[index] = None
+
+
+def canonicalize_instruction(instruction):
+    name, params, qubits = instruction
+    # Gates that are symmetric in some of their qubits list those qubits in sorted order
+    if name in ('cz', 'swap'):
+        qubits = tuple(sorted(qubits))
+    elif name == 'ccx':
+        qubits = tuple(sorted(qubits[:2])) + qubits[2:]
+    elif name == 'cswap':
+        qubits = qubits[:1] + tuple(sorted(qubits[1:]))
+    if name in ROTATION_NAMES:
+        params = (round(float(params[0] % (4 * np.pi)), CANONICAL_ANGLE_DECIMALS),)
+    return (name, params, qubits)
+
+
+def canonicalize_instructions(instructions):
+    """Return a canonical form of the instructions, equal for grids that only differ in layout.
+
+    The instructions are optimized, then every gate is moved to the earliest layer it can run in and each
+    layer is sorted. Gates on disjoint qubits commute, so grids that place the same gates in different
+    columns, in a different order within those limits, or with empty columns and identities in between,
+    all give the same tuple of instructions.
+    """
+    layers = []
+    qubit_depths = {}
+    for instruction in optimize_instructions(instructions):
+        instruction = canonicalize_instruction(instruction)
+        layer = max(qubit_depths.get(qubit, 0) for qubit in instruction[2])
+        for qubit in instruction[2]:
+            qubit_depths[qubit] = layer + 1
+        if layer == len(layers):
+            layers.append([])
+        layers[layer].append(instruction)
+    # The gates of a layer act on disjoint qubits, so sorting by qubits orders them completely
+    return tuple(instruction for layer in layers for instruction in sorted(layer, key=lambda instruction: instruction[2]))
+
+
+def get_circuit_depth(instructions):
+    """Number of layers of the instructions, counted like qiskit's QuantumCircuit.depth()"""
+    qubit_depths = {}
+    depth = 0
+    for _, _, qubits in instructions:
+        layer = max(qubit_depths.get(qubit, 0) for qubit in qubits) + 1
+        for qubit in qubits:
+            qubit_depths[qubit] = layer
+        depth = max(depth, layer)
+    return depth
+
+
+def get_optimization_report(instructions, optimized_instructions):
+    return {
+        'gate_count': len(instructions),
+        'optimized_gate_count': len(optimized_instructions),
+        'depth': get_circuit_depth(instructions),
+        'optimized_depth': get_circuit_depth(optimized_instructions),
+    }
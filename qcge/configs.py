@@ -21,13 +21,41 @@ QUANTUM_CIRCUIT_MARKER_MOVE_RIGHT = 2
 QUANTUM_CIRCUIT_MARKER_MOVE_UP = 3
 QUANTUM_CIRCUIT_MARKER_MOVE_DOWN = 4
 
+# Render Layers
+QUANTUM_CIRCUIT_BACKGROUND_LAYER = 0
+QUANTUM_CIRCUIT_GATE_LAYER = 1
+QUANTUM_CIRCUIT_MARKER_LAYER = 2
+QUANTUM_CIRCUIT_OVERLAY_LAYER = 3
+QUANTUM_CIRCUIT_LAYERS_PER_GRID = 4 # Band of layers each grid takes in a QuantumCircuitGridHost
+
+# Simulation
+STATEVECTOR_CHECKPOINT_MEMORY_BUDGET = 64 * 1024 * 1024 # Bytes of per-column statevectors each grid model may keep
+EVALUATION_POOL_CHUNK_SIZE = 16 # Grid models sent to a worker process per task
+ANSWER_CACHE_MAX_ENTRIES = 4096 # Canonical circuits whose statevector the answer cache keeps
+UNITARY_CHECKPOINT_MEMORY_BUDGET = 64 * 1024 * 1024 # Bytes of per-column unitaries each grid model may keep
+UNITARY_COLUMN_OPERATOR_CACHE_SIZE = 4096 # Distinct column operators shared by all grid models
+
+# Editing
+EDIT_HISTORY_MAX_EDITS = 256 # Undo steps kept per grid
+EDIT_HISTORY_MAX_NODE_CHANGES = 65536 # Node changes kept across all undo steps, 34 bytes each
+
+# Rendering
+ROTATION_GATE_ANGLE_STEPS = 256 # Arc angles a rotation gate is drawn with per turn; multiples of pi / 8 are exact
+ROTATION_GATE_CACHE_MAX_ENTRIES = 256 # Pre-rendered rotation gate surfaces kept by the gate atlas
+
+# Instrumentation
+PROFILER_OVERLAY_REFRESH_INTERVAL = 0.25 # Seconds between re-renders of the profiler overlay text
+
 # Sizes
 QUANTUM_CIRCUIT_TILE_SIZE = 36
 GATE_TILE_WIDTH = 24
 GATE_TILE_HIEGHT = 24
 WIRE_LINE_WIDTH = 1
+PROFILER_OVERLAY_FONT_SIZE = 18
 
 # Colors 
 QUANTUM_CIRCUIT_BG_COLOR = '#444654'
 QUANTUM_CIRCUIT_WIRE_COLOR = '#ffffff'
-QUANTUM_GATE_PHASE_COLOR = '#97ad40'
\ No newline at end of file
+QUANTUM_GATE_PHASE_COLOR = '#97ad40'
+PROFILER_OVERLAY_BG_COLOR = '#202123'
+PROFILER_OVERLAY_TEXT_COLOR = '#ffffff'
\ No newline at end of file
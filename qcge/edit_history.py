@@ -0,0 +1,119 @@
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+from qcge.configs import *
+from qcge.quantum_circuit_model import QuantumCircuitGridNode, QuantumCircuitGridModel
+
+
+# One node write: where it happened, and the node records before and after it
+NODE_CHANGE_DTYPE = np.dtype([
+    ('wire', np.int16),
+    ('column', np.int16),
+    ('old_node', QuantumCircuitGridModel.NODE_DTYPE),
+    ('new_node', QuantumCircuitGridModel.NODE_DTYPE),
+])
+
+
+class QuantumCircuitGridHistory:
+    """Undo/redo history of a grid model, built from the node changes reported by set_node.
+
+    Each undo step is a compact array of NODE_CHANGE_DTYPE records, so undoing or redoing costs time
+    proportional to the size of the edit rather than the size of the grid. Node changes made inside
+    edit() form one step, as do those of one set_nodes call; other changes are a step each. The oldest steps are dropped
+    once there are more than max_edits of them or they hold more than max_node_changes records.
+    """
+    def __init__(self, qc_grid_model, max_edits=EDIT_HISTORY_MAX_EDITS, max_node_changes=EDIT_HISTORY_MAX_NODE_CHANGES):
+        self.qc_grid_model = qc_grid_model
+        self.max_node_changes = max_node_changes
+        self.undo_steps = deque(maxlen=max_edits)
+        self.redo_steps = []
+        self.num_node_changes = 0 # Records held by undo_steps
+        self.pending_changes = [] # Changes of the step being recorded
+        self.edit_depth = 0
+        self.applying = False
+        self.qc_grid_model.add_node_listener(self.handle_node_changed)
+        self.qc_grid_model.add_batch_listener(self.edit) # A whole set_nodes call is one step
+
+    def handle_node_changed(self, wire, column, old_record, new_record):
+        if self.applying:
+            return
+        if old_record == new_record:
+            return
+        self.pending_changes.append((wire, column, old_record, new_record))
+        if self.edit_depth == 0:
+            self.commit_step()
+
+    @contextmanager
+    def edit(self):
+        """Record every node change made inside the with block as a single undo step"""
+        self.begin_edit()
+        try:
+            yield self
+        finally:
+            self.end_edit()
+
+    def begin_edit(self):
+        self.edit_depth += 1
+
+    def end_edit(self):
+        self.edit_depth -= 1
+        if self.edit_depth == 0:
+            self.commit_step()
+
+    def commit_step(self):
+        if not self.pending_changes:
+            return
+        step = np.array(self.pending_changes, dtype=NODE_CHANGE_DTYPE)
+        self.pending_changes = []
+        self.redo_steps.clear() # A new edit ends the redo branch
+        self.push_undo_step(step)
+
+    def push_undo_step(self, step):
+        if len(self.undo_steps) == self.undo_steps.maxlen:
+            self.num_node_changes -= len(self.undo_steps[0]) # Evicted by the append below
+        self.undo_steps.append(step)
+        self.num_node_changes += len(step)
+        while self.num_node_changes > self.max_node_changes and len(self.undo_steps) > 1:
+            self.num_node_changes -= len(self.undo_steps.popleft())
+
+    def can_undo(self):
+        return len(self.undo_steps) > 0
+
+    def can_redo(self):
+        return len(self.redo_steps) > 0
+
+    def apply_records(self, changes, field):
+        self.applying = True
+        try:
+            # Like set_nodes, so undoing a large step reloads each grid column once
+            with self.qc_grid_model.batch_notifications():
+                for change in changes:
+                    self.qc_grid_model.set_node(int(change['wire']), int(change['column']), QuantumCircuitGridNode(*change[field].item()))
+        finally:
+            self.applying = False
+
+    def undo(self):
+        """Revert the latest step and return it, or None if there is nothing to undo"""
+        if not self.undo_steps:
+            return None
+        step = self.undo_steps.pop()
+        self.num_node_changes -= len(step)
+        self.apply_records(step[::-1], 'old_node')
+        self.redo_steps.append(step)
+        return step
+
+    def redo(self):
+        """Reapply the latest undone step and return it, or None if there is nothing to redo"""
+        if not self.redo_steps:
+            return None
+        step = self.redo_steps.pop()
+        self.apply_records(step, 'new_node')
+        self.push_undo_step(step)
+        return step
+
+    def clear(self):
+        self.undo_steps.clear()
+        self.redo_steps.clear()
+        self.num_node_changes = 0
@@ -0,0 +1,117 @@
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from qcge.configs import *
+from qcge.grid_store import grid_model_to_bytes, grid_model_from_bytes
+
+
+EVALUATION_MODES = ('probabilities', 'statevector', 'instructions')
+
+
+def evaluate_grid_model(qc_grid_model, mode):
+    if mode == 'probabilities':
+        return qc_grid_model.get_probabilities()
+    elif mode == 'statevector':
+        return qc_grid_model.simulate()
+    else: # instructions
+        return qc_grid_model.qc_grid_compiler.get_instructions()
+
+
+def evaluate_packed_grid_models(packed_grid_models, mode):
+    # Runs in the worker processes
+    return [evaluate_grid_model(grid_model_from_bytes(packed_grid_model), mode) for packed_grid_model in packed_grid_models]
+
+
+class QuantumCircuitGridEvaluationPool:
+    """Compiles and simulates grid models on a pool of worker processes.
+
+    Grid models are sent to the workers in their binary form (see grid_store), in chunks of chunk_size models.
+    At most max_pending chunks are queued or running at once: submit() blocks (or raises queue.Full
+    when block=False) until a slot frees up, so a producer can never flood the workers.
+    """
+    def __init__(self, num_workers=None, max_pending=None, chunk_size=EVALUATION_POOL_CHUNK_SIZE):
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.num_workers
+        self.chunk_size = chunk_size
+        self.executor = ProcessPoolExecutor(max_workers=self.num_workers)
+        self.pending_slots = threading.BoundedSemaphore(self.max_pending)
+        self.pending_futures = set()
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown(cancel_pending=exc_type is not None)
+
+    def check_mode(self, mode):
+        if mode not in EVALUATION_MODES:
+            raise ValueError(f"Unknown evaluation mode {mode!r}, expected one of {EVALUATION_MODES}")
+
+    def release_slot(self, future):
+        with self.lock:
+            self.pending_futures.discard(future)
+        self.pending_slots.release()
+
+    def submit_chunk(self, qc_grid_models, mode='probabilities', block=True, timeout=None):
+        """Queue a list of grid models as one task; the future resolves to the list of their results"""
+        self.check_mode(mode)
+        if not self.pending_slots.acquire(block, timeout):
+            raise queue.Full("Too many grid evaluations are already pending")
+        packed_grid_models = [grid_model_to_bytes(qc_grid_model) for qc_grid_model in qc_grid_models]
+        try:
+            future = self.executor.submit(evaluate_packed_grid_models, packed_grid_models, mode)
+        except BaseException:
+            self.pending_slots.release()
+            raise
+        with self.lock:
+            self.pending_futures.add(future)
+        future.add_done_callback(self.release_slot)
+        return future
+
+    def submit(self, qc_grid_model, mode='probabilities', block=True, timeout=None):
+        """Queue a single grid model; the future resolves to a one element list holding its result"""
+        return self.submit_chunk([qc_grid_model], mode, block, timeout)
+
+    def evaluate(self, qc_grid_models, mode='probabilities'):
+        """Yield (index, result) for every grid model as soon as its chunk finishes, in completion order.
+
+        Chunks are submitted lazily while results are consumed, so qc_grid_models may be a long generator.
+        Closing the generator early cancels the chunks that haven't started yet.
+        """
+        self.check_mode(mode)
+        chunk_indices = {}
+        grid_models = iter(enumerate(qc_grid_models))
+        exhausted = False
+        try:
+            while True:
+                # Keep the pool busy without going over the pending limit
+                while not exhausted and len(chunk_indices) < self.max_pending:
+                    chunk = [indexed_model for _, indexed_model in zip(range(self.chunk_size), grid_models)]
+                    if not chunk:
+                        exhausted = True
+                        break
+                    future = self.submit_chunk([qc_grid_model for _, qc_grid_model in chunk], mode)
+                    chunk_indices[future] = [index for index, _ in chunk]
+
+                if not chunk_indices:
+                    return
+                done, _ = wait(chunk_indices, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for index, result in zip(chunk_indices.pop(future), future.result()):
+                        yield index, result
+        finally:
+            for future in chunk_indices:
+                future.cancel()
+
+    def cancel_all(self):
+        """Cancel every queued evaluation that hasn't started running yet"""
+        with self.lock:
+            pending_futures = list(self.pending_futures)
+        for future in pending_futures:
+            future.cancel()
+
+    def shutdown(self, cancel_pending=False):
+        self.executor.shutdown(wait=True, cancel_futures=cancel_pending)
@@ -0,0 +1,127 @@
+import os
+
+import numpy as np
+
+from qcge.configs import *
+from qcge.quantum_circuit_model import QuantumCircuitGridModel
+
+
+GRID_MODEL_MAGIC = b'QCGM'
+GRID_STORE_MAGIC = b'QCGS'
+GRID_FORMAT_VERSION = 1
+
+# On-disk node record: the fields of QuantumCircuitGridModel.NODE_DTYPE, packed and little-endian
+STORED_NODE_DTYPE = np.dtype([
+    ('gate_type', '<i1'),
+    ('rotation_angle', '<f8'),
+    ('first_ctrl', '<i2'),
+    ('second_ctrl', '<i2'),
+    ('swap', '<i2'),
+])
+GRID_MODEL_HEADER_DTYPE = np.dtype([
+    ('magic', 'S4'),
+    ('version', '<u2'),
+    ('num_qubits', '<u2'),
+    ('num_columns', '<u2'),
+])
+# Every grid of a store has the same shape, so grid N starts at a fixed offset
+GRID_STORE_HEADER_DTYPE = np.dtype([
+    ('magic', 'S4'),
+    ('version', '<u2'),
+    ('num_qubits', '<u2'),
+    ('num_columns', '<u2'),
+    ('num_grids', '<u8'),
+])
+
+
+def check_header(header, magic):
+    if header['magic'] != magic:
+        raise ValueError(f"Not a quantum circuit grid file, expected magic {magic!r} but found {bytes(header['magic'])!r}")
+    if header['version'] != GRID_FORMAT_VERSION:
+        raise ValueError(f"Unsupported grid format version {int(header['version'])}, expected {GRID_FORMAT_VERSION}")
+
+
+def grid_model_to_bytes(qc_grid_model):
+    """Fixed-width binary form of a grid model: a 10 byte header, then 15 bytes per node in row-major order"""
+    header = np.array(
+        (GRID_MODEL_MAGIC, GRID_FORMAT_VERSION, qc_grid_model.num_qubits, qc_grid_model.num_columns),
+        dtype=GRID_MODEL_HEADER_DTYPE
+    )
+    return header.tobytes() + qc_grid_model.nodes.astype(STORED_NODE_DTYPE).tobytes()
+
+
+def grid_model_from_bytes(data):
+    header = np.frombuffer(data, dtype=GRID_MODEL_HEADER_DTYPE, count=1)[0]
+    check_header(header, GRID_MODEL_MAGIC)
+    num_qubits, num_columns = int(header['num_qubits']), int(header['num_columns'])
+    nodes = np.frombuffer(data, dtype=STORED_NODE_DTYPE, count=num_qubits * num_columns, offset=GRID_MODEL_HEADER_DTYPE.itemsize)
+
+    qc_grid_model = QuantumCircuitGridModel(num_qubits, num_columns)
+    qc_grid_model.set_nodes(nodes)
+    return qc_grid_model
+
+
+def write_grid_store(path, qc_grid_models):
+    """Write grid models that all have the same shape to a store file that QuantumCircuitGridStore can open"""
+    qc_grid_models = list(qc_grid_models)
+    if not qc_grid_models:
+        raise ValueError("A grid store needs at least one grid model")
+    num_qubits, num_columns = qc_grid_models[0].num_qubits, qc_grid_models[0].num_columns
+    if any((qc_grid_model.num_qubits, qc_grid_model.num_columns) != (num_qubits, num_columns) for qc_grid_model in qc_grid_models):
+        raise ValueError("All grid models in a store must have the same number of qubits and columns")
+
+    header = np.array(
+        (GRID_STORE_MAGIC, GRID_FORMAT_VERSION, num_qubits, num_columns, len(qc_grid_models)),
+        dtype=GRID_STORE_HEADER_DTYPE
+    )
+    with open(path, 'wb') as file:
+        file.write(header.tobytes())
+        for qc_grid_model in qc_grid_models:
+            file.write(qc_grid_model.nodes.astype(STORED_NODE_DTYPE).tobytes())
+
+
+class QuantumCircuitGridStore:
+    """Many same-sized grid models in one file, memory-mapped with numpy.memmap.
+
+    Opening a store only reads its header. get_nodes(index) is a zero-copy view of one grid's records,
+    so loading level N touches just the pages of that grid, however many levels the file holds.
+    Open with mode='r+' to overwrite grids in place.
+    """
+    def __init__(self, path, mode='r'):
+        self.path = path
+        header = np.fromfile(path, dtype=GRID_STORE_HEADER_DTYPE, count=1)
+        if len(header) == 0:
+            raise ValueError(f"{path} is too short to be a grid store")
+        header = header[0]
+        check_header(header, GRID_STORE_MAGIC)
+        self.num_qubits = int(header['num_qubits'])
+        self.num_columns = int(header['num_columns'])
+        self.num_grids = int(header['num_grids'])
+
+        expected_size = GRID_STORE_HEADER_DTYPE.itemsize + self.num_grids * self.num_qubits * self.num_columns * STORED_NODE_DTYPE.itemsize
+        if os.path.getsize(path) != expected_size:
+            raise ValueError(f"{path} should be {expected_size} bytes for {self.num_grids} grids, found {os.path.getsize(path)}")
+
+        self.nodes = np.memmap(
+            path, dtype=STORED_NODE_DTYPE, mode=mode, offset=GRID_STORE_HEADER_DTYPE.itemsize,
+            shape=(self.num_grids, self.num_qubits, self.num_columns)
+        )
+
+    def __len__(self):
+        return self.num_grids
+
+    def get_nodes(self, index):
+        return self.nodes[index]
+
+    def __getitem__(self, index):
+        qc_grid_model = QuantumCircuitGridModel(self.num_qubits, self.num_columns)
+        qc_grid_model.set_nodes(self.get_nodes(index))
+        return qc_grid_model
+
+    def __setitem__(self, index, qc_grid_model):
+        if (qc_grid_model.num_qubits, qc_grid_model.num_columns) != (self.num_qubits, self.num_columns):
+            raise ValueError(f"Grid model must have {self.num_qubits} qubits and {self.num_columns} columns to fit in this store")
+        self.nodes[index] = qc_grid_model.nodes.astype(STORED_NODE_DTYPE)
+
+    def flush(self):
+        self.nodes.flush()
@@ -0,0 +1,103 @@
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from qcge.configs import *
+
+
+class QuantumCircuitGridProfiler:
+    """Process-wide timers and counters for the hot paths of the grid, model, compiler and simulators.
+
+    Disabled by default. Methods decorated with @timed are left as they are until enable() swaps timing
+    wrappers onto their classes, and disable() puts the originals back, so a disabled profiler costs
+    nothing on those paths. Counters are guarded by `if profiler.enabled` at their call sites.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.timers = {} # stage -> [calls, total seconds, max seconds]
+        self.counters = {} # counter -> count
+        self.timed_methods = [] # (class, method name, original function, stage) of every @timed method
+
+    def enable(self):
+        if not self.enabled:
+            for owner, name, func, stage in self.timed_methods:
+                setattr(owner, name, self.create_timed_function(func, stage))
+        self.enabled = True
+
+    def disable(self):
+        if self.enabled:
+            for owner, name, func, stage in self.timed_methods:
+                setattr(owner, name, func)
+        self.enabled = False
+
+    def create_timed_function(self, func, stage):
+        @wraps(func)
+        def timed_func(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add_time(stage, time.perf_counter() - start)
+        return timed_func
+
+    def reset(self):
+        self.timers.clear()
+        self.counters.clear()
+
+    def add_time(self, stage, elapsed):
+        timer = self.timers.get(stage)
+        if timer is None:
+            self.timers[stage] = [1, elapsed, elapsed]
+        else:
+            timer[0] += 1
+            timer[1] += elapsed
+            timer[2] = max(timer[2], elapsed)
+
+    def count(self, counter, amount=1):
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    @contextmanager
+    def stage(self, stage):
+        """Time a block of code as stage, e.g. a game's own frame logic"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - start)
+
+    def snapshot(self):
+        """Copy of the current measurements as plain dicts, with times in milliseconds"""
+        return {
+            'timers': {
+                stage: {'calls': calls, 'total_ms': total * 1000, 'mean_ms': total * 1000 / calls, 'max_ms': maximum * 1000}
+                for stage, (calls, total, maximum) in self.timers.items()
+            },
+            'counters': dict(self.counters),
+        }
+
+
+profiler = QuantumCircuitGridProfiler()
+
+
+class TimedMethod:
+    # Placeholder that registers a method with the profiler when its class is created, then steps aside
+    def __init__(self, stage, func):
+        self.stage = stage
+        self.func = func
+
+    def __set_name__(self, owner, name):
+        profiler.timed_methods.append((owner, name, self.func, self.stage))
+        if profiler.enabled:
+            setattr(owner, name, profiler.create_timed_function(self.func, self.stage))
+        else:
+            setattr(owner, name, self.func)
+
+
+def timed(stage):
+    """Method decorator recording every call under stage while the profiler is enabled"""
+    def decorator(func):
+        return TimedMethod(stage, func)
+    return decorator
@@ -0,0 +1,23 @@
+# Key codes understood by QuantumCircuitGridEditor.handle_input
+# They have the same values as pygame's, so pygame key events can be passed through unchanged
+
+KEYDOWN = 768 # Event type of key presses; handle_inputs() skips events of other types
+
+K_BACKSPACE = 8
+K_DELETE = 127
+
+K_a = 97
+K_c = 99
+K_d = 100
+K_e = 101
+K_f = 102
+K_h = 104
+K_o = 111
+K_q = 113
+K_r = 114
+K_s = 115
+K_u = 117
+K_w = 119
+K_x = 120
+K_y = 121
+K_z = 122
@@ -1,21 +1,30 @@
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
 import pygame
-from qiskit import QuantumRegister, QuantumCircuit
 import numpy as np
 
 from pygame.image import load as loadImage
 from qcge.configs import *
+from qcge.quantum_circuit_model import QuantumCircuitGridNode, QuantumCircuitGridModel
+from qcge.quantum_circuit_editor import QuantumCircuitGridEditor
+from qcge.instrumentation import profiler, timed
 
 
-class QuantumCircuitGridBackground(pygame.sprite.Sprite):
-    def __init__(self, qc_grid_model, background_color, wire_color, tile_size, wire_line_width):
+class QuantumCircuitGridBackground(pygame.sprite.DirtySprite):
+    def __init__(self, qc_grid_model, background_color, wire_color, tile_size, wire_line_width, num_wires=None, num_columns=None):
         super().__init__()
         self.qc_grid_model = qc_grid_model
         self.tile_size = tile_size 
         self.wire_color = wire_color
         self.wire_line_width = wire_line_width
         self.background_color = background_color
-        self.width = self.tile_size * (self.qc_grid_model.num_columns + 2)
-        self.height = self.tile_size * (self.qc_grid_model.num_qubits + 1)
+        # Only the visible strip of wires and columns is drawn, so the surface is sized by the viewport
+        self.num_wires = self.qc_grid_model.num_qubits if num_wires is None else num_wires
+        self.num_columns = self.qc_grid_model.num_columns if num_columns is None else num_columns
+        self.width = self.tile_size * (self.num_columns + 2)
+        self.height = self.tile_size * (self.num_wires + 1)
 
         # BACKGROUND SURFACE
         self.image = pygame.Surface((self.width, self.height))
@@ -26,7 +35,7 @@ class QuantumCircuitGridBackground(pygame.sprite.Sprite):
         self.run()
 
     def draw_qubit_wires(self):
-        for wire in range(self.qc_grid_model.num_qubits):
+        for wire in range(self.num_wires):
             x_start = self.tile_size * 0.5
             x_end = self.width - (self.tile_size * 0.5)
             y = (wire + 1) * self.tile_size 
@@ -43,28 +52,100 @@ class QuantumCircuitGridBackground(pygame.sprite.Sprite):
         pygame.draw.rect(self.image, self.wire_color, self.rect, self.wire_line_width)
         self.draw_qubit_wires()
 
-class QuantumCircuitGridMarker(pygame.sprite.Sprite):
-    def __init__(self):
+class QuantumCircuitGridMarker(pygame.sprite.DirtySprite):
+    _shared_images = {} # Every grid's marker draws the same cursor image, decoded once
+
+    def __init__(self, image_path=f"{ASSETS_PATH}/circuit-grid-cursor.png"):
         super().__init__()
-        self.image = loadImage(f"{ASSETS_PATH}/circuit-grid-cursor.png").convert_alpha()
+        if image_path not in self._shared_images:
+            self._shared_images[image_path] = loadImage(image_path).convert_alpha()
+            if profiler.enabled:
+                profiler.count('image_loads')
+        self.image = self._shared_images[image_path]
         self.rect = self.image.get_rect()
 
-class QuantumCircuitGridNode:
-    def __init__(self, gate_type, rotation_angle = 0.0, first_ctrl = -1, second_ctrl = -1, swap = -1):
-        self.gate_type = gate_type # What Gate is at this node
-        self.rotation_angle = rotation_angle # If radian != 0 then this node have a U(theta) gate; Ex:- RX, RY, RZ
-        self.first_ctrl = first_ctrl # If first_ctrl > 0; then this node is a controlled gate with one control node # It's value will be the wire number on which the first control is placed
-        self.second_ctrl = second_ctrl # If second_ctrl > 0; then this node is a controlled gate with two control nodes # It's value will be the wire number on which the second control is placed
-        self.swap = swap # If swap != -1 then this node have a swap gate
-
-    def __str__(self):
-        string = "Type: " + str(self.gate_type)
-        string += ", rotation_angle: " + str(self.rotation_angle) if self.rotation_angle != 0 else ""
-        string += ", ctrl_a: " + str(self.first_ctrl) if self.first_ctrl != -1 else ""
-        string += ", ctrl_b: " + str(self.second_ctrl) if self.second_ctrl != -1 else ""
-        return string
-
-class QuantumCircuitGridGate(pygame.sprite.Sprite):
+class QuantumCircuitGateAtlas:
+    """Every gate image decoded once, colorkeyed, converted and packed side by side into one surface.
+
+    Gate tiles blit from sub-surfaces of the atlas, so building or reloading a tile never touches the disk.
+    Rotation gates are rendered once per arc angle and color and then shared, up to ROTATION_GATE_CACHE_MAX_ENTRIES.
+    """
+    GATE_IMAGES = [
+        "iden_gate.png", "x_gate.png", "y_gate.png", "z_gate.png", "rx_gate.png", "ry_gate.png", "rz_gate.png",
+        "s_gate.png", "sdg_gate.png", "t_gate.png", "tdg_gate.png", "h_gate.png", "swap_gate.png",
+        "not_gate.png", "not_gate_above_ctrl.png", "not_gate_below_ctrl.png",
+        "ctrl_gate.png", "ctrl_gate_bottom_wire.png", "ctrl_gate_top_wire.png", "ctrl_line_gate.png",
+    ]
+    ATLAS_COLORKEY = (255, 0, 255)
+
+    _shared_atlases = {}
+
+    def __init__(self, gate_image_folder=ASSETS_PATH):
+        self.gate_image_folder = gate_image_folder
+        self.gate_rects = {}
+        self.gate_images = {}
+        self.empty_gates = {}
+        self.rotation_gates = OrderedDict() # (gate name, angle step, arc color) -> gate image with its arc, least recently used first
+
+        gate_images = [(gate_name, loadImage(f"{self.gate_image_folder}/{gate_name}")) for gate_name in self.GATE_IMAGES]
+        if profiler.enabled:
+            profiler.count('image_loads', len(gate_images))
+        width = sum(gate_image.get_width() for _, gate_image in gate_images)
+        height = max(gate_image.get_height() for _, gate_image in gate_images)
+
+        self.image = pygame.Surface((width, height))
+        self.image.fill(self.ATLAS_COLORKEY)
+        x = 0
+        for gate_name, gate_image in gate_images:
+            # Each image keys out the color of its top left pixel, which becomes the atlas colorkey once packed
+            gate_image.set_colorkey(gate_image.get_at((0, 0)))
+            self.gate_rects[gate_name] = self.image.blit(gate_image, (x, 0))
+            x += gate_image.get_width()
+        self.image.set_colorkey(self.ATLAS_COLORKEY)
+        if pygame.display.get_surface() is not None:
+            self.image = self.image.convert()
+
+    @classmethod
+    def shared(cls, gate_image_folder=ASSETS_PATH):
+        """Return the process-wide atlas for gate_image_folder, building it on first use"""
+        if gate_image_folder not in cls._shared_atlases:
+            cls._shared_atlases[gate_image_folder] = cls(gate_image_folder)
+        return cls._shared_atlases[gate_image_folder]
+
+    def get_gate(self, gate_name):
+        # Sub-surfaces share the atlas pixels; callers that draw on a gate must copy() it first
+        if gate_name not in self.gate_images:
+            self.gate_images[gate_name] = self.image.subsurface(self.gate_rects[gate_name])
+        return self.gate_images[gate_name]
+
+    def get_rotation_gate(self, gate_name, rotation_angle, arc_color):
+        # The arc is quantized to ROTATION_GATE_ANGLE_STEPS per turn, so a rotated gate is drawn at most once per step
+        # Rounding also absorbs the drift of repeated pi / 8 rotations, so 2 pi - epsilon is drawn like 2 pi
+        angle_step = round((rotation_angle % (2 * np.pi)) / (2 * np.pi) * ROTATION_GATE_ANGLE_STEPS) % ROTATION_GATE_ANGLE_STEPS
+        key = (gate_name, angle_step, arc_color)
+        rotation_gate = self.rotation_gates.get(key)
+        if rotation_gate is None:
+            rotation_gate = self.get_gate(gate_name).copy()
+            # Draw the value of theta as an arc of a circle
+            pygame.draw.arc(rotation_gate, arc_color, rotation_gate.get_rect(), 0, angle_step * 2 * np.pi / ROTATION_GATE_ANGLE_STEPS, 4)
+            self.rotation_gates[key] = rotation_gate
+            if len(self.rotation_gates) > ROTATION_GATE_CACHE_MAX_ENTRIES:
+                self.rotation_gates.popitem(last=False)
+            if profiler.enabled:
+                profiler.count('rotation_gate_renders')
+        else:
+            self.rotation_gates.move_to_end(key)
+        return rotation_gate
+
+    def get_empty_gate(self, gate_dimensions):
+        gate_dimensions = tuple(gate_dimensions)
+        if gate_dimensions not in self.empty_gates:
+            empty_gate = pygame.Surface(gate_dimensions)
+            empty_gate.set_alpha(0)
+            self.empty_gates[gate_dimensions] = empty_gate
+        return self.empty_gates[gate_dimensions]
+
+class QuantumCircuitGridGate(pygame.sprite.DirtySprite):
     def __init__(self, qc_grid_model, wire, column, gate_dimensions, gate_phase_angle_color):
         super().__init__()
         self.qc_grid_model = qc_grid_model
@@ -78,224 +159,164 @@ class QuantumCircuitGridGate(pygame.sprite.Sprite):
 
         self.run()
     
-    def import_gate(self, gate_name, colorkey = None):
-        gate_image_folder = ASSETS_PATH
-        gate_image = loadImage(f"{gate_image_folder}/{gate_name}")
-        if colorkey is not None:
-            if colorkey == -1:
-                colorkey = gate_image.get_at((0,0))
-            gate_image.set_colorkey(colorkey)
+    def import_gate(self, gate_name):
+        if profiler.enabled:
+            profiler.count('gate_imports')
+        gate_image = QuantumCircuitGateAtlas.shared().get_gate(gate_name)
         return gate_image, gate_image.get_rect()
     
+    def import_rotation_gate(self, gate_name, rotation_angle):
+        if profiler.enabled:
+            profiler.count('gate_imports')
+        gate_image = QuantumCircuitGateAtlas.shared().get_rotation_gate(gate_name, rotation_angle, self.gate_phase_angle_color)
+        return gate_image, gate_image.get_rect()
+    
+    @timed('gate.load_gate')
     def load_gate(self):
+        previous_rect = getattr(self, 'rect', None)
         gate = self.qc_grid_model.get_gate_at_node(self.wire, self.column)
         
+        # RX, RY and RZ tiles come from the atlas, which renders the value of theta as an arc of a circle, once per angle
         if gate == GATES['IDENTITY']:
-            self.image, self.rect = self.import_gate("iden_gate.png", -1)    
+            self.image, self.rect = self.import_gate("iden_gate.png")    
         
         elif gate == GATES['X']:
             node = self.qc_grid_model.get_node(self.wire, self.column)
             # Check if this is a CNOT Gate
             if node.first_ctrl >= 0 or node.second_ctrl >= 0:
-                if self.wire > max(node.ctrl_a, node.ctrl_b): # If target wire is below control wire
-                    self.image, self.rect = self.import_gate("not_gate_below_ctrl.png", -1)
+                if self.wire > max(node.first_ctrl, node.second_ctrl): # If target wire is below control wire
+                    self.image, self.rect = self.import_gate("not_gate_below_ctrl.png")
                 else: # If target wire is above control wire
-                    self.image, self.rect = self.import_gate("not_gate_above_ctrl.png", -1)
+                    self.image, self.rect = self.import_gate("not_gate_above_ctrl.png")
             elif node.rotation_angle != 0: # Else If this is a RX Gate
-                self.image, self.rect = self.import_gate("rx_gate.png", -1)
-                # Draw the value of theta as an arc of a circle 
-                pygame.draw.arc(self.image, self.gate_phase_angle_color, self.rect, 0, node.rotation_angle % (2 * np.pi), 4)
+                self.image, self.rect = self.import_rotation_gate("rx_gate.png", node.rotation_angle)
             else: # Else if this is a normal X Gate
-                self.image, self.rect = self.import_gate("x_gate.png", -1)
+                self.image, self.rect = self.import_gate("x_gate.png")
         
         elif gate == GATES['Y']:
             node = self.qc_grid_model.get_node(self.wire, self.column)
             # Check if this is a RY Gate
             if node.rotation_angle != 0:
-                self.image, self.rect = self.import_gate("ry_gate.png", -1)
-                # Draw the value of theta as an arc of a circle 
-                pygame.draw.arc(self.image, self.gate_phase_angle_color, self.rect, 0, node.rotation_angle % (2 * np.pi), 4)
+                self.image, self.rect = self.import_rotation_gate("ry_gate.png", node.rotation_angle)
             else: # Else if this is a normal Y Gate
-                self.image, self.rect = self.import_gate("y_gate.png", -1)
+                self.image, self.rect = self.import_gate("y_gate.png")
         
         elif gate == GATES['Z']:
             node = self.qc_grid_model.get_node(self.wire, self.column)
             # Check if this is a RY Gate
             if node.rotation_angle != 0:
-                self.image, self.rect = self.import_gate("rz_gate.png", -1)
-                # Draw the value of theta as an arc of a circle 
-                pygame.draw.arc(self.image, self.gate_phase_angle_color, self.rect, 0, node.rotation_angle % (2 * np.pi), 4)
+                self.image, self.rect = self.import_rotation_gate("rz_gate.png", node.rotation_angle)
             else: # Else if this is a normal Y Gate
-                self.image, self.rect = self.import_gate("z_gate.png", -1)
+                self.image, self.rect = self.import_gate("z_gate.png")
         
         elif gate == GATES['S']:
-            self.image, self.rect = self.import_gate("s_gate.png", -1)
+            self.image, self.rect = self.import_gate("s_gate.png")
         
         elif gate == GATES['SDG']:
-            self.image, self.rect = self.import_gate("sdg_gate.png", -1)
+            self.image, self.rect = self.import_gate("sdg_gate.png")
         
         elif gate == GATES['T']:
-            self.image, self.rect = self.import_gate("t_gate.png", -1)
+            self.image, self.rect = self.import_gate("t_gate.png")
         
         elif gate == GATES['TDG']:
-            self.image, self.rect = self.import_gate("tdg_gate.png", -1)
+            self.image, self.rect = self.import_gate("tdg_gate.png")
         
         elif gate == GATES['H']:
-            self.image, self.rect = self.import_gate("h_gate.png", -1)
+            self.image, self.rect = self.import_gate("h_gate.png")
         
         elif gate == GATES['SWAP']:
-            self.image, self.rect = self.import_gate("swap_gate.png", -1)
+            self.image, self.rect = self.import_gate("swap_gate.png")
         
         elif gate == GATES['CTRL']:
             # Check if the target wire is above the control wire
             if self.wire > self.qc_grid_model.get_wire_for_control_node_at(self.wire, self.column):
-                self.image, self.rect = self.import_gate("ctrl_gate_bottom_wire.png", -1)
+                self.image, self.rect = self.import_gate("ctrl_gate_bottom_wire.png")
             else: # if the target wire is above the control wire
-                self.image, self.rect = self.import_gate("ctrl_gate_top_wire.png", -1)
+                self.image, self.rect = self.import_gate("ctrl_gate_top_wire.png")
         
         elif gate == GATES['CTRL_LINE']:
-            self.image, self.rect = self.import_gate("ctrl_line_gate.png", -1)
+            self.image, self.rect = self.import_gate("ctrl_line_gate.png")
         
         else: # If the node is empty
             # Draw a transparent block, i.e., empty gate/node
-            self.image = pygame.Surface([self.gate_dimensions[0], self.gate_dimensions[1]])
-            self.image.set_alpha(0)
+            self.image = QuantumCircuitGateAtlas.shared().get_empty_gate(self.gate_dimensions)
             self.rect = self.image.get_rect()
         
-        self.image.convert()
+        # Keep a reloaded tile where the grid laid it out
+        if previous_rect is not None:
+            self.rect.center = previous_rect.center
+        self.dirty = 1
 
     def run(self):
         self.load_gate()
 
-class QuantumCircuitGridModel():
-    def __init__(self, num_qubits, num_columns):
-        self.num_qubits = num_qubits
-        self.num_columns = num_columns
-        self.nodes = np.zeros(
-            (self.num_qubits, self.num_columns),
-            dtype=QuantumCircuitGridNode
-        )
-    
-    def __str__(self):
-        string = "CircuitGridModel:\n"
-        for wire in range(self.num_qubits):
-            row_values = [str(self.get_gate_at_node(wire, column)) for column in range(self.num_columns)]
-            string += ", ".join(row_values) + "\n"
-        return string
-
-    def set_node(self, wire, column, qc_grid_node):
-        self.nodes[wire][column] = QuantumCircuitGridNode(
-            qc_grid_node.gate_type,
-            qc_grid_node.rotation_angle,
-            qc_grid_node.first_ctrl,
-            qc_grid_node.second_ctrl,
-            qc_grid_node.swap
-        )
-    
-    def get_node(self, wire, column):
-        return self.nodes[wire][column]
+class QuantumCircuitGridProfilerOverlay(pygame.sprite.DirtySprite):
+    """Panel listing the profiler's timers and counters, re-rendered at most every PROFILER_OVERLAY_REFRESH_INTERVAL"""
+    def __init__(self, background_color=PROFILER_OVERLAY_BG_COLOR, text_color=PROFILER_OVERLAY_TEXT_COLOR, font_size=PROFILER_OVERLAY_FONT_SIZE):
+        super().__init__()
+        if not pygame.font.get_init():
+            pygame.font.init()
+        self.font = pygame.font.Font(None, font_size)
+        self.background_color = background_color
+        self.text_color = text_color
+        self.last_refresh_time = None
+        self.image = pygame.Surface((0, 0))
+        self.rect = self.image.get_rect()
 
-    def get_gate_at_node(self, wire, column):
-        node = self.nodes[wire][column]
-        
-        if node and node.gate_type != GATES['EMPTY']: # If the node is already occupied
-            return node.gate_type # Return the gate occupying the node
-        
-        column_nodes = self.nodes[:, column]
-        for index, other_node in enumerate(column_nodes):
-            if index != wire and other_node:
-                # Check if the other_node is a control node
-                if other_node.first_ctrl == wire or other_node.second_ctrl == wire:
-                    return GATES['CTRL']
-                # Or if it is a swap node
-                elif other_node.swap == wire:
-                    return GATES['SWAP']
-        
-        # If no gate is present at the node return 'EMPTY'
-        return GATES['EMPTY']
-
-    def get_wire_for_control_node_at(self, control_wire, column):
-        control_wire = -1
-        column_nodes = self.nodes[:, column]
-
-        for index in range(self.num_qubits):
-            if index != control_wire:
-                other_node = column_nodes[index]
-                if other_node:
-                    if (other_node.first_ctrl == control_wire or other_node.second_ctrl == control_wire):
-                        control_wire = index
-                        print("Found ", self.get_gate_at_node(control_wire, column), " on wire ", control_wire)
-        
-        return control_wire
-
-    def create_quantum_circuit(self):
-        """Create Quantum Circuit from Quantum Circuit Grid"""
-        qr = QuantumRegister(self.num_qubits, "q")
-        qc = QuantumCircuit(qr)
-
-        for column in range(self.num_columns):
-            for wire in range(self.num_qubits):
-                node = self.nodes[wire][column]
-                
-                if node:
-                    if node.gate_type == GATES['IDENTITY']:
-                        qc.i(qr[wire])
-
-                    elif node.gate_type == GATES['X']:
-                        if node.rotation_angle == 0: # Node have a Pauli X Gate or Controlled X Gate or Toffoli Gate
-                            if node.first_ctrl != -1: # If first control is active
-                                if node.second_ctrl != -1: # If second control is also active then node have a Toffoli Gate
-                                    qc.ccx(qr[node.frist_ctrl], qr[node.second_ctrl], qr[wire])
-                                else: # Node have a Controlled X Gate
-                                    qc.cx(qr[node.frist_ctrl], qr[wire])
-                            else: # If no control is active then the node have a Pauli X Gate
-                                qc.x(qr[wire])
-                        else: # If angle is not zero then it is a RX Gate
-                            qc.rx(node.rotation_angle, qr[wire])
-                    
-                    elif node.gate_type == GATES['Y']:
-                        if node.rotation_angle == 0: # Node have a Pauli Y Gate or Controlled Y Gate
-                            if node.first_ctrl != -1: # If first control is active then Node have a CY Gate
-                                qc.cy(qr[self.first_ctrl], qr[wire])
-                            else: # If no control is active then the node have a Pauli Y Gate
-                                qc.y(qr[wire])
-                    
-                    elif node.gate_type == GATES['Z']:
-                        if node.rotation_angle == 0: # Node have a Pauli Z Gate or Controlled Z Gate
-                            if node.first_ctrl != -1: # If first control is active then Node have a CZ Gate
-                                qc.cz(qr[self.first_ctrl], qr[wire])
-                            else: # If no control is active then the node have a Pauli Z Gate
-                                qc.z(qr[wire])
-                    
-                    elif node.gate_type == GATES['S']:
-                        qc.s(qr[wire])
-                    
-                    elif node.gate_type == GATES['SDG']:
-                        qc.sdg(qr[wire])
-                    
-                    elif node.gate_type == GATES['T']:
-                        qc.t(qr[wire])
-                    
-                    elif node.gate_type == GATES['TDG']:
-                        qc.tdg(qr[wire])
-                    
-                    elif node.gate_type == GATES['H']:
-                        if node.first_ctrl != -1: # If first control is active then Node have a CH Gate
-                            qc.ch(qr[self.first_ctrl], qr[wire])
-                        else: # If no control is active then the node have a H Gate
-                            qc.h(qr[wire])
-                    
-                    elif node.gate_type == GATES['SWAP']:
-                        if node.first_ctrl != -1: # If first control is active then Node have a Controlled Swap Gate
-                            qc.cswap(qr[self.first_ctrl], qr[wire])
-                        else: # If no control is active then the node have a Swap Gate
-                            qc.swap(qr[wire])
+    def get_lines(self):
+        if not profiler.enabled:
+            return ["Profiler disabled, call qcge.instrumentation.profiler.enable()"]
+        snapshot = profiler.snapshot()
+        lines = [
+            f"{stage}: {timer['mean_ms']:.3f} ms avg, {timer['max_ms']:.3f} ms max, {timer['calls']} calls"
+            for stage, timer in sorted(snapshot['timers'].items())
+        ]
+        lines += [f"{counter}: {count}" for counter, count in sorted(snapshot['counters'].items())]
+        return lines
+
+    def refresh(self, topleft):
+        now = time.perf_counter()
+        if self.last_refresh_time is not None and now - self.last_refresh_time < PROFILER_OVERLAY_REFRESH_INTERVAL:
+            return
+        self.last_refresh_time = now
+
+        text_images = [self.font.render(line, True, self.text_color) for line in self.get_lines()]
+        # Never shrink, so the previous text is always painted over in dirty rects mode
+        width = max([self.rect.width] + [text_image.get_width() + 8 for text_image in text_images])
+        height = max(self.rect.height, sum(text_image.get_height() for text_image in text_images) + 8)
+        self.image = pygame.Surface((width, height))
+        self.image.fill(self.background_color)
+        y = 4
+        for text_image in text_images:
+            self.image.blit(text_image, (4, y))
+            y += text_image.get_height()
+        self.rect = self.image.get_rect(topleft=topleft)
+        self.dirty = 1
+
+class QuantumCircuitGrid(QuantumCircuitGridEditor, pygame.sprite.LayeredDirty):
+    def __init__(self, position, num_qubits, num_columns, background_color=QUANTUM_CIRCUIT_BG_COLOR, wire_color=QUANTUM_CIRCUIT_WIRE_COLOR, gate_phase_angle_color=QUANTUM_GATE_PHASE_COLOR, tile_size=QUANTUM_CIRCUIT_TILE_SIZE, gate_dimensions=[GATE_TILE_WIDTH, GATE_TILE_HIEGHT], wire_line_width=WIRE_LINE_WIDTH, dirty_rects=False, profiler_overlay=False, viewport_size=None):
+        pygame.sprite.LayeredDirty.__init__(self)
+        QuantumCircuitGridEditor.__init__(self, QuantumCircuitGridModel(num_qubits, num_columns))
         
-        return qc
-
-class QuantumCircuitGrid(pygame.sprite.RenderPlain):
-    def __init__(self, position, num_qubits, num_columns, background_color=QUANTUM_CIRCUIT_BG_COLOR, wire_color=QUANTUM_CIRCUIT_WIRE_COLOR, gate_phase_angle_color=QUANTUM_GATE_PHASE_COLOR, tile_size=QUANTUM_CIRCUIT_TILE_SIZE, gate_dimensions=[GATE_TILE_WIDTH, GATE_TILE_HIEGHT], wire_line_width=WIRE_LINE_WIDTH):
-        super().__init__()
+        ## Render Mode
+        # With dirty_rects=True only the tiles of edited columns and the marker are redrawn,
+        # and draw() returns the changed rects for pygame.display.update(rects).
+        # The caller must then stop clearing the screen every frame.
+        self.dirty_rects = dirty_rects
+        if self.dirty_rects:
+            self._use_update = True
+            self.set_timing_threshold(float('inf')) # Never fall back to full screen redraws
+        self.tiles_position = None # Position the gate tiles were last laid out at
+
+        ## Viewport
+        # viewport_size=(num_wires, num_columns) only shows that window of the grid, scrolled to follow the marker.
+        # A fixed pool of tiles covers the window, so sprites and surfaces depend on its size, not the grid's.
+        if viewport_size is None:
+            viewport_size = (num_qubits, num_columns)
+        self.num_visible_wires = min(viewport_size[0], num_qubits)
+        self.num_visible_columns = min(viewport_size[1], num_columns)
+        self.first_visible_wire = 0
+        self.first_visible_column = 0
 
         ## Props
         self.background_color = background_color
@@ -307,29 +328,67 @@ class QuantumCircuitGrid(pygame.sprite.RenderPlain):
         
         ## State
         self.position = position
-        self.current_wire = 0
-        self.current_column = 0
         
-        self.qc_grid_model = QuantumCircuitGridModel(num_qubits, num_columns)
-        self.qc_grid_background = QuantumCircuitGridBackground(self.qc_grid_model, background_color=self.background_color, wire_color=self.wire_color, tile_size=self.tile_size, wire_line_width=self.wire_line_width)
+        self.qc_grid_background = QuantumCircuitGridBackground(self.qc_grid_model, background_color=self.background_color, wire_color=self.wire_color, tile_size=self.tile_size, wire_line_width=self.wire_line_width, num_wires=self.num_visible_wires, num_columns=self.num_visible_columns)
         self.qc_grid_marker = QuantumCircuitGridMarker()
-
+        # Drawn below the grid; shows the measurements of qcge.instrumentation.profiler
+        self.qc_grid_profiler_overlay = QuantumCircuitGridProfilerOverlay() if profiler_overlay else None
+        self.changed_columns = set() # Columns whose tiles must be reloaded
+        self.reload_depth = 0
+        self.qc_grid_model.add_node_listener(self.handle_node_changed)
+        self.qc_grid_model.add_batch_listener(self.defer_column_reloads) # Reloads the columns changed by set_nodes once
+
+        # Tile pool of the viewport; gate_tiles[visible_wire, visible_column] shows the node offset by the first visible one
         self.gate_tiles = np.zeros(
-            (self.qc_grid_model.num_qubits, self.qc_grid_model.num_columns),
+            (self.num_visible_wires, self.num_visible_columns),
             dtype=QuantumCircuitGridGate
         )
     
     ## SUPPORT FUNCTIONS
     def highlight_current_node(self, wire, column):
-        self.current_wire = wire
-        self.current_column = column
+        super().highlight_current_node(wire, column)
+        self.scroll_to_node(self.current_wire, self.current_column)
+        previous_marker_position = self.qc_grid_marker.rect.topleft
         self.qc_grid_marker.rect.topleft = (
-            self.position[0] + self.tile_size * (self.current_column + 1.2),
-            self.position[1] + self.tile_size * (self.current_wire + 0.7)
+            self.position[0] + self.tile_size * (self.current_column - self.first_visible_column + 1.2),
+            self.position[1] + self.tile_size * (self.current_wire - self.first_visible_wire + 0.7)
         )
+        if self.qc_grid_marker.rect.topleft != previous_marker_position:
+            self.qc_grid_marker.dirty = 1 # Repaints both the old and the new marker position
+    
+    def scroll_to_node(self, wire, column):
+        """Scroll the viewport as little as possible to show the node at wire and column"""
+        first_wire = max(min(self.first_visible_wire, wire), wire - self.num_visible_wires + 1)
+        first_column = max(min(self.first_visible_column, column), column - self.num_visible_columns + 1)
+        self.scroll_viewport(first_wire, first_column)
     
-    def get_gate_at_current_node(self):
-        return self.qc_grid_model.get_gate_at_node(self.current_wire, self.current_column)
+    def scroll_viewport(self, first_wire, first_column):
+        """Show the window of the grid starting at first_wire and first_column"""
+        first_wire = min(max(first_wire, 0), self.qc_grid_model.num_qubits - self.num_visible_wires)
+        first_column = min(max(first_column, 0), self.qc_grid_model.num_columns - self.num_visible_columns)
+        if (first_wire, first_column) == (self.first_visible_wire, self.first_visible_column):
+            return
+        wire_shift = first_wire - self.first_visible_wire
+        column_shift = first_column - self.first_visible_column
+        self.first_visible_wire = first_wire
+        self.first_visible_column = first_column
+
+        # Rotate the pool so tiles still in view keep their node and only move;
+        # the tiles that scrolled out are recycled for the strips that scrolled in
+        self.gate_tiles = np.roll(self.gate_tiles, (-wire_shift, -column_shift), axis=(0, 1))
+        for visible_wire in range(self.num_visible_wires):
+            for visible_column in range(self.num_visible_columns):
+                gate_tile = self.gate_tiles[visible_wire][visible_column]
+                if not isinstance(gate_tile, QuantumCircuitGridGate): # Tiles only exist once run() has built them
+                    continue
+                wire = first_wire + visible_wire
+                column = first_column + visible_column
+                if (gate_tile.wire, gate_tile.column) != (wire, column):
+                    gate_tile.wire = wire
+                    gate_tile.column = column
+                    gate_tile.load_gate()
+        if isinstance(self.gate_tiles[0][0], QuantumCircuitGridGate):
+            self.updage_gate_tiles()
     
     ## HANDLE UPDATES    
     def update_sprites(self):
@@ -337,258 +396,94 @@ class QuantumCircuitGrid(pygame.sprite.RenderPlain):
             sprite.update()
     
     def update_qc_grid_background(self):
-        self.qc_grid_background.rect.topleft = self.position
+        if self.qc_grid_background.rect.topleft != tuple(self.position):
+            self.qc_grid_background.rect.topleft = self.position
+            self.qc_grid_background.dirty = 1
     
+    @timed('grid.updage_gate_tiles')
     def updage_gate_tiles(self):
-        for wire in range(self.qc_grid_model.num_qubits):
-            for column in range(self.qc_grid_model.num_columns):
-                gate_tile = self.gate_tiles[wire][column]
+        if profiler.enabled:
+            profiler.count('sprites_updated', self.gate_tiles.size)
+        for visible_wire in range(self.num_visible_wires):
+            for visible_column in range(self.num_visible_columns):
+                gate_tile = self.gate_tiles[visible_wire][visible_column]
                 gate_tile.rect.center = (
-                    self.position[0] + self.tile_size * (column + 1.5),
-                    self.position[1] + self.tile_size * (wire + 1)
+                    self.position[0] + self.tile_size * (visible_column + 1.5),
+                    self.position[1] + self.tile_size * (visible_wire + 1)
                 )
+                gate_tile.dirty = 1
+        self.tiles_position = tuple(self.position)
     
+    def handle_node_changed(self, wire, column, old_record, new_record):
+        self.changed_columns.add(column)
+        if self.batch_depth > 0: # Inside batch_edit() the tiles are reloaded once, by the update at its end
+            self.update_pending = True
+        elif self.reload_depth == 0:
+            self.reload_changed_columns()
+
+    @contextmanager
+    def defer_column_reloads(self):
+        """Reload the columns changed inside the with block once, at its end, without a full update"""
+        self.reload_depth += 1
+        try:
+            yield self
+        finally:
+            self.reload_depth -= 1
+            if self.reload_depth == 0 and self.batch_depth == 0:
+                self.reload_changed_columns()
+    
+    def reload_changed_columns(self):
+        # Control and control line tiles are drawn from their gate's node, so the whole column is reloaded
+        if profiler.enabled:
+            profiler.count('sprites_updated', len(self.changed_columns) * self.num_visible_wires)
+        for column in self.changed_columns:
+            visible_column = column - self.first_visible_column
+            if not 0 <= visible_column < self.num_visible_columns: # Scrolled out tiles are reloaded when they scroll in
+                continue
+            for gate_tile in self.gate_tiles[:, visible_column]:
+                if isinstance(gate_tile, QuantumCircuitGridGate): # Tiles only exist once run() has built them
+                    gate_tile.load_gate()
+        self.changed_columns.clear()
+    
+    @timed('grid.update')
     def update(self):
-        self.update_sprites()
+        self.reload_changed_columns()
+        # None of the grid's sprites override update(), and the tiles only move with the grid, so both render modes
+        # skip update_sprites() and lay the tiles out again only after the position changed
         self.update_qc_grid_background()
-        self.updage_gate_tiles()
+        if self.tiles_position != tuple(self.position):
+            self.updage_gate_tiles()
         self.highlight_current_node(self.current_wire, self.current_column)
+        super().update() # Polls the background evaluator
     
-    ## HANDLE INPUTS
-    def move_to_adjacent_node(self, direction):
-        if(direction == QUANTUM_CIRCUIT_MARKER_MOVE_LEFT and self.current_column > 0):
-            self.current_column -= 1
-        elif (direction == QUANTUM_CIRCUIT_MARKER_MOVE_RIGHT and self.current_column < self.qc_grid_model.num_columns - 1):
-            self.current_column += 1
-        elif (direction == QUANTUM_CIRCUIT_MARKER_MOVE_UP and self.current_wire > 0):
-            self.current_wire -= 1
-        elif (direction == QUANTUM_CIRCUIT_MARKER_MOVE_DOWN and self.current_wire < self.qc_grid_model.num_qubits - 1):
-            self.current_wire += 1
-
-        self.highlight_current_node(self.current_wire, self.current_column)
-
-    def handle_input_x(self):
-        gate_at_current_node = self.get_gate_at_current_node()
-        if gate_at_current_node == GATES['EMPTY']:
-            qc_grid_node = QuantumCircuitGridNode(GATES['X'])
-            self.qc_grid_model.set_node(self.current_wire, self.current_column, qc_grid_node)
-        self.update()
+    def refresh_profiler_overlay(self):
+        # Done every frame from draw(), as update() only runs after edits
+        if self.qc_grid_profiler_overlay is not None:
+            self.qc_grid_profiler_overlay.refresh((self.position[0], self.position[1] + self.qc_grid_background.height))
+
+    @timed('grid.draw')
+    def draw(self, surface, bgsurf=None, special_flags=None):
+        self.refresh_profiler_overlay()
+        if not self.dirty_rects:
+            self._use_update = False # Redraw every sprite each frame
+        return super().draw(surface, bgsurf, special_flags)
     
-    def handle_input_y(self):
-        gate_at_current_node = self.get_gate_at_current_node()
-        if gate_at_current_node == GATES['EMPTY']:
-            qc_grid_node = QuantumCircuitGridNode(GATES['Y'])
-            self.qc_grid_model.set_node(self.current_wire, self.current_column, qc_grid_node)
-        self.update()
-    
-    def handle_input_z(self):
-        gate_at_current_node = self.get_gate_at_current_node()
-        if gate_at_current_node == GATES['EMPTY']:
-            qc_grid_node = QuantumCircuitGridNode(GATES['Z'])
-            self.qc_grid_model.set_node(self.current_wire, self.current_column, qc_grid_node)
-        self.update()
-    
-    def handle_input_h(self):
-        gate_at_current_node = self.get_gate_at_current_node()
-        if gate_at_current_node == GATES['EMPTY']:
-            qc_grid_node = QuantumCircuitGridNode(GATES['H'])
-            self.qc_grid_model.set_node(self.current_wire, self.current_column, qc_grid_node)
-        self.update()
-    
-    def handle_input_delete(self, wire, column):
-        gate_at_current_node = self.qc_grid_model.get_gate_at_node(wire, column)
-        if(
-            gate_at_current_node == GATES['X']
-            or gate_at_current_node == GATES['Y']
-            or gate_at_current_node == GATES['Z']
-            or gate_at_current_node == GATES['H']
-        ):
-            self.delete_controls_for_gate(wire, column)
-
-        if gate_at_current_node == GATES['CTRL']:
-            gate_wire = self.qc_grid_model.get_wire_for_control_node_at(wire, column)
-            if gate_wire >= 0:
-                self.delete_controls_for_gate(gate_wire, column)
-        elif (
-            gate_at_current_node != GATES['CTRL']
-            and gate_at_current_node != GATES['SWAP']
-            and gate_at_current_node != GATES['CTRL_LINE']
-        ):
-            qc_grid_node = QuantumCircuitGridNode(GATES['EMPTY'])
-            self.qc_grid_model.set_node(wire, column, qc_grid_node)
-        
-        self.update()
-
-    def handle_input_clear_all(self):
-        for wire in range(self.qc_grid_model.num_qubits):
-            for column in range(self.qc_grid_model.num_columns):
-                self.handle_input_delete(wire, column)
-
-    def handle_input_ctrl(self):
-        gate_at_current_node = self.get_gate_at_current_node()
-        if(
-            gate_at_current_node == GATES['X']
-            or gate_at_current_node == GATES['Y']
-            or gate_at_current_node == GATES['Z']
-            or gate_at_current_node == GATES['H']
-        ):
-            qc_grid_node = self.qc_grid_model.get_node(self.current_wire, self.current_column)
-            if qc_grid_node.first_ctrl >= 0:
-                # Gate have a control qubit so remove it
-                orignal_first_ctrl = qc_grid_node.first_ctrl
-                qc_grid_node.first_ctrl = -1
-                self.qc_grid_model.set_node(self.current_wire, self.current_column, qc_grid_node)
-
-                # Remove Control Line Nodes
-                for wire in range(
-                    min(self.current_wire, orignal_first_ctrl) + 1,
-                    max(self.current_column, orignal_first_ctrl)
-                ):
-                    if(self.qc_grid_model.get_gate_at_node(wire, self.current_column) == GATES['CTRL_LINE']):
-                        self.qc_grid_model.set_node(wire, self.current_column, QuantumCircuitGridNode(GATES['EMPTY']))
-                self.update()
-        else:
-            # Attempt to place a control qubit beginning with the wire above
-            if self.current_wire >= 0:
-                if (self.place_ctrl_qubit(self.current_wire, self.current_wire - 1) == -1):
-                    if self.current_wire < self.qc_grid_model.num_qubits:
-                        if(self.place_ctrl_qubit(self.current_wire, self.current_wire + 1) == -1):
-                            print("Can't place control qubit!")
-                            self.display_exceptional_condition()
-
-    def handle_input_move_ctrl(self, direction):
-        gate_at_current_node = self.get_gate_at_current_node()
-        if(
-            gate_at_current_node == GATES['X']
-            or gate_at_current_node == GATES['Y']
-            or gate_at_current_node == GATES['Z']
-            or gate_at_current_node == GATES['H']
-        ):
-            qc_grid_node = self.qc_grid_model.get_node(self.current_wire, self.current_column)
-            if 0 <= qc_grid_node.first_ctrl < self.qc_grid_model.num_qubits:
-                # Gate already has a control qubit so try to move it
-                if direction == QUANTUM_CIRCUIT_MARKER_MOVE_UP:
-                    candidate_ctrl_wire = qc_grid_node.first_ctrl - 1
-                    if candidate_ctrl_wire == self.current_wire:
-                        candidate_ctrl_wire -= 1 # move up to previous wire above
-                else:
-                    candidate_ctrl_wire = qc_grid_node.first_ctrl + 1
-                    if candidate_ctrl_wire == self.current_wire:
-                        candidate_ctrl_wire += 1 # Move down to next wire below
-            
-                if 0 <= candidate_ctrl_wire < self.qc_grid_model.num_qubits:
-                    if (self.place_ctrl_quabit(self.current_wire, candidate_ctrl_wire) == candidate_ctrl_wire):
-                        if (direction == QUANTUM_CIRCUIT_MARKER_MOVE_UP and candidate_ctrl_wire < self.current_wire):
-                            if (self.qc_grid_model.get_gate_at_node(candidate_ctrl_wire + 1, self.current_column) == GATES['EMPTY']):
-                                self.qc_grid_model.set_node(candidate_ctrl_wire + 1, self.current_column, QuantumCircuitGridNode(GATES['CTRL_LINE']))
-                        elif(direction == QUANTUM_CIRCUIT_MARKER_MOVE_DOWN and candidate_ctrl_wire > self.current_wire):
-                            if (self.qc_grid_model.get_gate_at_node(candidate_ctrl_wire - 1, self.current_column) == GATES['EMPTY']):
-                                self.qc_grid_model.set_node(candidate_ctrl_wire - 1, self.current_column, QuantumCircuitGridNode(GATES['CTRL_LINE']))
-                        
-                        print("Control qubit placed on the wire ", candidate_ctrl_wire, " successfully!")
-                        self.update()
-                    
-                    else:
-                        print("Control qubit could not be placed on the wire ", candidate_ctrl_wire, " successfully!")
-
-    def handle_input_rotate(self, rotation_angle):
-        gate_at_current_node = self.get_gate_at_current_node()
-        if(
-            gate_at_current_node == GATES['X']
-            or gate_at_current_node == GATES['Y']
-            or gate_at_current_node == GATES['Z']
-        ):
-            qc_grid_node = self.qc_grid_model.get_node(self.current_wire, self.current_column)
-            qc_grid_node.rotation_angle = (qc_grid_node.rotation_angle + rotation_angle) % 2 * np.pi
-            self.qc_grid_model.set_node(self.current_wire, self.current_column, qc_grid_node)
-        self.update()
-
-    def place_ctrl_qubit(self, gate_wire, candidate_ctrl_wire):
-        # Attempt to place a control qubit on a wire. If successful, return the wire number. If not, return -1
-        if (candidate_ctrl_wire < 0 or candidate_ctrl_wire >= self.qc_grid_model.num_qubits):
-            return -1
-        
-        candidate_ctrl_wire_gate = self.qc_grid_model.get_gate_at_node(candidate_ctrl_wire, self.current_column)
-
-        if (candidate_ctrl_wire_gate == GATES['EMPTY'] or candidate_ctrl_wire_gate == GATES['CTRL_LINE']):
-            qc_grid_node = self.qc_grid_model.get_node(gate_wire, self.current_column)
-            self.qc_grid_model.set_node(gate_wire, self.current_column, qc_grid_node)
-            self.qc_grid_model.set_node(candidate_ctrl_wire, self.current_column, QuantumCircuitGridNode(GATES['EMPTY']))
-            self.update()
-            return candidate_ctrl_wire
-
-    def delete_controls_for_gate(self, gate_wire, column):
-        first_control_wire = self.qc_grid_model.get_node(gate_wire, column).first_ctrl
-        second_control_wire = self.qc_grid_model.get_node(gate_wire, column).second_ctrl
-
-        # Choose the control wire (if any exist) furthest away from the gate wire
-        first_control_wire_distance = 0
-        second_control_wire_distance = 0
-
-        if first_control_wire >= 0:
-            first_control_wire_distance = abs(first_control_wire - gate_wire)
-
-        if second_control_wire >= 0:
-            second_control_wire_distance = abs(second_control_wire - gate_wire)
-
-        ctrl_wire = -1
-        if first_control_wire_distance > second_control_wire_distance:
-            ctrl_wire = first_control_wire
-        elif first_control_wire_distance < second_control_wire_distance:
-            ctrl_wire = second_control_wire
-        
-        if ctrl_wire >= 0:
-            for wire in range(
-                min(gate_wire, ctrl_wire),
-                max(gate_wire, ctrl_wire) + 1
-            ):
-                print("Replacing wire ", wire, " in column ", column)
-                qc_grid_node = QuantumCircuitGridNode(GATES['EMPTY'])
-                self.qc_grid_model.set_node(wire, column, qc_grid_node)
-
-    def handle_input(self, key):
-        match (key):
-            case pygame.K_a:
-                self.move_to_adjacent_node(QUANTUM_CIRCUIT_MARKER_MOVE_LEFT),
-            case pygame.K_d:
-                self.move_to_adjacent_node(QUANTUM_CIRCUIT_MARKER_MOVE_RIGHT),
-            case pygame.K_w:
-                self.move_to_adjacent_node(QUANTUM_CIRCUIT_MARKER_MOVE_UP),
-            case pygame.K_s:
-                self.move_to_adjacent_node(QUANTUM_CIRCUIT_MARKER_MOVE_DOWN),
-            case pygame.K_x:
-                self.handle_input_x(),
-            case pygame.K_y:
-                self.handle_input_y(),
-            case pygame.K_z:
-                self.handle_input_z(),
-            case pygame.K_h:
-                self.handle_input_h(),
-            case pygame.K_BACKSPACE:
-                self.handle_input_delete(self.current_wire, self.current_column),
-            case pygame.K_DELETE:
-                self.handle_input_clear_all()
-            case pygame.K_c:
-                self.handle_input_ctrl(),
-            case pygame.K_r:
-                self.handle_input_move_ctrl(QUANTUM_CIRCUIT_MARKER_MOVE_UP),
-            case pygame.K_f:
-                self.handle_input_move_ctrl(QUANTUM_CIRCUIT_MARKER_MOVE_DOWN),
-            case pygame.K_q:
-                self.handle_input_rotate(-np.pi / 8),
-            case pygame.K_e:
-                self.handle_input_rotate(np.pi / 8)
-
     ## RUN, DRAW AND UPDATE EVERYTHING
+    @timed('grid.run')
     def run(self):
-        ## Create QuantumCircuitGridGate Object for each gate in the qc_circuit_grid
-        for wire in range(self.qc_grid_model.num_qubits):
-            for column in range(self.qc_grid_model.num_columns):
-                self.gate_tiles[wire][column] = QuantumCircuitGridGate(self.qc_grid_model, wire, column, gate_dimensions=self.gate_dimensions, gate_phase_angle_color=self.gate_phase_angle_color)
-                self.gate_tiles[wire][column].run()
+        ## Create QuantumCircuitGridGate Object for each visible node of the qc_circuit_grid
+        for visible_wire in range(self.num_visible_wires):
+            for visible_column in range(self.num_visible_columns):
+                self.gate_tiles[visible_wire][visible_column] = QuantumCircuitGridGate(self.qc_grid_model, self.first_visible_wire + visible_wire, self.first_visible_column + visible_column, gate_dimensions=self.gate_dimensions, gate_phase_angle_color=self.gate_phase_angle_color)
         
         ## Drawing
-        pygame.sprite.RenderPlain.__init__(self, self.qc_grid_background, self.gate_tiles, self.qc_grid_marker)
+        self.empty()
+        self.add(self.qc_grid_background, layer=QUANTUM_CIRCUIT_BACKGROUND_LAYER)
+        self.add(*self.gate_tiles.flat, layer=QUANTUM_CIRCUIT_GATE_LAYER)
+        self.add(self.qc_grid_marker, layer=QUANTUM_CIRCUIT_MARKER_LAYER)
+        if self.qc_grid_profiler_overlay is not None:
+            self.add(self.qc_grid_profiler_overlay, layer=QUANTUM_CIRCUIT_OVERLAY_LAYER)
+        self.tiles_position = None
         
         ## Update
         self.update()
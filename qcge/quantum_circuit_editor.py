@@ -0,0 +1,387 @@
+from contextlib import contextmanager
+from functools import wraps
+
+import numpy as np
+
+from qcge import keys
+from qcge.configs import *
+from qcge.quantum_circuit_model import QuantumCircuitGridNode
+from qcge.edit_history import QuantumCircuitGridHistory
+from qcge.instrumentation import timed
+
+
+def batched(handler):
+    """Run an editor method inside batch_edit(), so all its set_node calls end in a single update"""
+    @wraps(handler)
+    def batched_handler(self, *args, **kwargs):
+        if self.batch_depth > 0 and self.qc_grid_history.edit_depth > 0: # Already inside a batch_edit()
+            return handler(self, *args, **kwargs)
+        # batch_edit() spelled out, since generator context managers cost more than a small grid's edit
+        self.begin_deferred_updates()
+        try:
+            self.qc_grid_history.begin_edit()
+            try:
+                return handler(self, *args, **kwargs)
+            finally:
+                self.qc_grid_history.end_edit()
+        finally:
+            self.end_deferred_updates()
+    return batched_handler
+
+
+class QuantumCircuitGridEditor:
+    """Cursor and editing logic of a quantum circuit grid, without any rendering.
+
+    QuantumCircuitGrid draws this with pygame; a server or test can drive the editor directly.
+    update() is called after every edit; here it only polls the background evaluator, if enabled.
+    Call poll_evaluation() every frame to receive the result of the final edit as well.
+    Every handle_input call is recorded as one step of qc_grid_history.
+    """
+    def __init__(self, qc_grid_model):
+        self.qc_grid_model = qc_grid_model
+        self.qc_grid_history = QuantumCircuitGridHistory(qc_grid_model)
+        self.current_wire = 0
+        self.current_column = 0
+        self.batch_depth = 0
+        self.update_pending = False
+        self.highlight_deferred = False # Set by handle_inputs(), which only highlights the final cursor position
+        self.qc_grid_evaluator = None
+
+    ## SUPPORT FUNCTIONS
+    def highlight_current_node(self, wire, column):
+        self.current_wire = wire
+        self.current_column = column
+
+    def get_gate_at_current_node(self):
+        return self.qc_grid_model.get_gate_at_node(self.current_wire, self.current_column)
+
+    def update(self):
+        self.poll_evaluation()
+
+    def enable_async_evaluation(self, mode='probabilities', callback=None, event_type=None):
+        """Evaluate the grid on a background thread after every edit, see QuantumCircuitGridAsyncEvaluator"""
+        from qcge.async_evaluator import QuantumCircuitGridAsyncEvaluator # Keeps the thread pool out of `import qcge`
+        self.disable_async_evaluation()
+        self.qc_grid_evaluator = QuantumCircuitGridAsyncEvaluator(self.qc_grid_model, mode, callback, event_type)
+        return self.qc_grid_evaluator
+
+    def poll_evaluation(self):
+        """Deliver a finished background evaluation, if any; cheap enough to call every frame"""
+        if self.qc_grid_evaluator is not None:
+            return self.qc_grid_evaluator.poll()
+        return None
+
+    def disable_async_evaluation(self):
+        if self.qc_grid_evaluator is not None:
+            self.qc_grid_evaluator.shutdown()
+            self.qc_grid_evaluator = None
+
+    def request_update(self):
+        # Inside batch_edit() the update is deferred to the end of the outermost batch
+        if self.batch_depth > 0:
+            self.update_pending = True
+        else:
+            self.update()
+
+    @contextmanager
+    def defer_updates(self):
+        """Hold back every update until the end of the outermost block, without merging undo steps"""
+        self.begin_deferred_updates()
+        try:
+            yield self
+        finally:
+            self.end_deferred_updates()
+
+    def begin_deferred_updates(self):
+        self.batch_depth += 1
+
+    def end_deferred_updates(self):
+        self.batch_depth -= 1
+        if self.batch_depth == 0 and self.update_pending:
+            self.update_pending = False
+            self.update()
+
+    @contextmanager
+    def batch_edit(self):
+        """Apply several edits as one transaction: a single undo step followed by a single update"""
+        with self.defer_updates(), self.qc_grid_history.edit():
+            yield self
+
+    ## HANDLE INPUTS
+    def move_to_adjacent_node(self, direction):
+        if(direction == QUANTUM_CIRCUIT_MARKER_MOVE_LEFT and self.current_column > 0):
+            self.current_column -= 1
+        elif (direction == QUANTUM_CIRCUIT_MARKER_MOVE_RIGHT and self.current_column < self.qc_grid_model.num_columns - 1):
+            self.current_column += 1
+        elif (direction == QUANTUM_CIRCUIT_MARKER_MOVE_UP and self.current_wire > 0):
+            self.current_wire -= 1
+        elif (direction == QUANTUM_CIRCUIT_MARKER_MOVE_DOWN and self.current_wire < self.qc_grid_model.num_qubits - 1):
+            self.current_wire += 1
+
+        if not self.highlight_deferred:
+            self.highlight_current_node(self.current_wire, self.current_column)
+
+    def handle_input_x(self):
+        gate_at_current_node = self.get_gate_at_current_node()
+        if gate_at_current_node == GATES['EMPTY']:
+            qc_grid_node = QuantumCircuitGridNode(GATES['X'])
+            self.qc_grid_model.set_node(self.current_wire, self.current_column, qc_grid_node)
+        self.request_update()
+    
+    def handle_input_y(self):
+        gate_at_current_node = self.get_gate_at_current_node()
+        if gate_at_current_node == GATES['EMPTY']:
+            qc_grid_node = QuantumCircuitGridNode(GATES['Y'])
+            self.qc_grid_model.set_node(self.current_wire, self.current_column, qc_grid_node)
+        self.request_update()
+    
+    def handle_input_z(self):
+        gate_at_current_node = self.get_gate_at_current_node()
+        if gate_at_current_node == GATES['EMPTY']:
+            qc_grid_node = QuantumCircuitGridNode(GATES['Z'])
+            self.qc_grid_model.set_node(self.current_wire, self.current_column, qc_grid_node)
+        self.request_update()
+    
+    def handle_input_h(self):
+        gate_at_current_node = self.get_gate_at_current_node()
+        if gate_at_current_node == GATES['EMPTY']:
+            qc_grid_node = QuantumCircuitGridNode(GATES['H'])
+            self.qc_grid_model.set_node(self.current_wire, self.current_column, qc_grid_node)
+        self.request_update()
+    
+    @batched
+    def handle_input_delete(self, wire, column):
+        gate_at_current_node = self.qc_grid_model.get_gate_at_node(wire, column)
+        if(
+            gate_at_current_node == GATES['X']
+            or gate_at_current_node == GATES['Y']
+            or gate_at_current_node == GATES['Z']
+            or gate_at_current_node == GATES['H']
+        ):
+            self.delete_controls_for_gate(wire, column)
+
+        if gate_at_current_node == GATES['CTRL']:
+            gate_wire = self.qc_grid_model.get_wire_for_control_node_at(wire, column)
+            if gate_wire >= 0:
+                self.delete_controls_for_gate(gate_wire, column)
+        elif (
+            gate_at_current_node != GATES['CTRL']
+            and gate_at_current_node != GATES['SWAP']
+            and gate_at_current_node != GATES['CTRL_LINE']
+        ):
+            qc_grid_node = QuantumCircuitGridNode(GATES['EMPTY'])
+            self.qc_grid_model.set_node(wire, column, qc_grid_node)
+        
+        self.request_update()
+
+    @batched
+    def handle_input_clear_all(self):
+        for wire in range(self.qc_grid_model.num_qubits):
+            for column in range(self.qc_grid_model.num_columns):
+                self.handle_input_delete(wire, column)
+
+    @batched
+    def handle_input_ctrl(self):
+        gate_at_current_node = self.get_gate_at_current_node()
+        if(
+            gate_at_current_node == GATES['X']
+            or gate_at_current_node == GATES['Y']
+            or gate_at_current_node == GATES['Z']
+            or gate_at_current_node == GATES['H']
+        ):
+            qc_grid_node = self.qc_grid_model.get_node(self.current_wire, self.current_column)
+            if qc_grid_node.first_ctrl >= 0:
+                # Gate have a control qubit so remove it
+                orignal_first_ctrl = qc_grid_node.first_ctrl
+                qc_grid_node.first_ctrl = -1
+                self.qc_grid_model.set_node(self.current_wire, self.current_column, qc_grid_node)
+
+                # Remove Control Line Nodes
+                for wire in range(
+                    min(self.current_wire, orignal_first_ctrl) + 1,
+                    max(self.current_wire, orignal_first_ctrl)
+                ):
+                    if(self.qc_grid_model.get_gate_at_node(wire, self.current_column) == GATES['CTRL_LINE']):
+                        self.qc_grid_model.set_node(wire, self.current_column, QuantumCircuitGridNode(GATES['EMPTY']))
+                self.request_update()
+            else:
+                # Attempt to place a control qubit beginning with the wire above
+                if self.current_wire >= 0:
+                    if (self.place_ctrl_qubit(self.current_wire, self.current_wire - 1) == -1):
+                        if self.current_wire < self.qc_grid_model.num_qubits:
+                            if(self.place_ctrl_qubit(self.current_wire, self.current_wire + 1) == -1):
+                                print("Can't place control qubit!")
+
+    @batched
+    def handle_input_move_ctrl(self, direction):
+        gate_at_current_node = self.get_gate_at_current_node()
+        if(
+            gate_at_current_node == GATES['X']
+            or gate_at_current_node == GATES['Y']
+            or gate_at_current_node == GATES['Z']
+            or gate_at_current_node == GATES['H']
+        ):
+            qc_grid_node = self.qc_grid_model.get_node(self.current_wire, self.current_column)
+            if 0 <= qc_grid_node.first_ctrl < self.qc_grid_model.num_qubits:
+                # Gate already has a control qubit so try to move it
+                if direction == QUANTUM_CIRCUIT_MARKER_MOVE_UP:
+                    candidate_ctrl_wire = qc_grid_node.first_ctrl - 1
+                    if candidate_ctrl_wire == self.current_wire:
+                        candidate_ctrl_wire -= 1 # move up to previous wire above
+                else:
+                    candidate_ctrl_wire = qc_grid_node.first_ctrl + 1
+                    if candidate_ctrl_wire == self.current_wire:
+                        candidate_ctrl_wire += 1 # Move down to next wire below
+            
+                if 0 <= candidate_ctrl_wire < self.qc_grid_model.num_qubits:
+                    if (self.place_ctrl_qubit(self.current_wire, candidate_ctrl_wire) == candidate_ctrl_wire):
+                        if (direction == QUANTUM_CIRCUIT_MARKER_MOVE_UP and candidate_ctrl_wire < self.current_wire):
+                            if (self.qc_grid_model.get_gate_at_node(candidate_ctrl_wire + 1, self.current_column) == GATES['EMPTY']):
+                                self.qc_grid_model.set_node(candidate_ctrl_wire + 1, self.current_column, QuantumCircuitGridNode(GATES['CTRL_LINE']))
+                        elif(direction == QUANTUM_CIRCUIT_MARKER_MOVE_DOWN and candidate_ctrl_wire > self.current_wire):
+                            if (self.qc_grid_model.get_gate_at_node(candidate_ctrl_wire - 1, self.current_column) == GATES['EMPTY']):
+                                self.qc_grid_model.set_node(candidate_ctrl_wire - 1, self.current_column, QuantumCircuitGridNode(GATES['CTRL_LINE']))
+                        
+                        print("Control qubit placed on the wire ", candidate_ctrl_wire, " successfully!")
+                        self.request_update()
+                    
+                    else:
+                        print("Control qubit could not be placed on the wire ", candidate_ctrl_wire, " successfully!")
+
+    def handle_input_rotate(self, rotation_angle):
+        gate_at_current_node = self.get_gate_at_current_node()
+        if(
+            gate_at_current_node == GATES['X']
+            or gate_at_current_node == GATES['Y']
+            or gate_at_current_node == GATES['Z']
+        ):
+            qc_grid_node = self.qc_grid_model.get_node(self.current_wire, self.current_column)
+            qc_grid_node.rotation_angle = (qc_grid_node.rotation_angle + rotation_angle) % (2 * np.pi)
+            self.qc_grid_model.set_node(self.current_wire, self.current_column, qc_grid_node)
+        self.request_update()
+
+    def handle_input_undo(self):
+        self.qc_grid_history.undo()
+        self.request_update()
+
+    def handle_input_redo(self):
+        self.qc_grid_history.redo()
+        self.request_update()
+
+    def place_ctrl_qubit(self, gate_wire, candidate_ctrl_wire):
+        # Attempt to place a control qubit on a wire. If successful, return the wire number. If not, return -1
+        if (candidate_ctrl_wire < 0 or candidate_ctrl_wire >= self.qc_grid_model.num_qubits):
+            return -1
+        
+        candidate_ctrl_wire_gate = self.qc_grid_model.get_gate_at_node(candidate_ctrl_wire, self.current_column)
+
+        if (candidate_ctrl_wire_gate == GATES['EMPTY'] or candidate_ctrl_wire_gate == GATES['CTRL_LINE']):
+            qc_grid_node = self.qc_grid_model.get_node(gate_wire, self.current_column)
+            qc_grid_node.first_ctrl = candidate_ctrl_wire
+            self.qc_grid_model.set_node(gate_wire, self.current_column, qc_grid_node)
+            self.qc_grid_model.set_node(candidate_ctrl_wire, self.current_column, QuantumCircuitGridNode(GATES['EMPTY']))
+            self.request_update()
+            return candidate_ctrl_wire
+        
+        return -1
+
+    def delete_controls_for_gate(self, gate_wire, column):
+        first_control_wire = self.qc_grid_model.get_node(gate_wire, column).first_ctrl
+        second_control_wire = self.qc_grid_model.get_node(gate_wire, column).second_ctrl
+
+        # Choose the control wire (if any exist) furthest away from the gate wire
+        first_control_wire_distance = 0
+        second_control_wire_distance = 0
+
+        if first_control_wire >= 0:
+            first_control_wire_distance = abs(first_control_wire - gate_wire)
+
+        if second_control_wire >= 0:
+            second_control_wire_distance = abs(second_control_wire - gate_wire)
+
+        ctrl_wire = -1
+        if first_control_wire_distance > second_control_wire_distance:
+            ctrl_wire = first_control_wire
+        elif first_control_wire_distance < second_control_wire_distance:
+            ctrl_wire = second_control_wire
+        
+        if ctrl_wire >= 0:
+            for wire in range(
+                min(gate_wire, ctrl_wire),
+                max(gate_wire, ctrl_wire) + 1
+            ):
+                print("Replacing wire ", wire, " in column ", column)
+                qc_grid_node = QuantumCircuitGridNode(GATES['EMPTY'])
+                self.qc_grid_model.set_node(wire, column, qc_grid_node)
+
+    @timed('editor.handle_input')
+    @batched
+    def handle_input(self, key):
+        match (key):
+            case keys.K_a:
+                self.move_to_adjacent_node(QUANTUM_CIRCUIT_MARKER_MOVE_LEFT),
+            case keys.K_d:
+                self.move_to_adjacent_node(QUANTUM_CIRCUIT_MARKER_MOVE_RIGHT),
+            case keys.K_w:
+                self.move_to_adjacent_node(QUANTUM_CIRCUIT_MARKER_MOVE_UP),
+            case keys.K_s:
+                self.move_to_adjacent_node(QUANTUM_CIRCUIT_MARKER_MOVE_DOWN),
+            case keys.K_x:
+                self.handle_input_x(),
+            case keys.K_y:
+                self.handle_input_y(),
+            case keys.K_z:
+                self.handle_input_z(),
+            case keys.K_h:
+                self.handle_input_h(),
+            case keys.K_BACKSPACE:
+                self.handle_input_delete(self.current_wire, self.current_column),
+            case keys.K_DELETE:
+                self.handle_input_clear_all()
+            case keys.K_c:
+                self.handle_input_ctrl(),
+            case keys.K_r:
+                self.handle_input_move_ctrl(QUANTUM_CIRCUIT_MARKER_MOVE_UP),
+            case keys.K_f:
+                self.handle_input_move_ctrl(QUANTUM_CIRCUIT_MARKER_MOVE_DOWN),
+            case keys.K_q:
+                self.handle_input_rotate(-np.pi / 8),
+            case keys.K_e:
+                self.handle_input_rotate(np.pi / 8)
+            case keys.K_u:
+                self.handle_input_undo()
+            case keys.K_o:
+                self.handle_input_redo()
+
+    @timed('editor.handle_inputs')
+    def handle_inputs(self, inputs):
+        """Apply a sequence of keys or pygame key events with a single update at the end.
+
+        Each key is still its own undo step. Cursor moves only change the current node, which is highlighted once
+        at its final position, so held or scripted keys cost a model edit each instead of a refresh each.
+        """
+        highlight_deferred = self.highlight_deferred
+        self.highlight_deferred = True
+        try:
+            with self.defer_updates():
+                for key in inputs:
+                    if hasattr(key, 'type'): # A pygame event
+                        if key.type != keys.KEYDOWN:
+                            continue
+                        key = key.key
+                    self.handle_input(key)
+        finally:
+            self.highlight_deferred = highlight_deferred
+        if not self.highlight_deferred:
+            self.highlight_current_node(self.current_wire, self.current_column)
+
+
+def replay_inputs(qc_grid_model, inputs):
+    """Apply recorded keys to qc_grid_model with a headless editor, e.g. to check a recorded solution.
+
+    Nothing is rendered, so pass a model that no QuantumCircuitGrid draws. Returns the editor,
+    whose qc_grid_model and qc_grid_history hold the outcome.
+    """
+    qc_grid_editor = QuantumCircuitGridEditor(qc_grid_model)
+    qc_grid_editor.handle_inputs(inputs)
+    return qc_grid_editor
@@ -0,0 +1,107 @@
+import pygame
+
+from qcge.configs import *
+from qcge.instrumentation import timed
+
+
+class QuantumCircuitGridHost(pygame.sprite.LayeredDirty):
+    """Draws several QuantumCircuitGrids in a single layered pass and sends input to the focused one.
+
+    Every grid's sprites join the host on their own band of QUANTUM_CIRCUIT_LAYERS_PER_GRID layers, so a grid
+    added later is drawn above the earlier ones. All grids share the process-wide gate atlas and cursor image.
+    Only the focused grid, and grids whose model changed or that were moved, are updated each frame.
+    """
+    def __init__(self, grids=(), dirty_rects=False):
+        super().__init__()
+        # With dirty_rects=True, draw() only repaints changed sprites and returns their rects, as for a single grid
+        self.dirty_rects = dirty_rects
+        if self.dirty_rects:
+            self._use_update = True
+            self.set_timing_threshold(float('inf')) # Never fall back to full screen redraws
+
+        self.grids = []
+        self.focused_grid = None
+        self.changed_grids = set() # Grids whose model changed since the last update()
+        self.node_listeners = {} # grid -> listener registered on its model
+
+        for grid in grids:
+            self.add_grid(grid)
+
+    ## GRIDS
+    def add_grid(self, grid):
+        """Build grid's sprites and draw them with the host; the first grid added gets the focus"""
+        self.grids.append(grid)
+        self.node_listeners[grid] = lambda wire, column, old_record, new_record: self.changed_grids.add(grid)
+        grid.qc_grid_model.add_node_listener(self.node_listeners[grid])
+        grid.run()
+        self.add_grid_sprites(grid)
+        if self.focused_grid is None:
+            self.focus(grid)
+        else:
+            self.show_marker(grid, False)
+
+    def remove_grid(self, grid):
+        self.remove(*grid.sprites())
+        grid.qc_grid_model.remove_node_listener(self.node_listeners.pop(grid))
+        self.changed_grids.discard(grid)
+        self.grids.remove(grid)
+        if grid is self.focused_grid:
+            self.focused_grid = None
+            if self.grids:
+                self.focus(self.grids[0])
+        self.show_marker(grid, True)
+
+    def add_grid_sprites(self, grid):
+        first_layer = self.grids.index(grid) * QUANTUM_CIRCUIT_LAYERS_PER_GRID
+        for sprite in grid.sprites():
+            self.add(sprite, layer=first_layer + grid.get_layer_of_sprite(sprite))
+
+    def run(self):
+        """Rebuild every grid, e.g. after their size or colors changed"""
+        self.empty()
+        for grid in self.grids:
+            grid.run()
+            self.add_grid_sprites(grid)
+            self.show_marker(grid, grid is self.focused_grid)
+
+    ## FOCUS
+    def show_marker(self, grid, visible):
+        grid.qc_grid_marker.visible = int(visible)
+        grid.qc_grid_marker.dirty = 1
+
+    def focus(self, grid):
+        if self.focused_grid is not None:
+            self.show_marker(self.focused_grid, False)
+        self.focused_grid = grid
+        self.show_marker(grid, True)
+
+    def focus_next(self):
+        if self.grids:
+            next_index = (self.grids.index(self.focused_grid) + 1) % len(self.grids)
+            self.focus(self.grids[next_index])
+
+    def handle_input(self, key):
+        if self.focused_grid is not None:
+            self.focused_grid.handle_input(key)
+
+    def handle_inputs(self, inputs):
+        if self.focused_grid is not None:
+            self.focused_grid.handle_inputs(inputs)
+
+    ## UPDATE AND DRAW
+    @timed('host.update')
+    def update(self):
+        for grid in self.grids:
+            if grid is self.focused_grid or grid in self.changed_grids or grid.tiles_position != tuple(grid.position):
+                grid.update()
+            else: # Delivers results that finish while the grid is static
+                grid.poll_evaluation()
+        self.changed_grids.clear()
+
+    @timed('host.draw')
+    def draw(self, surface, bgsurf=None, special_flags=None):
+        for grid in self.grids:
+            grid.refresh_profiler_overlay()
+        if not self.dirty_rects:
+            self._use_update = False # Redraw every sprite each frame
+        return super().draw(surface, bgsurf, special_flags)
@@ -0,0 +1,249 @@
+from contextlib import ExitStack, contextmanager
+
+import numpy as np
+
+from qcge.configs import *
+from qcge.circuit_compiler import QuantumCircuitGridCompiler
+from qcge.statevector_simulator import QuantumCircuitGridSimulator
+from qcge.unitary_simulator import QuantumCircuitGridUnitarySimulator
+from qcge.shot_sampler import QuantumCircuitGridSampler
+from qcge.instrumentation import profiler, timed
+from qcge.batch_simulator import get_angle_sweep_probabilities
+
+
+class QuantumCircuitGridNode:
+    def __init__(self, gate_type, rotation_angle = 0.0, first_ctrl = -1, second_ctrl = -1, swap = -1):
+        self.gate_type = gate_type # What Gate is at this node
+        self.rotation_angle = rotation_angle # If radian != 0 then this node have a U(theta) gate; Ex:- RX, RY, RZ
+        self.first_ctrl = first_ctrl # If first_ctrl > 0; then this node is a controlled gate with one control node # It's value will be the wire number on which the first control is placed
+        self.second_ctrl = second_ctrl # If second_ctrl > 0; then this node is a controlled gate with two control nodes # It's value will be the wire number on which the second control is placed
+        self.swap = swap # If swap != -1 then this node have a swap gate
+
+    def __str__(self):
+        string = "Type: " + str(self.gate_type)
+        string += ", rotation_angle: " + str(self.rotation_angle) if self.rotation_angle != 0 else ""
+        string += ", ctrl_a: " + str(self.first_ctrl) if self.first_ctrl != -1 else ""
+        string += ", ctrl_b: " + str(self.second_ctrl) if self.second_ctrl != -1 else ""
+        return string
+
+class QuantumCircuitGridModel():
+    # One packed record per node, so a grid is a single flat allocation instead of an array of node objects
+    NODE_DTYPE = np.dtype([
+        ('gate_type', np.int8),
+        ('rotation_angle', np.float64),
+        ('first_ctrl', np.int16),
+        ('second_ctrl', np.int16),
+        ('swap', np.int16),
+    ])
+
+    def __init__(self, num_qubits, num_columns):
+        self.num_qubits = num_qubits
+        self.num_columns = num_columns
+        self.nodes = np.zeros(
+            (self.num_qubits, self.num_columns),
+            dtype=self.NODE_DTYPE
+        )
+        # Every node starts EMPTY, with no rotation, controls or swap
+        self.nodes['first_ctrl'] = -1
+        self.nodes['second_ctrl'] = -1
+        self.nodes['swap'] = -1
+        # referencing_gate_wires[wire, column] is the wire of the gate in that column whose control or swap sits on wire, or -1
+        self.referencing_gate_wires = np.full((self.num_qubits, self.num_columns), -1, dtype=np.int16)
+        # Compiler, simulators and sampler are built on first use; most grids never need them
+        self._qc_grid_compiler = None
+        self._qc_grid_simulator = None
+        self._qc_grid_unitary_simulator = None
+        self._qc_grid_sampler = None
+        # Called as listener(wire, column, old_record, new_record) after every node change, with the records as
+        # tuples in NODE_DTYPE field order, so notifying does not build QuantumCircuitGridNode objects
+        self.node_listeners = []
+        # Context manager factories entered around the node changes of one set_nodes call, so each listener's
+        # owner can handle them as one batch, e.g. a single undo step and a single tile reload
+        self.batch_listeners = []
+    
+    def __str__(self):
+        string = "CircuitGridModel:\n"
+        for wire in range(self.num_qubits):
+            row_values = [str(self.get_gate_at_node(wire, column)) for column in range(self.num_columns)]
+            string += ", ".join(row_values) + "\n"
+        return string
+
+    @property
+    def qc_grid_compiler(self):
+        if self._qc_grid_compiler is None:
+            self._qc_grid_compiler = QuantumCircuitGridCompiler(self)
+        return self._qc_grid_compiler
+
+    @property
+    def qc_grid_simulator(self):
+        if self._qc_grid_simulator is None:
+            self._qc_grid_simulator = QuantumCircuitGridSimulator(self)
+        return self._qc_grid_simulator
+
+    @property
+    def qc_grid_unitary_simulator(self):
+        if self._qc_grid_unitary_simulator is None:
+            self._qc_grid_unitary_simulator = QuantumCircuitGridUnitarySimulator(self)
+        return self._qc_grid_unitary_simulator
+
+    @property
+    def qc_grid_sampler(self):
+        if self._qc_grid_sampler is None:
+            self._qc_grid_sampler = QuantumCircuitGridSampler(self)
+        return self._qc_grid_sampler
+
+    def invalidate_columns(self, columns):
+        """Drop what the helpers that exist derived from the given columns, which must be in ascending order"""
+        if self._qc_grid_compiler is not None:
+            for column in columns:
+                self._qc_grid_compiler.invalidate_column(column)
+        # The simulators' checkpoints after the first changed column all depend on it
+        if self._qc_grid_simulator is not None:
+            self._qc_grid_simulator.invalidate_column(columns[0])
+        if self._qc_grid_unitary_simulator is not None:
+            self._qc_grid_unitary_simulator.invalidate_column(columns[0])
+        if self._qc_grid_sampler is not None:
+            self._qc_grid_sampler.invalidate()
+
+    def add_node_listener(self, listener):
+        self.node_listeners.append(listener)
+
+    def remove_node_listener(self, listener):
+        self.node_listeners.remove(listener)
+
+    def add_batch_listener(self, listener):
+        self.batch_listeners.append(listener)
+
+    def remove_batch_listener(self, listener):
+        self.batch_listeners.remove(listener)
+
+    @contextmanager
+    def batch_notifications(self):
+        """Enter every batch listener, so the node changes made inside the with block are handled as one batch"""
+        with ExitStack() as batch:
+            for batch_listener in self.batch_listeners:
+                batch.enter_context(batch_listener())
+            yield self
+
+    def set_node(self, wire, column, qc_grid_node):
+        if profiler.enabled:
+            profiler.count('set_node_calls')
+        # Drop the references of the replaced node, then record those of the new one.
+        # The old record is read once as a tuple of Python numbers, which compare much faster than NumPy scalars.
+        old_record = self.nodes[wire, column].item()
+        _, _, first_ctrl, second_ctrl, swap = old_record
+        for referenced_wire in (first_ctrl, second_ctrl, swap):
+            if referenced_wire >= 0 and self.referencing_gate_wires[referenced_wire, column] == wire:
+                self.referencing_gate_wires[referenced_wire, column] = -1
+        for referenced_wire in (qc_grid_node.first_ctrl, qc_grid_node.second_ctrl, qc_grid_node.swap):
+            if referenced_wire >= 0:
+                self.referencing_gate_wires[referenced_wire, column] = wire
+        
+        new_record = (
+            qc_grid_node.gate_type,
+            qc_grid_node.rotation_angle,
+            qc_grid_node.first_ctrl,
+            qc_grid_node.second_ctrl,
+            qc_grid_node.swap
+        )
+        self.nodes[wire, column] = new_record
+        self.invalidate_columns((column,))
+        for listener in self.node_listeners:
+            listener(wire, column, old_record, new_record)
+    
+    def set_nodes(self, nodes):
+        """Replace every node at once with a (num_qubits, num_columns) array of NODE_DTYPE records"""
+        old_nodes = self.nodes
+        self.nodes = np.array(nodes, dtype=self.NODE_DTYPE).reshape(self.num_qubits, self.num_columns)
+
+        self.referencing_gate_wires.fill(-1)
+        for field in ('first_ctrl', 'second_ctrl', 'swap'):
+            wires, columns = np.nonzero(self.nodes[field] >= 0)
+            self.referencing_gate_wires[self.nodes[field][wires, columns], columns] = wires
+
+        # Only the changed columns are recompiled, and the simulators keep their checkpoints before the first one
+        changed_nodes = old_nodes != self.nodes
+        changed_columns = np.nonzero(changed_nodes.any(axis=0))[0]
+        if len(changed_columns) > 0:
+            self.invalidate_columns(changed_columns)
+
+        if self.node_listeners and len(changed_columns) > 0:
+            with self.batch_notifications():
+                for wire, column in zip(*np.nonzero(changed_nodes)):
+                    old_record = old_nodes[wire, column].item()
+                    new_record = self.nodes[wire, column].item()
+                    for listener in self.node_listeners:
+                        listener(int(wire), int(column), old_record, new_record)
+    
+    def get_node(self, wire, column):
+        # The node is a detached copy of the stored record; edit it and pass it back to set_node
+        return QuantumCircuitGridNode(*self.nodes[wire, column].item())
+
+    def get_gate_at_node(self, wire, column):
+        gate_type = self.nodes['gate_type'][wire, column]
+        
+        if gate_type != GATES['EMPTY']: # If the node is already occupied
+            return int(gate_type) # Return the gate occupying the node
+        
+        gate_wire = self.referencing_gate_wires[wire, column]
+        if gate_wire >= 0 and gate_wire != wire:
+            gate_node = self.nodes[gate_wire, column]
+            # Check if the node is a control of that gate
+            if gate_node['first_ctrl'] == wire or gate_node['second_ctrl'] == wire:
+                return GATES['CTRL']
+            # Or if it is its swap node
+            elif gate_node['swap'] == wire:
+                return GATES['SWAP']
+        
+        # If no gate is present at the node return 'EMPTY'
+        return GATES['EMPTY']
+
+    def get_wire_for_control_node_at(self, control_wire, column):
+        gate_wire = int(self.referencing_gate_wires[control_wire, column])
+        if gate_wire >= 0 and gate_wire != control_wire:
+            gate_node = self.nodes[gate_wire, column]
+            if gate_node['first_ctrl'] == control_wire or gate_node['second_ctrl'] == control_wire:
+                return gate_wire
+        
+        return -1
+
+    def create_quantum_circuit(self, optimize=False):
+        """Create Quantum Circuit from Quantum Circuit Grid, optionally after peephole optimization"""
+        return self.qc_grid_compiler.create_quantum_circuit(optimize)
+
+    def get_optimization_report(self):
+        """Gate count and depth of the grid's circuit before and after optimization"""
+        return self.qc_grid_compiler.get_optimization_report()
+
+    def content_hash(self):
+        return self.qc_grid_compiler.content_hash()
+
+    @timed('model.simulate')
+    def simulate(self, initial_state=None, optimize=False):
+        """Return the statevector amplitudes of the grid, simulated with NumPy instead of qiskit.
+
+        optimize=True runs the optimized instructions instead, which skips the per-column checkpoints.
+        """
+        if optimize:
+            return self.qc_grid_simulator.run_instructions(self.qc_grid_compiler.get_optimized_instructions(), initial_state)
+        return self.qc_grid_simulator.run(initial_state)
+
+    def get_probabilities(self, initial_state=None, optimize=False):
+        return np.abs(self.simulate(initial_state, optimize)) ** 2
+
+    def sample(self, shots=1, qubits=None):
+        """Measure the grid's final state shots times; qubits limits the measurement to those wires"""
+        return self.qc_grid_sampler.sample(shots, qubits)
+
+    def get_marginal_probabilities(self, qubits):
+        return self.qc_grid_sampler.get_marginal_probabilities(qubits)
+
+    @timed('model.get_unitary')
+    def get_unitary(self, dtype=complex):
+        """Return the 2^n x 2^n unitary of the grid; dtype=np.complex64 halves its memory"""
+        self.qc_grid_unitary_simulator.set_dtype(dtype)
+        return self.qc_grid_unitary_simulator.run()
+
+    def get_angle_sweep_probabilities(self, angle_assignments):
+        """Return one row of probabilities per angle assignment, see batch_simulator.simulate_angle_sweep"""
+        return get_angle_sweep_probabilities(self, angle_assignments)
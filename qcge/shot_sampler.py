@@ -0,0 +1,67 @@
+import numpy as np
+
+from qcge.configs import *
+
+
+class QuantumCircuitGridSampler:
+    """Draws measurement shots from the final state of a QuantumCircuitGridModel.
+
+    The cumulative distribution over all basis states, and the marginal distribution of every measured
+    set of qubits, are cached until the grid changes, so each further roll is a vectorized searchsorted.
+    Outcomes are integers in qiskit's little-endian order: bit i is the i-th measured qubit.
+    """
+    def __init__(self, qc_grid_model, seed=None):
+        self.qc_grid_model = qc_grid_model
+        self.rng = np.random.default_rng(seed)
+        self.cumulative_probabilities = None
+        self.marginal_cumulative_probabilities = {} # qubits tuple -> cumulative marginal distribution
+
+    def invalidate(self):
+        self.cumulative_probabilities = None
+        self.marginal_cumulative_probabilities.clear()
+
+    def check_qubits(self, qubits):
+        qubits = tuple(int(qubit) for qubit in qubits)
+        if len(set(qubits)) != len(qubits) or not all(0 <= qubit < self.qc_grid_model.num_qubits for qubit in qubits):
+            raise ValueError(f"Measured qubits must be distinct wires between 0 and {self.qc_grid_model.num_qubits - 1}, got {qubits}")
+        return qubits
+
+    def get_marginal_probabilities(self, qubits):
+        """Probability of every outcome of measuring only the given qubits"""
+        qubits = self.check_qubits(qubits)
+        num_qubits = self.qc_grid_model.num_qubits
+        state_tensor = self.qc_grid_model.simulate().reshape((2,) * num_qubits)
+        # Sum re^2 + im^2 over the unmeasured axes; .real and .imag are views, so no 2^n sized temporary is built.
+        # Axis of wire q is n-1-q, and the output axes run from the last measured qubit (highest bit) to the first.
+        axes = list(range(num_qubits))
+        output_axes = [num_qubits - 1 - qubit for qubit in reversed(qubits)]
+        marginal = np.einsum(state_tensor.real, axes, state_tensor.real, axes, output_axes)
+        marginal += np.einsum(state_tensor.imag, axes, state_tensor.imag, axes, output_axes)
+        return marginal.reshape(-1)
+
+    def get_cumulative_probabilities(self, qubits=None):
+        if qubits is None:
+            if self.cumulative_probabilities is None:
+                self.cumulative_probabilities = self.create_cumulative_probabilities(self.qc_grid_model.get_probabilities())
+            return self.cumulative_probabilities
+
+        qubits = self.check_qubits(qubits)
+        if qubits not in self.marginal_cumulative_probabilities:
+            self.marginal_cumulative_probabilities[qubits] = self.create_cumulative_probabilities(self.get_marginal_probabilities(qubits))
+        return self.marginal_cumulative_probabilities[qubits]
+
+    def create_cumulative_probabilities(self, probabilities):
+        cumulative_probabilities = np.cumsum(probabilities)
+        cumulative_probabilities /= cumulative_probabilities[-1] # Absorbs the rounding error of the simulation
+        return cumulative_probabilities
+
+    def sample(self, shots=1, qubits=None):
+        """Return an array of shots measurement outcomes of all qubits, or only of the given qubits"""
+        cumulative_probabilities = self.get_cumulative_probabilities(qubits)
+        outcomes = np.searchsorted(cumulative_probabilities, self.rng.random(shots), side='right')
+        return np.minimum(outcomes, len(cumulative_probabilities) - 1)
+
+    def get_counts(self, shots, qubits=None):
+        """Number of times each outcome was measured in shots shots, indexed by outcome"""
+        cumulative_probabilities = self.get_cumulative_probabilities(qubits)
+        return np.bincount(self.sample(shots, qubits), minlength=len(cumulative_probabilities))
@@ -0,0 +1,172 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from qcge.configs import *
+
+
+# 2x2 matrix of every single-qubit instruction
+GATE_MATRICES = {
+    'id': np.eye(2, dtype=complex),
+    'x': np.array([[0, 1], [1, 0]], dtype=complex),
+    'y': np.array([[0, -1j], [1j, 0]], dtype=complex),
+    'z': np.diag([1, -1]).astype(complex),
+    's': np.diag([1, 1j]),
+    'sdg': np.diag([1, -1j]),
+    't': np.diag([1, np.exp(1j * np.pi / 4)]),
+    'tdg': np.diag([1, np.exp(-1j * np.pi / 4)]),
+    'h': np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2),
+}
+# Target gate of every controlled instruction, and how many of its leading qubits are controls
+CONTROLLED_GATES = {'cx': ('x', 1), 'ccx': ('x', 2), 'cy': ('y', 1), 'cz': ('z', 1), 'ch': ('h', 1)}
+
+
+def rotation_matrix(name, rotation_angle):
+    """2x2 matrix of an RX, RY or RZ gate; an array of angles gives a stack of matrices"""
+    rotation_angle = np.asarray(rotation_angle, dtype=float)
+    cos = np.cos(rotation_angle / 2)
+    sin = np.sin(rotation_angle / 2)
+    matrix = np.zeros(rotation_angle.shape + (2, 2), dtype=complex)
+    if name == 'rx':
+        matrix[..., 0, 0] = cos
+        matrix[..., 0, 1] = -1j * sin
+        matrix[..., 1, 0] = -1j * sin
+        matrix[..., 1, 1] = cos
+    elif name == 'ry':
+        matrix[..., 0, 0] = cos
+        matrix[..., 0, 1] = -sin
+        matrix[..., 1, 0] = sin
+        matrix[..., 1, 1] = cos
+    else: # rz
+        matrix[..., 0, 0] = np.exp(-0.5j * rotation_angle)
+        matrix[..., 1, 1] = np.exp(0.5j * rotation_angle)
+    return matrix
+
+
+class QuantumCircuitGridSimulator:
+    """Statevector simulator that runs a QuantumCircuitGridModel directly, without building a qiskit circuit.
+
+    The state is kept as an n-dimensional (2, 2, ..., 2) tensor and every gate updates the slices of the
+    axes it acts on in place. Amplitudes use qiskit's little-endian ordering, i.e. wire 0 is the lowest bit.
+
+    The state after each column is checkpointed in an LRU cache bounded by checkpoint_memory_budget bytes.
+    An edit drops the checkpoints from its column onward, so the next run resumes just before the edit.
+    """
+    def __init__(self, qc_grid_model, checkpoint_memory_budget=STATEVECTOR_CHECKPOINT_MEMORY_BUDGET):
+        self.qc_grid_model = qc_grid_model
+        self.checkpoint_memory_budget = checkpoint_memory_budget
+        self.checkpoints = OrderedDict() # column -> statevector after that column, least recently used first
+
+    def invalidate_column(self, column):
+        for checkpoint_column in [checkpoint_column for checkpoint_column in self.checkpoints if checkpoint_column >= column]:
+            del self.checkpoints[checkpoint_column]
+
+    def invalidate(self):
+        self.checkpoints.clear()
+
+    def get_checkpoint_memory(self):
+        return sum(state.nbytes for state in self.checkpoints.values())
+
+    def store_checkpoint(self, column, state):
+        if state.nbytes > self.checkpoint_memory_budget:
+            return
+        self.checkpoints[column] = state.copy()
+        while self.get_checkpoint_memory() > self.checkpoint_memory_budget:
+            self.checkpoints.popitem(last=False)
+
+    def get_resume_point(self):
+        # Resume from the checkpoint of the latest column; every stored checkpoint is still valid
+        for column in reversed(range(self.qc_grid_model.num_columns)):
+            if column in self.checkpoints:
+                self.checkpoints.move_to_end(column)
+                return column + 1, self.checkpoints[column].copy()
+        return 0, self.create_initial_state()
+
+    def create_initial_state(self):
+        state = np.zeros(2 ** self.qc_grid_model.num_qubits, dtype=complex)
+        state[0] = 1
+        return state
+
+    def qubit_axis(self, qubit):
+        return self.qc_grid_model.num_qubits - 1 - qubit
+
+    def get_slice(self, fixed_qubits):
+        # Basic indexing with integers on the fixed axes returns a view into the state tensor
+        index = [slice(None)] * self.qc_grid_model.num_qubits
+        for qubit, value in fixed_qubits:
+            index[self.qubit_axis(qubit)] = value
+        return tuple(index)
+
+    def apply_matrix(self, state_tensor, matrix, target, controls=()):
+        fixed_controls = [(control, 1) for control in controls]
+        index_0 = self.get_slice(fixed_controls + [(target, 0)])
+        index_1 = self.get_slice(fixed_controls + [(target, 1)])
+
+        if matrix[0, 1] == 0 and matrix[1, 0] == 0: # Diagonal gates only rescale amplitudes
+            if matrix[0, 0] != 1:
+                state_tensor[index_0] *= matrix[0, 0]
+            if matrix[1, 1] != 1:
+                state_tensor[index_1] *= matrix[1, 1]
+        elif matrix[0, 0] == 0 and matrix[1, 1] == 0 and matrix[0, 1] == 1 and matrix[1, 0] == 1: # X only swaps
+            amplitudes_0 = state_tensor[index_0].copy()
+            state_tensor[index_0] = state_tensor[index_1]
+            state_tensor[index_1] = amplitudes_0
+        else:
+            amplitudes_0 = state_tensor[index_0].copy()
+            amplitudes_1 = state_tensor[index_1]
+            state_tensor[index_0] = matrix[0, 0] * amplitudes_0 + matrix[0, 1] * amplitudes_1
+            state_tensor[index_1] = matrix[1, 0] * amplitudes_0 + matrix[1, 1] * amplitudes_1
+
+    def apply_swap(self, state_tensor, first, second, controls=()):
+        fixed_controls = [(control, 1) for control in controls]
+        index_01 = self.get_slice(fixed_controls + [(first, 0), (second, 1)])
+        index_10 = self.get_slice(fixed_controls + [(first, 1), (second, 0)])
+        amplitudes_01 = state_tensor[index_01].copy()
+        state_tensor[index_01] = state_tensor[index_10]
+        state_tensor[index_10] = amplitudes_01
+
+    def apply_instruction(self, state_tensor, instruction):
+        name, params, qubits = instruction
+        if name in GATE_MATRICES:
+            self.apply_matrix(state_tensor, GATE_MATRICES[name], qubits[0])
+        elif name in CONTROLLED_GATES:
+            gate_name, num_controls = CONTROLLED_GATES[name]
+            self.apply_matrix(state_tensor, GATE_MATRICES[gate_name], qubits[num_controls], qubits[:num_controls])
+        elif name in ('rx', 'ry', 'rz'):
+            self.apply_matrix(state_tensor, rotation_matrix(name, params[0]), qubits[0])
+        elif name == 'swap':
+            self.apply_swap(state_tensor, qubits[0], qubits[1])
+        elif name == 'cswap':
+            self.apply_swap(state_tensor, qubits[1], qubits[2], qubits[:1])
+
+    def apply_column(self, state, column):
+        state_tensor = state.reshape((2,) * self.qc_grid_model.num_qubits)
+        for instruction in self.qc_grid_model.qc_grid_compiler.get_column_instructions(column):
+            self.apply_instruction(state_tensor, instruction)
+
+    def run_instructions(self, instructions, initial_state=None):
+        """Return the statevector after applying a flat instruction list, without checkpoints"""
+        if initial_state is None:
+            state = self.create_initial_state()
+        else:
+            state = np.array(initial_state, dtype=complex)
+        state_tensor = state.reshape((2,) * self.qc_grid_model.num_qubits)
+        for instruction in instructions:
+            self.apply_instruction(state_tensor, instruction)
+        return state
+
+    def run(self, initial_state=None):
+        """Return the statevector after every column of the grid has been applied"""
+        if initial_state is not None: # Checkpoints only hold runs that start from |0...0>
+            state = np.array(initial_state, dtype=complex)
+            for column in range(self.qc_grid_model.num_columns):
+                self.apply_column(state, column)
+            return state
+
+        start_column, state = self.get_resume_point()
+        for column in range(start_column, self.qc_grid_model.num_columns):
+            # An empty column leaves the state as it is, so the previous checkpoint already covers it
+            if self.qc_grid_model.qc_grid_compiler.get_column_instructions(column):
+                self.apply_column(state, column)
+                self.store_checkpoint(column, state)
+        return state
@@ -0,0 +1,71 @@
+from functools import lru_cache
+
+import numpy as np
+
+from qcge.configs import *
+from qcge.statevector_simulator import GATE_MATRICES, CONTROLLED_GATES, rotation_matrix, QuantumCircuitGridSimulator
+
+
+@lru_cache(maxsize=UNITARY_COLUMN_OPERATOR_CACHE_SIZE)
+def get_column_operator(column_instructions, dtype):
+    """Factored operator of one grid column, shared by every column with the same instructions.
+
+    The instructions of a column act on distinct wires, so the column operator is the Kronecker product
+    of one small factor per instruction: ('matrix', 2x2 matrix in dtype, target, controls) or
+    ('swap', first, second, controls). Factors are applied in place and the full 2^n x 2^n column
+    matrix is never built.
+    """
+    factors = []
+    for name, params, qubits in column_instructions:
+        if name in GATE_MATRICES:
+            factors.append(('matrix', GATE_MATRICES[name].astype(dtype), qubits[0], ()))
+        elif name in CONTROLLED_GATES:
+            gate_name, num_controls = CONTROLLED_GATES[name]
+            factors.append(('matrix', GATE_MATRICES[gate_name].astype(dtype), qubits[num_controls], qubits[:num_controls]))
+        elif name in ('rx', 'ry', 'rz'):
+            factors.append(('matrix', rotation_matrix(name, params[0]).astype(dtype), qubits[0], ()))
+        elif name == 'swap':
+            factors.append(('swap', qubits[0], qubits[1], ()))
+        elif name == 'cswap':
+            factors.append(('swap', qubits[1], qubits[2], qubits[:1]))
+    for factor in factors:
+        if factor[0] == 'matrix':
+            factor[1].setflags(write=False) # The cache shares the matrices with every simulator
+    return tuple(factors)
+
+
+class QuantumCircuitGridUnitarySimulator(QuantumCircuitGridSimulator):
+    """Computes the full unitary of a QuantumCircuitGridModel with NumPy, without qiskit's Operator.
+
+    The unitary is handled like a statevector with an extra trailing axis of 2^n columns, so every gate is
+    an in-place update of slices, and column operators come from the content-keyed get_column_operator cache.
+    The unitary after each column is checkpointed like the statevectors of QuantumCircuitGridSimulator.
+    dtype=np.complex64 halves the memory of the unitary and its checkpoints, at single precision.
+    """
+    def __init__(self, qc_grid_model, dtype=complex, checkpoint_memory_budget=UNITARY_CHECKPOINT_MEMORY_BUDGET):
+        super().__init__(qc_grid_model, checkpoint_memory_budget)
+        self.dtype = np.dtype(dtype)
+
+    def set_dtype(self, dtype):
+        if np.dtype(dtype) != self.dtype:
+            self.dtype = np.dtype(dtype)
+            self.invalidate()
+
+    def create_initial_state(self):
+        return np.eye(2 ** self.qc_grid_model.num_qubits, dtype=self.dtype)
+
+    def apply_column(self, unitary, column):
+        # Row i of the unitary is basis state i, so the wires are the leading axes and the trailing axis is untouched
+        unitary_tensor = unitary.reshape((2,) * self.qc_grid_model.num_qubits + (unitary.shape[1],))
+        column_instructions = tuple(self.qc_grid_model.qc_grid_compiler.get_column_instructions(column))
+        for factor in get_column_operator(column_instructions, self.dtype):
+            if factor[0] == 'matrix':
+                _, matrix, target, controls = factor
+                self.apply_matrix(unitary_tensor, matrix, target, controls)
+            else:
+                _, first, second, controls = factor
+                self.apply_swap(unitary_tensor, first, second, controls)
+
+    def run(self):
+        """Return the 2^n x 2^n unitary of the grid, in qiskit's little-endian ordering"""
+        return super().run()
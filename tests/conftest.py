@@ -0,0 +1,14 @@
+import pytest
+
+from qcge.quantum_circuit_model import QuantumCircuitGridModel
+
+
+@pytest.fixture
+def build_grid_model():
+    """Returns build(num_qubits, num_columns, gates), where gates maps (wire, column) to a QuantumCircuitGridNode"""
+    def build(num_qubits, num_columns, gates):
+        qc_grid_model = QuantumCircuitGridModel(num_qubits, num_columns)
+        for (wire, column), qc_grid_node in gates.items():
+            qc_grid_model.set_node(wire, column, qc_grid_node)
+        return qc_grid_model
+    return build
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from qcge.configs import *
+from qcge.quantum_circuit_model import QuantumCircuitGridNode as Node
+from qcge.answer_cache import QuantumCircuitGridAnswerCache
+
+THETA = 3 * np.pi / 8
+
+
+def shifted(gates, offset, identity_wires=()):
+    """The same gates moved right by offset columns, with identities before them on identity_wires"""
+    gates = {(wire, column + offset): qc_grid_node for (wire, column), qc_grid_node in gates.items()}
+    for wire in identity_wires:
+        for column in range(offset):
+            gates[(wire, column)] = Node(GATES['IDENTITY'])
+    return gates
+
+
+SOLUTION = {
+    (0, 0): Node(GATES['H']), (1, 1): Node(GATES['X'], first_ctrl=0),
+    (2, 1): Node(GATES['Y'], rotation_angle=THETA), (2, 2): Node(GATES['S']),
+}
+
+# name -> (gates, gates) of 3x6 grids that must share a canonical key
+EQUIVALENT_GRIDS = {
+    'reordered_within_layer': (
+        {(0, 0): Node(GATES['H']), (1, 1): Node(GATES['X']), (2, 2): Node(GATES['T'])},
+        {(2, 0): Node(GATES['T']), (1, 0): Node(GATES['X']), (0, 3): Node(GATES['H'])},
+    ),
+    'shifted_and_padded': (SOLUTION, shifted(SOLUTION, 3, identity_wires=(0, 2))),
+    'angle_plus_4pi': (
+        {(0, 0): Node(GATES['X'], rotation_angle=THETA)},
+        {(0, 0): Node(GATES['X'], rotation_angle=THETA + 4 * np.pi)},
+    ),
+    'angle_within_rounding': (
+        {(0, 0): Node(GATES['Z'], rotation_angle=THETA)},
+        {(0, 0): Node(GATES['Z'], rotation_angle=THETA + 1e-12)},
+    ),
+}
+
+# name -> (gates, gates) of 3x6 grids that must get different keys
+DIFFERENT_GRIDS = {
+    'other_wire': ({(0, 0): Node(GATES['H'])}, {(1, 0): Node(GATES['H'])}),
+    'non_commuting_order': (
+        {(0, 0): Node(GATES['H']), (0, 1): Node(GATES['S'])},
+        {(0, 0): Node(GATES['S']), (0, 1): Node(GATES['H'])},
+    ),
+    'angle_plus_2pi': ( # R(θ + 2π) = -R(θ), a different statevector
+        {(0, 0): Node(GATES['X'], rotation_angle=THETA)},
+        {(0, 0): Node(GATES['X'], rotation_angle=THETA + 2 * np.pi)},
+    ),
+    'angle_beyond_rounding': (
+        {(0, 0): Node(GATES['Z'], rotation_angle=THETA)},
+        {(0, 0): Node(GATES['Z'], rotation_angle=THETA + 1e-8)},
+    ),
+    'control_on_other_wire': (
+        {(0, 0): Node(GATES['H']), (1, 1): Node(GATES['X'], first_ctrl=0)},
+        {(0, 0): Node(GATES['H']), (1, 1): Node(GATES['X'], first_ctrl=2)},
+    ),
+}
+
+
+@pytest.mark.parametrize('name', EQUIVALENT_GRIDS)
+def test_equivalent_grids_share_key(build_grid_model, name):
+    answer_cache = QuantumCircuitGridAnswerCache()
+    qc_grid_model, other_qc_grid_model = (build_grid_model(3, 6, gates) for gates in EQUIVALENT_GRIDS[name])
+    assert answer_cache.get_canonical_key(qc_grid_model) == answer_cache.get_canonical_key(other_qc_grid_model)
+
+
+@pytest.mark.parametrize('name', DIFFERENT_GRIDS)
+def test_different_grids_get_different_keys(build_grid_model, name):
+    answer_cache = QuantumCircuitGridAnswerCache()
+    qc_grid_model, other_qc_grid_model = (build_grid_model(3, 6, gates) for gates in DIFFERENT_GRIDS[name])
+    assert answer_cache.get_canonical_key(qc_grid_model) != answer_cache.get_canonical_key(other_qc_grid_model)
+
+
+def test_cached_answers_match_simulating_every_submission(build_grid_model):
+    target_state = build_grid_model(3, 6, SOLUTION).simulate()
+    submissions = [build_grid_model(3, 6, shifted(SOLUTION, offset, identity_wires=(1,))) for offset in range(4)]
+    submissions += [build_grid_model(3, 6, gates) for pair in DIFFERENT_GRIDS.values() for gates in pair]
+
+    answer_cache = QuantumCircuitGridAnswerCache()
+    cached_results = [answer_cache.matches_state(submission, target_state) for submission in submissions]
+    simulated_results = [abs(np.vdot(target_state, submission.simulate())) > 1 - 1e-8 for submission in submissions]
+
+    assert cached_results == simulated_results
+    assert cached_results.count(True) == 4
+    assert answer_cache.misses < len(submissions) # The shifted solutions share one entry
+    for submission in submissions:
+        assert np.allclose(answer_cache.get_statevector(submission), submission.simulate())
@@ -0,0 +1,28 @@
+import time
+
+import numpy as np
+
+from qcge import keys
+from qcge.quantum_circuit_model import QuantumCircuitGridModel
+from qcge.quantum_circuit_editor import QuantumCircuitGridEditor
+
+
+def test_final_edit_is_delivered_without_further_input():
+    qc_grid_editor = QuantumCircuitGridEditor(QuantumCircuitGridModel(3, 4))
+    results = []
+    qc_grid_editor.enable_async_evaluation('probabilities', callback=results.append)
+    try:
+        for key in (keys.K_h, keys.K_s, keys.K_x, keys.K_d, keys.K_h):
+            qc_grid_editor.handle_input(key)
+
+        # Frames after the last edit only poll
+        deadline = time.monotonic() + 10
+        while not (qc_grid_editor.qc_grid_evaluator.is_current() and results) and time.monotonic() < deadline:
+            qc_grid_editor.poll_evaluation()
+            time.sleep(0.001)
+        qc_grid_editor.poll_evaluation()
+
+        assert qc_grid_editor.qc_grid_evaluator.is_current()
+        assert np.allclose(results[-1], qc_grid_editor.qc_grid_model.get_probabilities())
+    finally:
+        qc_grid_editor.disable_async_evaluation()
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from qcge.configs import *
+from qcge.quantum_circuit_model import QuantumCircuitGridNode as Node
+from qcge.batch_simulator import simulate_grids
+
+
+def test_matches_simulating_each_grid(build_grid_model):
+    qc_grid_models = [
+        build_grid_model(3, 2, {(0, 0): Node(GATES['H']), (1, 1): Node(GATES['X'], first_ctrl=0)}),
+        build_grid_model(3, 3, {(0, 0): Node(GATES['H']), (2, 2): Node(GATES['Y'], rotation_angle=np.pi / 4)}),
+        build_grid_model(3, 1, {}),
+    ]
+    states = simulate_grids(qc_grid_models)
+    for state, qc_grid_model in zip(states, qc_grid_models):
+        assert np.allclose(state, qc_grid_model.simulate())
+
+
+def test_empty_list_raises_value_error():
+    with pytest.raises(ValueError):
+        simulate_grids([])
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from qiskit.quantum_info import Statevector
+
+from qcge.configs import *
+from qcge.quantum_circuit_model import QuantumCircuitGridNode as Node
+
+
+def wire_of(gate_nodes, wire=0):
+    """Place the nodes one after the other on a single wire"""
+    return {(wire, column): qc_grid_node for column, qc_grid_node in enumerate(gate_nodes)}
+
+
+# name -> (num_qubits, num_columns, gates, instructions left after optimizing)
+GRIDS = {
+    'cancelling_pairs': (3, 2, {
+        (0, 0): Node(GATES['H']), (0, 1): Node(GATES['H']),
+        (1, 0): Node(GATES['S']), (1, 1): Node(GATES['SDG']),
+        (2, 0): Node(GATES['T']), (2, 1): Node(GATES['TDG']),
+    }, 0),
+    'cascading_cancellation': (1, 4, wire_of([Node(GATES['H']), Node(GATES['X']), Node(GATES['X']), Node(GATES['H'])]), 0),
+    'cancelling_cnots': (2, 2, {(1, 0): Node(GATES['X'], first_ctrl=0), (1, 1): Node(GATES['X'], first_ctrl=0)}, 0),
+    'cancelling_swaps': (3, 3, {
+        (0, 0): Node(GATES['H']), (0, 1): Node(GATES['SWAP'], swap=2), (0, 2): Node(GATES['SWAP'], swap=2),
+    }, 1),
+    'pair_around_other_wire_gate': (2, 3, {
+        (0, 0): Node(GATES['H']), (1, 1): Node(GATES['X'], first_ctrl=0), (0, 2): Node(GATES['H']),
+    }, 3),
+    'rotations_summing_to_4pi': (1, 2, wire_of([
+        Node(GATES['X'], rotation_angle=3 * np.pi + 0.25), Node(GATES['X'], rotation_angle=np.pi - 0.25),
+    ]), 0),
+    'rotations_summing_to_2pi': (1, 2, wire_of([ # R(2π) = -I is kept, so the statevector keeps its sign
+        Node(GATES['Z'], rotation_angle=15 * np.pi / 8), Node(GATES['Z'], rotation_angle=np.pi / 8),
+    ]), 1),
+    'merged_rotations_past_4pi': (1, 3, wire_of([
+        Node(GATES['H']), Node(GATES['Y'], rotation_angle=3.9 * np.pi), Node(GATES['Y'], rotation_angle=0.2 * np.pi),
+    ]), 2),
+    'repeated_eighth_turns': (1, 32, wire_of([Node(GATES['X'], rotation_angle=np.pi / 8)] * 32), 0), # Float drift around 4π
+}
+
+
+@pytest.mark.parametrize('name', GRIDS)
+def test_optimized_grid_keeps_statevector(build_grid_model, name):
+    num_qubits, num_columns, gates, num_optimized_instructions = GRIDS[name]
+    qc_grid_model = build_grid_model(num_qubits, num_columns, gates)
+
+    assert np.allclose(qc_grid_model.simulate(optimize=True), qc_grid_model.simulate())
+    assert len(qc_grid_model.qc_grid_compiler.get_optimized_instructions()) == num_optimized_instructions
+
+
+@pytest.mark.parametrize('name', GRIDS)
+def test_optimized_qiskit_circuit_keeps_statevector(build_grid_model, name):
+    qc_grid_model = build_grid_model(*GRIDS[name][:3])
+    optimized_statevector = Statevector(qc_grid_model.create_quantum_circuit(optimize=True)).data
+    assert np.allclose(optimized_statevector, Statevector(qc_grid_model.create_quantum_circuit()).data)
@@ -0,0 +1,60 @@
+from contextlib import contextmanager
+
+import numpy as np
+
+from qcge.configs import *
+from qcge.quantum_circuit_model import QuantumCircuitGridModel, QuantumCircuitGridNode
+from qcge.edit_history import QuantumCircuitGridHistory
+
+
+def test_set_nodes_is_one_undo_step():
+    qc_grid_model = QuantumCircuitGridModel(20, 40)
+    qc_grid_history = QuantumCircuitGridHistory(qc_grid_model)
+    empty_nodes = qc_grid_model.nodes.copy()
+
+    level_nodes = empty_nodes.copy()
+    level_nodes['gate_type'] = GATES['H']
+    qc_grid_model.set_nodes(level_nodes)
+
+    assert len(qc_grid_history.undo_steps) == 1
+    assert len(qc_grid_history.undo_steps[0]) == 20 * 40
+    qc_grid_history.undo()
+    assert np.array_equal(qc_grid_model.nodes, empty_nodes)
+
+
+def test_set_nodes_keeps_earlier_steps():
+    qc_grid_model = QuantumCircuitGridModel(4, 8)
+    qc_grid_history = QuantumCircuitGridHistory(qc_grid_model)
+    qc_grid_model.set_node(0, 0, QuantumCircuitGridNode(GATES['X']))
+
+    level_nodes = qc_grid_model.nodes.copy()
+    level_nodes['gate_type'][1:] = GATES['H']
+    qc_grid_model.set_nodes(level_nodes)
+    qc_grid_model.set_nodes(level_nodes) # Changes nothing, so records nothing
+
+    assert len(qc_grid_history.undo_steps) == 2
+    qc_grid_history.undo()
+    assert qc_grid_model.get_gate_at_node(0, 0) == GATES['X']
+    assert qc_grid_model.get_gate_at_node(1, 0) == GATES['EMPTY']
+
+
+def test_undo_and_redo_notify_as_one_batch():
+    qc_grid_model = QuantumCircuitGridModel(6, 10)
+    qc_grid_history = QuantumCircuitGridHistory(qc_grid_model)
+    level_nodes = qc_grid_model.nodes.copy()
+    level_nodes['gate_type'] = GATES['H']
+    qc_grid_model.set_nodes(level_nodes)
+
+    batches = []
+
+    @contextmanager
+    def record_batch():
+        batches.append([])
+        yield
+
+    qc_grid_model.add_batch_listener(record_batch)
+    qc_grid_model.add_node_listener(lambda wire, column, old_record, new_record: batches[-1].append((wire, column)))
+    qc_grid_history.undo()
+    qc_grid_history.redo()
+
+    assert [len(batch) for batch in batches] == [6 * 10, 6 * 10]
@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code):
+    # A fresh interpreter, so no earlier test has imported pygame already
+    return subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.split()
+
+
+def test_star_import_exports_grid_and_configs():
+    exported = run_python(
+        "from qcge import *\n"
+        "print(*sorted(name for name in dir() if not name.startswith('_')))"
+    )
+    for name in ('QuantumCircuitGrid', 'QuantumCircuitGridHost', 'QuantumCircuitGridModel',
+                 'QuantumCircuitGridNode', 'QuantumCircuitGridEditor', 'GATES'):
+        assert name in exported
+
+
+def test_import_does_not_load_pygame():
+    assert run_python("import sys, qcge\nprint('pygame' in sys.modules)") == ['False']
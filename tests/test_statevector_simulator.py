@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from qiskit.quantum_info import Statevector
+
+from qcge.configs import *
+from qcge.quantum_circuit_model import QuantumCircuitGridNode as Node
+
+GRIDS = {
+    'h_and_x': (2, 2, {(0, 0): Node(GATES['H']), (1, 0): Node(GATES['X']), (0, 1): Node(GATES['X'])}),
+    'cnot': (2, 2, {(0, 0): Node(GATES['H']), (1, 1): Node(GATES['X'], first_ctrl=0)}),
+    'controlled_below': (3, 2, {(2, 0): Node(GATES['H']), (0, 1): Node(GATES['X'], first_ctrl=2)}),
+    'toffoli': (3, 2, {
+        (0, 0): Node(GATES['H']), (1, 0): Node(GATES['H']), (2, 1): Node(GATES['X'], first_ctrl=0, second_ctrl=1),
+    }),
+    'rotations': (3, 2, {
+        (0, 0): Node(GATES['X'], rotation_angle=np.pi / 8), (1, 0): Node(GATES['Y'], rotation_angle=3 * np.pi / 4),
+        (2, 0): Node(GATES['H']), (2, 1): Node(GATES['Z'], rotation_angle=5 * np.pi / 8),
+        (0, 1): Node(GATES['Y'], rotation_angle=15 * np.pi / 8),
+    }),
+    'swap': (3, 2, {(0, 0): Node(GATES['X']), (1, 0): Node(GATES['H']), (0, 1): Node(GATES['SWAP'], swap=2)}),
+    'phases': (2, 3, {
+        (0, 0): Node(GATES['H']), (1, 0): Node(GATES['H']), (0, 1): Node(GATES['S']), (1, 1): Node(GATES['T']),
+        (0, 2): Node(GATES['TDG']), (1, 2): Node(GATES['Z'], first_ctrl=0),
+    }),
+}
+
+
+def qiskit_statevector(qc_grid_model):
+    return Statevector(qc_grid_model.create_quantum_circuit()).data
+
+
+@pytest.mark.parametrize('name', GRIDS)
+def test_matches_qiskit_statevector(build_grid_model, name):
+    qc_grid_model = build_grid_model(*GRIDS[name])
+    assert np.allclose(qc_grid_model.simulate(), qiskit_statevector(qc_grid_model))
+
+
+def test_initial_state_matches_qiskit(build_grid_model):
+    qc_grid_model = build_grid_model(*GRIDS['cnot'])
+    initial_state = np.array([0, 1, 0, 0], dtype=complex) # |01>, wire 0 set
+    expected = Statevector(initial_state).evolve(qc_grid_model.create_quantum_circuit()).data
+    assert np.allclose(qc_grid_model.simulate(initial_state), expected)
+
+
+def test_resumes_from_checkpoint_after_invalidated_column(build_grid_model):
+    qc_grid_model = build_grid_model(3, 4, {
+        (0, 0): Node(GATES['H']), (1, 1): Node(GATES['X'], first_ctrl=0), (2, 2): Node(GATES['H']), (2, 3): Node(GATES['S']),
+    })
+    qc_grid_model.simulate()
+    qc_grid_simulator = qc_grid_model.qc_grid_simulator
+    assert set(qc_grid_simulator.checkpoints) == {0, 1, 2, 3}
+
+    qc_grid_model.set_node(0, 2, Node(GATES['Y'], rotation_angle=np.pi / 4))
+    assert set(qc_grid_simulator.checkpoints) == {0, 1} # Columns before the edit keep their states
+
+    resumed_from = []
+    apply_column = qc_grid_simulator.apply_column
+    qc_grid_simulator.apply_column = lambda state, column: (resumed_from.append(column), apply_column(state, column))
+    statevector = qc_grid_model.simulate()
+
+    assert resumed_from == [2, 3]
+    assert np.allclose(statevector, qiskit_statevector(qc_grid_model))
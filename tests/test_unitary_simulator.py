@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from qiskit.quantum_info import Operator
+
+from qcge.configs import *
+from qcge.quantum_circuit_model import QuantumCircuitGridNode as Node
+from qcge.unitary_simulator import get_column_operator
+
+GRIDS = {
+    'single_qubit_gates': (2, 3, {
+        (0, 0): Node(GATES['H']), (1, 0): Node(GATES['Y']), (0, 1): Node(GATES['S']), (1, 1): Node(GATES['TDG']),
+        (0, 2): Node(GATES['Z']),
+    }),
+    'controlled_gates': (3, 3, {
+        (0, 0): Node(GATES['H']), (1, 1): Node(GATES['X'], first_ctrl=0), (2, 1): Node(GATES['H']),
+        (0, 2): Node(GATES['Z'], first_ctrl=2), (1, 2): Node(GATES['H']),
+    }),
+    'toffoli_and_swap': (3, 2, {
+        (2, 0): Node(GATES['X'], first_ctrl=0, second_ctrl=1), (0, 1): Node(GATES['SWAP'], swap=2),
+    }),
+    'rotations': (2, 2, {
+        (0, 0): Node(GATES['X'], rotation_angle=np.pi / 8), (1, 0): Node(GATES['Y'], rotation_angle=5 * np.pi / 4),
+        (1, 1): Node(GATES['Z'], rotation_angle=3 * np.pi / 8),
+    }),
+}
+
+
+@pytest.mark.parametrize('dtype, atol', [(np.complex128, 1e-10), (np.complex64, 1e-5)])
+@pytest.mark.parametrize('name', GRIDS)
+def test_matches_qiskit_operator(build_grid_model, name, dtype, atol):
+    qc_grid_model = build_grid_model(*GRIDS[name])
+    unitary = qc_grid_model.get_unitary(dtype=dtype)
+    assert unitary.dtype == dtype
+    assert np.allclose(unitary, Operator(qc_grid_model.create_quantum_circuit()).data, atol=atol)
+
+
+def test_cached_column_operators_are_read_only(build_grid_model):
+    qc_grid_model = build_grid_model(*GRIDS['controlled_gates'])
+    qc_grid_model.get_unitary()
+    column_instructions = tuple(qc_grid_model.qc_grid_compiler.get_column_instructions(1))
+    factors = get_column_operator(column_instructions, np.dtype(complex))
+
+    matrices = [factor[1] for factor in factors if factor[0] == 'matrix']
+    assert matrices
+    for matrix in matrices:
+        with pytest.raises(ValueError):
+            matrix[0, 0] = 0
+
+
+def test_returned_unitary_is_the_callers_copy(build_grid_model):
+    qc_grid_model = build_grid_model(*GRIDS['rotations'])
+    expected = Operator(qc_grid_model.create_quantum_circuit()).data
+    qc_grid_model.get_unitary()[:] = 0 # Resumes from the checkpoint of the last column next time
+    assert np.allclose(qc_grid_model.get_unitary(), expected)